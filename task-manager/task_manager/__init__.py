@@ -1,12 +1,10 @@
 """Task manager package exports."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
 from .core import TaskManager
-from .tui import launch_tui
 from .utils import format_timestamp, setup_logging
-from .dashboard import generate_dashboard
-from .export_json import export_tasks_json
-from .export_epics import export_epics_json
-from .github_api import fetch_github_tasks
 from .exceptions import (
     TaskManagerError,
     QueueExistsError,
@@ -17,12 +15,48 @@ from .exceptions import (
     LinkNotFoundError,
     LinkAlreadyExistsError,
     StorageError,
+    ConflictError,
+    LockOrderError,
 )
 
 __version__ = "0.1.0"
 
 from .cli import main
 
+# Heavy subsystems (Textual, urllib) are imported on first attribute access so
+# that plain CLI commands start quickly.
+_LAZY_EXPORTS = {
+    "launch_tui": ".tui",
+    "generate_dashboard": ".dashboard",
+    "export_tasks_json": ".export_json",
+    "export_epics_json": ".export_epics",
+    "export_shards": ".export_shards",
+    "export_snapshot": ".export_snapshot",
+    "fetch_github_tasks": ".github_api",
+}
+
+if TYPE_CHECKING:
+    from .tui import launch_tui
+    from .dashboard import generate_dashboard
+    from .export_json import export_tasks_json
+    from .export_epics import export_epics_json
+    from .export_shards import export_shards
+    from .export_snapshot import export_snapshot
+    from .github_api import fetch_github_tasks
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 __all__ = [
     "TaskManager",
     "launch_tui",
@@ -31,6 +65,8 @@ __all__ = [
     "generate_dashboard",
     "export_tasks_json",
     "export_epics_json",
+    "export_shards",
+    "export_snapshot",
     "fetch_github_tasks",
     "main",
     "__version__",
@@ -43,5 +79,7 @@ __all__ = [
     "LinkNotFoundError",
     "LinkAlreadyExistsError",
     "StorageError",
+    "ConflictError",
+    "LockOrderError",
 ]
 
@@ -1,12 +1,16 @@
 import argparse
+import json
+import os
+import shlex
+import sys
 from pathlib import Path
-from typing import Callable
+from typing import Callable, List, Optional, Sequence
 
+from .client import forward
 from .core import TaskManager
-from .dashboard import generate_dashboard
-from .tui import launch_tui
-from .utils import format_timestamp, setup_logging, log_error
+from .utils import capture_output, format_timestamp, setup_logging, log_error
 from .exceptions import TaskManagerError
+from .storage import DURABILITY_MODES, flush, set_durability
 from . import __version__
 
 
@@ -315,12 +319,15 @@ def epic_list_cmd(args: argparse.Namespace, tm: TaskManager) -> int:
     if not epics:
         print("No epics found")
     else:
-        print(f"{'ID':<10} {'Title':<30} {'Status':<10} {'Created'}")
-        print("-" * 70)
+        progress = tm.epic_progress_all()
+        print(f"{'ID':<10} {'Title':<30} {'Status':<10} {'Progress':<10} {'Created'}")
+        print("-" * 81)
         for epic in epics:
             created = format_timestamp(epic.get('created_at', 0))
+            counts = progress.get(epic['id'], {})
+            done = f"{counts.get('done', 0)}/{counts.get('total', 0)}"
             print(
-                f"{epic['id']:<10} {epic['title']:<30} {epic['status']:<10} {created}"
+                f"{epic['id']:<10} {epic['title']:<30} {epic['status']:<10} {done:<10} {created}"
             )
     return 0
 
@@ -490,16 +497,29 @@ def handle_task(args: argparse.Namespace, tm: TaskManager) -> int:
 
 
 def handle_ui(args: argparse.Namespace, tm: TaskManager) -> int:
+    from .tui import launch_tui
+
     launch_tui(tm)
     return 0
 
 
 def handle_dashboard(args: argparse.Namespace, tm: TaskManager) -> int:
+    from .dashboard import generate_dashboard
+    from .http_cache import default_cache_dir
+
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or str(default_cache_dir())
     path = generate_dashboard(
         args.tasks_root,
         args.output,
         repos=args.repo,
         token=args.token,
+        cache_dir=cache_dir,
+        page_size=args.page_size,
+        split_queues=args.split_queues,
+        force=args.force,
+        virtual=args.virtual,
     )
     print(f"Dashboard generated at {path}")
     return 0
@@ -532,6 +552,117 @@ def verify_cmd(args: argparse.Namespace, tm: TaskManager) -> int:
     return 1
 
 
+def parse_batch_line(line: str) -> Optional[List[str]]:
+    """Return the argv encoded by one ``tm batch`` input line.
+
+    Lines are either shell-quoted arguments or JSON: an array of arguments
+    or an object with an ``argv`` array. Blank lines and ``#`` comments give
+    ``None``. Raises ``ValueError`` for malformed lines.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line[0] in "[{":
+        data = json.loads(line)
+        argv = data.get("argv") if isinstance(data, dict) else data
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+            raise ValueError("expected a JSON array of strings or an object with 'argv'")
+        return argv
+    return shlex.split(line)
+
+
+def run_command(parser: argparse.ArgumentParser, argv: Sequence[str], tm: TaskManager) -> int:
+    """Parse ``argv`` and dispatch it to its handler using ``tm``."""
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    if not args.command:
+        parser.print_help()
+        return 1
+    if args.command in TOP_LEVEL_COMMANDS:
+        log_error(f"Error: '{args.command}' cannot run inside another command")
+        return 1
+    handler = COMMAND_HANDLERS.get(args.command)
+    if not handler:
+        parser.print_help()
+        return 1
+    return handler(args, tm)
+
+
+class _BatchAborted(Exception):
+    """Raised to discard the staged changes of an ``--atomic`` batch."""
+
+
+def batch_cmd(args: argparse.Namespace, tm: TaskManager) -> int:
+    """Run commands read from a file or stdin against one task manager.
+
+    Each command's output is captured and reported as a JSON line with its
+    exit code. Returns 1 if any command failed.
+    """
+    try:
+        stream = open(args.file, encoding="utf-8") if args.file else sys.stdin
+    except OSError as e:
+        log_error(f"Error: {e}")
+        return 1
+
+    failed = False
+    line_parser = build_parser(global_options=False)
+
+    def run_all() -> None:
+        nonlocal failed
+        for number, line in enumerate(stream, 1):
+            result: dict = {"line": number}
+            try:
+                argv = parse_batch_line(line)
+            except ValueError as e:
+                result.update(argv=None, exit_code=2, stdout="", stderr=f"Error: {e}\n")
+            else:
+                if argv is None:
+                    continue
+                with capture_output() as (out, err):
+                    option = next((a for a in argv if a.split("=")[0] in GLOBAL_OPTIONS), None)
+                    if option:
+                        log_error(f"Error: {option.split('=')[0]} applies to the whole batch, not one line")
+                        code = 2
+                    else:
+                        try:
+                            code = run_command(line_parser, argv, tm)
+                        except Exception as e:
+                            log_error(f"Error: {e}")
+                            code = 1
+                result.update(
+                    argv=argv, exit_code=code, stdout=out.getvalue(), stderr=err.getvalue()
+                )
+            print(json.dumps(result), flush=True)
+            if result["exit_code"] != 0:
+                failed = True
+                if args.atomic:
+                    raise _BatchAborted
+                if args.stop_on_error:
+                    return
+
+    try:
+        if args.atomic:
+            with tm.batch():
+                run_all()
+        else:
+            run_all()
+    except _BatchAborted:
+        log_error("Error: batch aborted, staged changes discarded")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return 1 if failed else 0
+
+
+def serve_cmd(args: argparse.Namespace, tm: TaskManager) -> int:
+    """Keep a warm task manager serving commands on a Unix socket."""
+    from .server import serve
+
+    return serve(tm, lambda argv: run_command(args.parser, argv, tm))
+
+
 COMMAND_HANDLERS: dict[str, Callable[[argparse.Namespace, TaskManager], int]] = {
     "queue": handle_queue,
     "task": handle_task,
@@ -539,23 +670,47 @@ COMMAND_HANDLERS: dict[str, Callable[[argparse.Namespace, TaskManager], int]] =
     "ui": handle_ui,
     "dashboard": handle_dashboard,
     "verify": verify_cmd,
+    "batch": batch_cmd,
+    "serve": serve_cmd,
 }
 
-def main():
-    setup_logging()
+# Commands that read the terminal or stdin and so only run from ``main``.
+TOP_LEVEL_COMMANDS = {"batch", "serve", "ui"}
+# Options of the top-level parser that ``tm batch`` lines may not override.
+GLOBAL_OPTIONS = {"--version", "--tasks-root", "--durability"}
+# Commands ``main`` hands to a running ``tm serve`` daemon.
+FORWARDED_COMMANDS = {"queue", "task", "epic", "verify"}
+
+
+def build_parser(global_options: bool = True) -> argparse.ArgumentParser:
+    """Build the argument parser for all CLI commands.
 
+    With ``global_options=False`` the parser only accepts commands, which is
+    how ``tm batch`` parses its lines: they share the batch's tasks root and
+    durability, so options that would change them are rejected.
+    """
     parser = argparse.ArgumentParser(description="Task Manager CLI")
-    parser.add_argument(
-        "--version",
-        action="store_true",
-        help="Show version information and exit",
-    )
-    parser.add_argument(
-        "--tasks-root",
-        default=".tasks",
-        help="Root directory for tasks storage (default: .tasks)",
-    )
-    
+    if global_options:
+        parser.add_argument(
+            "--version",
+            action="store_true",
+            help="Show version information and exit",
+        )
+        parser.add_argument(
+            "--tasks-root",
+            default=".tasks",
+            help="Root directory for tasks storage (default: .tasks)",
+        )
+        parser.add_argument(
+            "--durability",
+            choices=DURABILITY_MODES,
+            default=os.environ.get("TM_DURABILITY", "fsync"),
+            help=(
+                "How writes reach disk: none, fsync each file, or batch all fsyncs "
+                "at the end of the command (default: $TM_DURABILITY or fsync)"
+            ),
+        )
+
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # UI command
@@ -579,9 +734,65 @@ def main():
         "--token",
         help="GitHub token for authenticated requests",
     )
+    dashboard_parser.add_argument(
+        "--cache-dir",
+        help="Cache directory for GitHub responses (default: ~/.cache/codex-utils/github)",
+    )
+    dashboard_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Download remote tasks without using the cache",
+    )
+    dashboard_parser.add_argument(
+        "--page-size",
+        type=int,
+        help="Split tasks into pages of at most this many rows, linked from the output page",
+    )
+    dashboard_parser.add_argument(
+        "--split-queues",
+        action="store_true",
+        help="Write separate pages for every queue, linked from the output page",
+    )
+    dashboard_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite the dashboard even if no task changed",
+    )
+    dashboard_parser.add_argument(
+        "--virtual",
+        action="store_true",
+        help="Write tasks to a JSON data file rendered by a virtualized table in the page",
+    )
 
     # Verify command
     subparsers.add_parser("verify", help="Verify no tasks are left in progress")
+
+    # Serve command
+    subparsers.add_parser(
+        "serve", help="Run a daemon that executes commands for this tasks root"
+    )
+
+    # Batch command
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run many commands, one per line, in a single process"
+    )
+    batch_parser.add_argument(
+        "--file",
+        help="Read commands from this file instead of stdin",
+    )
+    batch_parser.add_argument(
+        "--stop-on-error",
+        action="store_true",
+        help="Stop at the first failing command",
+    )
+    batch_parser.add_argument(
+        "--atomic",
+        action="store_true",
+        help=(
+            "Write all task and epic updates together at the end; the first "
+            "failing command stops the batch and discards them"
+        ),
+    )
     
     # Queue commands
     queue_parser = subparsers.add_parser("queue", help="Queue management")
@@ -737,7 +948,22 @@ def main():
     epic_remove_epic_parser = epic_subparsers.add_parser("remove-epic", help="Remove child epic")
     epic_remove_epic_parser.add_argument("--id", required=True, help="Epic ID")
     epic_remove_epic_parser.add_argument("--child-id", required=True, help="Child epic ID")
-    
+
+    parser.set_defaults(
+        parser=parser,
+        parser_queue=queue_parser,
+        parser_task=task_parser,
+        parser_comment=task_comment_parser,
+        parser_link=task_link_parser,
+        parser_epic=epic_parser,
+    )
+    return parser
+
+
+def main():
+    setup_logging()
+
+    parser = build_parser()
     args = parser.parse_args()
 
     if args.version:
@@ -749,11 +975,18 @@ def main():
         parser.print_help()
         return 1
 
-    args.parser_queue = queue_parser
-    args.parser_task = task_parser
-    args.parser_comment = task_comment_parser
-    args.parser_link = task_link_parser
-    args.parser_epic = epic_parser
+    try:
+        set_durability(args.durability)
+    except ValueError as e:
+        log_error(f"Error: {e}")
+        return 1
+
+    if args.command in FORWARDED_COMMANDS and os.environ.get("TM_DAEMON", "1") != "0":
+        response = forward(Path(args.tasks_root), sys.argv[1:], args.durability)
+        if response is not None:
+            sys.stdout.write(response.get("stdout", ""))
+            sys.stderr.write(response.get("stderr", ""))
+            return response.get("exit_code", 1)
 
     tm = TaskManager(args.tasks_root)
 
@@ -761,5 +994,8 @@ def main():
     if not handler:
         parser.print_help()
         return 1
-    return handler(args, tm)
+    try:
+        return handler(args, tm)
+    finally:
+        flush()
 
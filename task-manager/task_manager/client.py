@@ -0,0 +1,62 @@
+"""Client side of the ``tm serve`` protocol."""
+
+from __future__ import annotations
+
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Unix socket of a running ``tm serve``, inside the tasks root it serves.
+SOCKET_FILE = ".sock"
+
+
+def socket_path(tasks_root: Path) -> Path:
+    """Return the daemon socket path for ``tasks_root``."""
+    return Path(tasks_root) / SOCKET_FILE
+
+
+def _connect(tasks_root: Path) -> Optional[socket.socket]:
+    path = socket_path(tasks_root)
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def is_serving(tasks_root: Path) -> bool:
+    """Return True if a daemon is listening for ``tasks_root``."""
+    sock = _connect(tasks_root)
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def forward(
+    tasks_root: Path, argv: List[str], durability: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Run ``argv`` in the daemon serving ``tasks_root``.
+
+    The request is one JSON line, answered by one JSON line holding the
+    command's ``exit_code``, ``stdout`` and ``stderr``. Returns ``None`` if
+    no daemon is listening so the caller can run the command itself.
+    """
+    sock = _connect(tasks_root)
+    if sock is None:
+        return None
+    with sock:
+        try:
+            request = {"argv": argv, "durability": durability}
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline())
+        except (OSError, ValueError) as e:
+            # The command may already have run, so it is not retried locally.
+            return {"exit_code": 1, "stdout": "", "stderr": f"Error: tm daemon failed: {e}\n"}
+    return response
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-import json
+import bisect
+import copy
 import logging
 import os
 import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from .models import Queue, Task, TaskStatus, Epic, EpicStatus
-from .utils import log_error
-from .epic_manager import EpicManager
-from .storage import load_json, save_json
+from .epic_manager import EpicManager, rollup_progress
+from .index import TaskIndex, path_stamp
+from .locks import LockManager
+from .storage import load_json, replay_journal, save_json, save_json_batch
 from .exceptions import (
+    ConflictError,
     QueueExistsError,
     QueueNotFoundError,
     TaskNotFoundError,
@@ -24,44 +29,173 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Holds the epic ID counter; not ``*.json`` so epic listings ignore it.
+EPICS_META_FILE = ".meta"
+# Pending renames of a batch being committed, see ``save_json_batch``.
+BATCH_JOURNAL_FILE = ".journal"
+
+
+def replay_pending_batch(tasks_root: Path, locks: Optional[LockManager] = None) -> None:
+    """Finish a :meth:`TaskManager.batch` commit interrupted in ``tasks_root``.
+
+    Nothing is created when there is no journal, so this is safe to call on
+    read-only paths.
+    """
+    journal = tasks_root / BATCH_JOURNAL_FILE
+    if journal.exists():
+        with (locks or LockManager(tasks_root)).tree():
+            replay_journal(journal)
+
+
+def _sort_key(task: Dict) -> Tuple[float, str]:
+    """Return the ``(created_at, id)`` key ``task_list`` results are sorted by."""
+    return task.get("created_at", 0), task["id"]
+
+
+def _matches(
+    task: Dict, status: Optional[str], queue: Optional[str], epic: Optional[str]
+) -> bool:
+    """Return True if a task summary passes the ``task_list`` filters."""
+    if status and task["status"] != status:
+        return False
+    if queue and task["queue"] != queue:
+        return False
+    if epic and epic not in task["epics"]:
+        return False
+    return True
+
+
+@dataclass
+class _Batch:
+    """Changes staged by :meth:`TaskManager.batch`."""
+
+    tasks: Dict[str, Tuple[Path, Task]] = field(default_factory=dict)
+    epics: Dict[str, Tuple[Path, Epic]] = field(default_factory=dict)
+    # Items whose parent epics may need closing, in first-seen order.
+    auto_close: Dict[str, None] = field(default_factory=dict)
+    committing: bool = False
+
 
 class TaskManager:
-    def __init__(self, tasks_root: str = ".tasks", epics_root: str = ".epics"):
+    def __init__(
+        self,
+        tasks_root: str = ".tasks",
+        epics_root: str = ".epics",
+        check_conflicts: bool = False,
+    ):
+        """Create a manager for the given task and epic directories.
+
+        With ``check_conflicts`` enabled, saving a task or epic whose file was
+        rewritten since it was loaded raises :class:`ConflictError` instead
+        of overwriting the newer version.
+        """
         self.tasks_root = Path(tasks_root)
         self.tasks_root.mkdir(exist_ok=True)
         self.epics_root = Path(epics_root)
         self.epics_root.mkdir(exist_ok=True)
-        self.epic_manager = EpicManager(self.epics_root)
+        self.check_conflicts = check_conflicts
+        self.epic_manager = EpicManager(self.epics_root, check_conflicts=check_conflicts)
+        self._index = TaskIndex(self.tasks_root)
+        self._locks = LockManager(self.tasks_root)
         self._queue_list_cache: List[Dict[str, str]] | None = None
         self._task_list_cache: dict[tuple[Optional[str], Optional[str], Optional[str]], List[Dict]] = {}
         self._epic_list_cache: Optional[List[Dict]] = None
+        self._batch: Optional[_Batch] = None
+        # Stamps of each queue's meta.json as of the cached queue_list, and
+        # the queue directory mtimes seen by the last refresh.
+        self._queue_meta_stamps: Dict[str, Optional[List[int]]] = {}
+        self._queue_dirs: Dict[str, int] = {}
+        self._epics_stamp = self._stat_epics_root()
+        replay_pending_batch(self.tasks_root, self._locks)
 
     def _invalidate_queue_cache(self) -> None:
         self._queue_list_cache = None
 
     def _invalidate_task_cache(self) -> None:
+        # Only memoized results are dropped; the task index itself is kept
+        # current in place, so the next task_list does not reread task files.
         self._task_list_cache.clear()
 
+    def _patch_task_cache(self, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """Replace one task in every memoized ``task_list`` result.
+
+        ``old`` and ``new`` are the task's index summaries before and after
+        the change (``None`` when the task did not or no longer exists).
+        Each cached list stays sorted by ``(created_at, id)``, so the entry
+        is found by bisecting in O(log n). The patched list is a new copy,
+        which costs O(n), because earlier results were handed to callers.
+        """
+        for key, tasks in self._task_list_cache.items():
+            status, queue, epic = key
+            patched = tasks
+            if old is not None:
+                i = bisect.bisect_left(tasks, _sort_key(old), key=_sort_key)
+                if i < len(tasks) and tasks[i]["id"] == old["id"]:
+                    patched = tasks[:i] + tasks[i + 1:]
+            if new is not None and _matches(new, status, queue, epic):
+                if patched is tasks:
+                    patched = list(tasks)
+                bisect.insort_right(patched, dict(new), key=_sort_key)
+            self._task_list_cache[key] = patched
+
     def _invalidate_epic_cache(self) -> None:
         self._epic_list_cache = None
 
+    def _stat_epics_root(self) -> int:
+        try:
+            return self.epics_root.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def _meta_stamp(self, queue: str) -> Optional[List[int]]:
+        return path_stamp(self.tasks_root / queue / "meta.json")
+
+    def refresh(self) -> None:
+        """Pick up changes made to the tree by other processes.
+
+        A long-lived manager only sees its own writes otherwise. The index
+        stats the queue directories and rescans only those whose mtime
+        changed; for those, the queue cache is dropped if their
+        ``meta.json`` was replaced. The epic caches are dropped when the
+        epics directory changed, which every atomic save does.
+        """
+        if self._index.sync():
+            self._invalidate_task_cache()
+        dirs = self._index.queue_dirs()
+        changed = [
+            queue for queue in dirs.keys() | self._queue_dirs.keys()
+            if dirs.get(queue) != self._queue_dirs.get(queue)
+        ]
+        self._queue_dirs = dict(dirs)
+        if self._queue_list_cache is not None and any(
+            self._meta_stamp(queue) != self._queue_meta_stamps.get(queue) for queue in changed
+        ):
+            self._invalidate_queue_cache()
+        epics_stamp = self._stat_epics_root()
+        if epics_stamp != self._epics_stamp:
+            self._invalidate_epic_cache()
+            self.epic_manager.invalidate_parent_index()
+        self._epics_stamp = epics_stamp
+
     def queue_list(self) -> List[Dict[str, str]]:
         """List all queues."""
         if self._queue_list_cache is not None:
             return self._queue_list_cache
 
         queues: List[Dict[str, str]] = []
+        stamps: Dict[str, Optional[List[int]]] = {}
         for queue_dir in self.tasks_root.iterdir():
             if queue_dir.is_dir():
-                meta_file = queue_dir / "meta.json"
-                if meta_file.exists():
-                    meta = load_json(meta_file)
+                stamps[queue_dir.name] = stamp = self._meta_stamp(queue_dir.name)
+                if stamp is not None:
+                    meta = load_json(queue_dir / "meta.json")
                     if meta is None:
                         continue
                     queue = Queue.from_meta(queue_dir.name, meta)
                     queues.append(queue.to_dict())
 
         self._queue_list_cache = queues
+        self._queue_meta_stamps = stamps
         return queues
 
     def queue_add(self, name: str, title: str, description: str) -> None:
@@ -108,12 +242,35 @@ class TaskManager:
         except (OSError, IOError) as e:
             raise StorageError(f"Error creating queue '{name}': {e}")
 
+    @staticmethod
+    def _next_free_number(
+        counter: object, taken: Callable[[int], bool], rescan: Callable[[], int]
+    ) -> int:
+        """Return ``counter`` unless it is missing or points at a used ID."""
+        if isinstance(counter, int) and counter > 0 and not taken(counter):
+            return counter
+        return rescan()
+
     def _get_next_task_number(self, queue_name: str) -> int:
-        """Get the next available task number for a queue."""
+        """Get the next available task number for a queue.
+
+        Uses the ``next_id`` counter from the queue's ``meta.json`` and falls
+        back to scanning the queue when it is missing or stale.
+        """
         queue_dir = self.tasks_root / queue_name
         if not queue_dir.exists():
             return 1
-        
+
+        meta = load_json(queue_dir / "meta.json") or {}
+        return self._next_free_number(
+            meta.get("next_id"),
+            lambda n: (queue_dir / f"{queue_name}-{n}.json").exists(),
+            lambda: self._scan_next_task_number(queue_name),
+        )
+
+    def _scan_next_task_number(self, queue_name: str) -> int:
+        """Find the next task number by scanning every task file in a queue."""
+        queue_dir = self.tasks_root / queue_name
         max_num = 0
         for task_file in queue_dir.glob(f"{queue_name}-*.json"):
             try:
@@ -133,6 +290,15 @@ class TaskManager:
         if not self.epics_root.exists():
             return 1
 
+        meta = load_json(self.epics_root / EPICS_META_FILE) or {}
+        return self._next_free_number(
+            meta.get("next_id"),
+            lambda n: (self.epics_root / f"epic-{n}.json").exists(),
+            self._scan_next_epic_number,
+        )
+
+    def _scan_next_epic_number(self) -> int:
+        """Find the next epic number by scanning every epic file."""
         max_num = 0
         for epic_file in self.epics_root.glob("epic-*.json"):
             try:
@@ -151,17 +317,25 @@ class TaskManager:
             raise QueueNotFoundError(f"Queue '{queue}' does not exist")
 
         try:
-            task_num = self._get_next_task_number(queue)
-            task_id = f"{queue}-{task_num}"
-            task_file = queue_dir / f"{task_id}.json"
+            with self._locks.hold(f"queue:{queue}"):
+                task_num = self._get_next_task_number(queue)
+                task_id = f"{queue}-{task_num}"
+                task_file = queue_dir / f"{task_id}.json"
 
-            task_obj = Task(id=task_id, title=title, description=description)
+                task_obj = Task(id=task_id, title=title, description=description)
 
-            if not save_json(task_file, task_obj.to_dict()):
-                raise StorageError(f"Failed to save task '{task_id}' to file")
+                if not save_json(task_file, task_obj.to_dict()):
+                    raise StorageError(f"Failed to save task '{task_id}' to file")
+
+                meta_file = queue_dir / "meta.json"
+                meta = load_json(meta_file) or {}
+                meta["next_id"] = task_num + 1
+                # A lost counter update only costs a rescan on the next add.
+                save_json(meta_file, meta)
 
             logger.info(f"Task '{task_id}' created successfully")
-            self._invalidate_task_cache()
+            self._index.update(task_file, task_obj)
+            self._patch_task_cache(None, self._index.get(task_id))
             return task_id
 
         except (OSError, IOError) as e:
@@ -185,22 +359,30 @@ class TaskManager:
         return self.epic_manager.find_epic_file(epic_id)
 
     def _load_epic(self, epic_id: str) -> Epic:
+        if self._batch is not None and epic_id in self._batch.epics:
+            return copy.deepcopy(self._batch.epics[epic_id][1])
         return self.epic_manager.load_epic(epic_id)
 
     def _save_epic(self, epic_data: Epic) -> None:
+        if self._batch is not None:
+            staged = self._batch.epics
+            epic_file = self.epic_manager.prepare_save(
+                epic_data, check=epic_data.id not in staged
+            )
+            staged[epic_data.id] = (epic_file, epic_data)
+            self.epic_manager.mark_saved(epic_data)
+            return
         self.epic_manager.save_epic(epic_data)
         self._invalidate_epic_cache()
 
-    def _get_all_epics(self) -> List[Epic]:
-        """Return all epics as objects."""
-        return self.epic_manager.load_all_epics()
-
     def _get_parent_epics(self, item_id: str) -> List[Epic]:
         """Return epics that reference the given task or epic."""
         parents = []
-        for epic in self._get_all_epics():
-            if item_id in epic.child_tasks or item_id in epic.child_epics:
-                parents.append(epic)
+        for epic_id in self.epic_manager.parent_ids(item_id):
+            try:
+                parents.append(self._load_epic(epic_id))
+            except (TaskNotFoundError, StorageError):
+                continue
         return parents
 
     def _can_close_epic(self, epic: Epic) -> bool:
@@ -224,51 +406,79 @@ class TaskManager:
         return True
 
     def _auto_close_parent_epics(self, item_id: str) -> None:
-        """Automatically close parent epics if they are now complete."""
-        for parent in self._get_parent_epics(item_id):
-            if self._can_close_epic(parent) and parent.status != EpicStatus.CLOSED:
+        """Automatically close parent epics if they are now complete.
+
+        Must be called without holding item locks; each parent is locked and
+        re-read on its own. Inside :meth:`batch` the check is deferred to
+        commit time so it runs once per item.
+        """
+        if self._batch is not None and not self._batch.committing:
+            self._batch.auto_close[item_id] = None
+            return
+        for parent_id in self.epic_manager.parent_ids(item_id):
+            with self._locks.hold(f"epic:{parent_id}"):
+                try:
+                    parent = self._load_epic(parent_id)
+                except (TaskNotFoundError, StorageError):
+                    continue
+                if parent.status == EpicStatus.CLOSED or not self._can_close_epic(parent):
+                    continue
                 parent.status = EpicStatus.CLOSED
                 self._save_epic(parent)
-                if parent.parent_epic:
-                    self._auto_close_parent_epics(parent.id)
+            if parent.parent_epic:
+                self._auto_close_parent_epics(parent.id)
 
     def task_parent_epics(self, task_id: str) -> List[Dict]:
         """Return epics containing the given task."""
         epics = [e.to_dict() for e in self._get_parent_epics(task_id)]
         return epics
 
+    def epic_progress_all(self) -> Dict[str, Dict]:
+        """Return the progress of every epic keyed by epic ID.
+
+        Computed in one pass from the task index and the epic list without
+        reading task files; see :func:`rollup_progress` for the fields.
+        """
+        statuses = {t["id"]: t["status"] for t in self.task_list()}
+        epics = {e["id"]: e for e in self.epic_list()}
+        return rollup_progress(epics, statuses)
+
     def invalid_closed_epics(self) -> List[str]:
         """Return IDs of epics marked closed with incomplete children."""
-        invalid = []
-        for epic in self._get_all_epics():
-            if epic.status == EpicStatus.CLOSED and not self._can_close_epic(epic):
-                invalid.append(epic.id)
-        return invalid
+        closed = {e["id"] for e in self.epic_list() if e["status"] == EpicStatus.CLOSED.value}
+        return [
+            epic_id
+            for epic_id, progress in self.epic_progress_all().items()
+            if epic_id in closed and not progress["complete"]
+        ]
 
     def repair_links(self) -> None:
         """Ensure all task links are bidirectional."""
-        for task in self.task_list():
-            task_obj = self._load_task(task["id"])
-            changed = False
-            for link_type, targets in list(task_obj.links.items()):
-                unique_targets = list(dict.fromkeys(targets))
-                if unique_targets != targets:
-                    task_obj.links[link_type] = unique_targets
-                    changed = True
-                for target_id in unique_targets:
-                    try:
-                        target_obj = self._load_task(target_id)
-                    except TaskNotFoundError:
-                        continue
-                    reciprocal = target_obj.links.setdefault(link_type, [])
-                    if task_obj.id not in reciprocal:
-                        reciprocal.append(task_obj.id)
-                        self._save_task(target_obj)
-            if changed:
-                self._save_task(task_obj)
+        with self._locks.tree():
+            for task in self.task_list():
+                task_obj = self._load_task(task["id"])
+                changed = False
+                for link_type, targets in list(task_obj.links.items()):
+                    unique_targets = list(dict.fromkeys(targets))
+                    if unique_targets != targets:
+                        task_obj.links[link_type] = unique_targets
+                        changed = True
+                    for target_id in unique_targets:
+                        try:
+                            target_obj = self._load_task(target_id)
+                        except TaskNotFoundError:
+                            continue
+                        reciprocal = target_obj.links.setdefault(link_type, [])
+                        if task_obj.id not in reciprocal:
+                            reciprocal.append(task_obj.id)
+                            self._save_task(target_obj)
+                if changed:
+                    self._save_task(task_obj)
 
     def _load_task(self, task_id: str) -> Task:
         """Load task data from file."""
+        if self._batch is not None and task_id in self._batch.tasks:
+            return copy.deepcopy(self._batch.tasks[task_id][1])
         task_file = self._find_task_file(task_id)
         if not task_file:
             raise TaskNotFoundError(f"Task '{task_id}' not found")
@@ -285,57 +495,134 @@ class TaskManager:
         if not task_file:
             raise TaskNotFoundError(f"Task '{task_id}' not found")
 
+        # A task staged earlier in the batch was already checked against disk.
+        staged = self._batch.tasks if self._batch is not None else {}
+        if self.check_conflicts and task_id not in staged:
+            current = load_json(task_file)
+            if current is not None and current.get("updated_at") != task_data.updated_at:
+                raise ConflictError(
+                    f"Task '{task_id}' was modified by another writer since it was loaded"
+                )
+
         task_data.updated_at = time.time()
+        if self._batch is not None:
+            staged[task_id] = (task_file, task_data)
+            return
         if not save_json(task_file, task_data.to_dict()):
             raise StorageError(f"Failed to save task '{task_id}'")
-        self._invalidate_task_cache()
+        self._task_saved(task_file, task_data)
+
+    def _task_saved(self, task_file: Path, task_data: Task) -> None:
+        """Update the index and cached listings after a task was written."""
+        old = self._index.get(task_data.id)
+        self._index.update(task_file, task_data)
+        self._patch_task_cache(old, self._index.get(task_data.id))
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group mutations into a single unit of work.
+
+        Inside the block, task and epic updates are staged in memory and
+        later reads see the staged versions; several edits to the same file
+        are written once. Parent epic auto-close runs once per touched item
+        when the block exits, and all dirty files are then replaced together
+        through a journal, so other readers see either none or all of the
+        changes. If the block raises, staged changes are discarded.
+
+        Creating and deleting tasks, epics and queues still happens
+        immediately, and listings reflect committed data only. The tree
+        lock is held exclusively for the whole block. Nested calls join the
+        outer batch.
+        """
+        if self._batch is not None:
+            yield
+            return
+        with self._locks.tree():
+            self._batch = _Batch()
+            try:
+                yield
+                self._commit_batch()
+            except BaseException:
+                if self._batch is not None and self._batch.epics:
+                    self.epic_manager.invalidate_parent_index()
+                raise
+            finally:
+                self._batch = None
+
+    def _commit_batch(self) -> None:
+        """Run deferred auto-close checks and write every staged file."""
+        batch = self._batch
+        assert batch is not None
+        batch.committing = True
+        for item_id in list(batch.auto_close):
+            self._auto_close_parent_epics(item_id)
+
+        files = {path: task.to_dict() for path, task in batch.tasks.values()}
+        files.update({path: epic.to_dict() for path, epic in batch.epics.values()})
+        if not files:
+            return
+        if not save_json_batch(files, self.tasks_root / BATCH_JOURNAL_FILE):
+            raise StorageError("Failed to save batched changes")
+        for task_file, task_data in batch.tasks.values():
+            self._task_saved(task_file, task_data)
+        if batch.epics:
+            self._invalidate_epic_cache()
 
     def task_list(
         self,
         status: Optional[str] = None,
         queue: Optional[str] = None,
         epic: Optional[str] = None,
+        after: Optional[Tuple[float, str]] = None,
+        limit: Optional[int] = None,
     ) -> List[Dict]:
-        """List tasks with optional filtering."""
+        """List task summaries with optional filtering.
+
+        Only the fields kept in the task index are returned
+        (``id``, ``title``, ``status``, ``queue``, ``epics`` and
+        ``created_at``); use :meth:`task_show` or :meth:`iter_tasks` for full
+        task data. Each call first has the index stat the queue directories,
+        so tasks written by other processes show up.
+
+        Tasks are sorted by ``(created_at, id)``. The returned list may be
+        shared with other callers and is never changed once returned; treat
+        it and its summaries as read-only.
+
+        For callers that show tasks a page at a time, ``after`` takes the
+        ``(created_at, id)`` of the last task already shown and only tasks
+        following it are returned, at most ``limit`` of them. Unlike an
+        offset, this key stays valid when tasks are added or deleted
+        between pages.
+        """
+        if self._index.sync():
+            self._invalidate_task_cache()
         cache_key = (status, queue, epic)
-        if cache_key in self._task_list_cache:
-            return self._task_list_cache[cache_key]
-
-        tasks: List[Dict] = []
-        
-        # Determine which queues to search
-        if queue:
-            queue_dirs = [self.tasks_root / queue] if (self.tasks_root / queue).exists() else []
-        else:
-            queue_dirs = [d for d in self.tasks_root.iterdir() if d.is_dir()]
-        
-        for queue_dir in queue_dirs:
-            for task_file in queue_dir.glob("*.json"):
-                if task_file.name == "meta.json":
-                    continue
-
-                try:
-                    data = load_json(task_file)
-                    if data is None:
-                        continue
-                    task_obj = Task.from_dict(data)
-
-                    # Filter by status if specified
-                    if status and task_obj.status.value != status:
-                        continue
-                    # Filter by epic if specified
-                    if epic and epic not in task_obj.epics:
-                        continue
+        tasks = self._task_list_cache.get(cache_key)
+        if tasks is None:
+            tasks = [dict(t) for t in self._index.query(status, queue, epic)]
+            # Kept current by _patch_task_cache on every task write.
+            self._task_list_cache[cache_key] = tasks
+        if after is None and limit is None:
+            return tasks
+        start = 0 if after is None else bisect.bisect_right(tasks, tuple(after), key=_sort_key)
+        return tasks[start:None if limit is None else start + limit]
+
+    def iter_tasks(
+        self,
+        status: Optional[str] = None,
+        queue: Optional[str] = None,
+        epic: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """Yield full task data for tasks matching the filters.
 
-                    tasks.append(task_obj.to_dict())
-                except (FileNotFoundError, PermissionError, json.JSONDecodeError) as e:
-                    log_error(f"Error processing task file '{task_file}': {e}")
-                    continue
-        
-        # Sort by creation time
-        tasks.sort(key=lambda t: t.get("created_at", 0))
-        self._task_list_cache[cache_key] = tasks
-        return tasks
+        Task files are read one at a time in ``task_list`` order; tasks that
+        disappear or become unreadable while iterating are skipped.
+        """
+        for summary in self.task_list(status, queue, epic):
+            try:
+                yield self.task_show(summary["id"])
+            except (TaskNotFoundError, StorageError):
+                continue
 
     def task_show(self, task_id: str) -> Dict:
         """Show detailed information about a task."""
@@ -344,111 +631,118 @@ class TaskManager:
 
     def task_update(self, task_id: str, field: str, value: str) -> None:
         """Update a specific field of a task."""
-        task_data = self._load_task(task_id)
-        
-        # Validate field
-        allowed_fields = ['title', 'description', 'status']
-        if field not in allowed_fields:
-            raise InvalidFieldError(
-                f"Field '{field}' is not allowed. Allowed fields: {', '.join(allowed_fields)}"
-            )
+        with self._locks.hold(f"task:{task_id}"):
+            task_data = self._load_task(task_id)
         
-        # Handle status field specially to convert string to enum
-        actual_value: Union[str, TaskStatus] = value
-        if field == 'status':
-            try:
-                actual_value = TaskStatus(value)
-            except ValueError:
-                valid_statuses = [status.value for status in TaskStatus]
+            # Validate field
+            allowed_fields = ['title', 'description', 'status']
+            if field not in allowed_fields:
                 raise InvalidFieldError(
-                    f"Invalid status '{value}'. Valid statuses: {', '.join(valid_statuses)}"
+                    f"Field '{field}' is not allowed. Allowed fields: {', '.join(allowed_fields)}"
                 )
         
-        setattr(task_data, field, actual_value)
+            # Handle status field specially to convert string to enum
+            actual_value: Union[str, TaskStatus] = value
+            if field == 'status':
+                try:
+                    actual_value = TaskStatus(value)
+                except ValueError:
+                    valid_statuses = [status.value for status in TaskStatus]
+                    raise InvalidFieldError(
+                        f"Invalid status '{value}'. Valid statuses: {', '.join(valid_statuses)}"
+                    )
+        
+            setattr(task_data, field, actual_value)
 
-        self._save_task(task_data)
-        logger.info(f"Task '{task_id}' updated successfully")
+            self._save_task(task_data)
+            logger.info(f"Task '{task_id}' updated successfully")
 
         if field == 'status' and actual_value == TaskStatus.DONE:
             self._auto_close_parent_epics(task_id)
 
     def task_start(self, task_id: str) -> None:
         """Start a task (set status to 'in_progress' and record time)."""
-        task_data = self._load_task(task_id)
+        with self._locks.hold(f"task:{task_id}"):
+            task_data = self._load_task(task_id)
 
-        task_data.status = TaskStatus.IN_PROGRESS
-        if task_data.started_at is None:
-            task_data.started_at = time.time()
+            task_data.status = TaskStatus.IN_PROGRESS
+            if task_data.started_at is None:
+                task_data.started_at = time.time()
 
-        self._save_task(task_data)
-        logger.info(f"Task '{task_id}' updated successfully")
+            self._save_task(task_data)
+            logger.info(f"Task '{task_id}' updated successfully")
 
     def task_done(self, task_id: str) -> None:
         """Mark a task as done (set status to 'done' and record time)."""
-        task_data = self._load_task(task_id)
+        with self._locks.hold(f"task:{task_id}"):
+            task_data = self._load_task(task_id)
 
-        task_data.status = TaskStatus.DONE
-        if task_data.closed_at is None:
-            task_data.closed_at = time.time()
+            task_data.status = TaskStatus.DONE
+            if task_data.closed_at is None:
+                task_data.closed_at = time.time()
+
+            self._save_task(task_data)
+            logger.info(f"Task '{task_id}' updated successfully")
 
-        self._save_task(task_data)
-        logger.info(f"Task '{task_id}' updated successfully")
         self._auto_close_parent_epics(task_id)
 
     def task_comment_add(self, task_id: str, comment: str) -> int:
         """Add a comment to a task."""
-        task_data = self._load_task(task_id)
+        with self._locks.hold(f"task:{task_id}"):
+            task_data = self._load_task(task_id)
         
-        # Generate comment ID
-        existing_ids = [c.get("id", 0) for c in task_data.comments]
-        comment_id = max(existing_ids, default=0) + 1
+            # Generate comment ID
+            existing_ids = [c.get("id", 0) for c in task_data.comments]
+            comment_id = max(existing_ids, default=0) + 1
         
-        comment_data = {
-            "id": comment_id,
-            "text": comment,
-            "created_at": time.time(),
-        }
+            comment_data = {
+                "id": comment_id,
+                "text": comment,
+                "created_at": time.time(),
+            }
 
-        task_data.comments.append(comment_data)
+            task_data.comments.append(comment_data)
         
-        self._save_task(task_data)
-        logger.info(f"Comment added to task '{task_id}' with ID {comment_id}")
-        return comment_id
+            self._save_task(task_data)
+            logger.info(f"Comment added to task '{task_id}' with ID {comment_id}")
+            return comment_id
 
     def task_comment_edit(self, task_id: str, comment_id: int, text: str) -> None:
         """Edit a comment on a task."""
-        task_data = self._load_task(task_id)
+        with self._locks.hold(f"task:{task_id}"):
+            task_data = self._load_task(task_id)
 
-        for comment in task_data.comments:
-            if comment.get("id") == comment_id:
-                comment["text"] = text
-                comment["updated_at"] = time.time()
-                break
-        else:
-            raise CommentNotFoundError(
-                f"Comment with ID {comment_id} not found in task '{task_id}'"
-            )
+            for comment in task_data.comments:
+                if comment.get("id") == comment_id:
+                    comment["text"] = text
+                    comment["updated_at"] = time.time()
+                    break
+            else:
+                raise CommentNotFoundError(
+                    f"Comment with ID {comment_id} not found in task '{task_id}'"
+                )
 
-        self._save_task(task_data)
-        logger.info(f"Comment {comment_id} edited in task '{task_id}'")
+            self._save_task(task_data)
+            logger.info(f"Comment {comment_id} edited in task '{task_id}'")
 
     def task_comment_remove(self, task_id: str, comment_id: int) -> None:
         """Remove a comment from a task."""
-        task_data = self._load_task(task_id)
+        with self._locks.hold(f"task:{task_id}"):
+            task_data = self._load_task(task_id)
 
-        comments = task_data.comments
-        original_count = len(comments)
+            comments = task_data.comments
+            original_count = len(comments)
         
-        # Remove comment with matching ID
-        task_data.comments = [c for c in comments if c.get("id") != comment_id]
+            # Remove comment with matching ID
+            task_data.comments = [c for c in comments if c.get("id") != comment_id]
         
-        if len(task_data.comments) == original_count:
-            raise CommentNotFoundError(
-                f"Comment with ID {comment_id} not found in task '{task_id}'"
-            )
+            if len(task_data.comments) == original_count:
+                raise CommentNotFoundError(
+                    f"Comment with ID {comment_id} not found in task '{task_id}'"
+                )
         
-        self._save_task(task_data)
-        logger.info(f"Comment {comment_id} removed from task '{task_id}'")
+            self._save_task(task_data)
+            logger.info(f"Comment {comment_id} removed from task '{task_id}'")
 
     def task_comment_list(self, task_id: str) -> List[Dict]:
         """List all comments for a task."""
@@ -459,60 +753,62 @@ class TaskManager:
         self, task_id: str, target_id: str, link_type: str = "related"
     ) -> None:
         """Add a link between two tasks."""
-        task_data = self._load_task(task_id)
-        target_data = self._load_task(target_id)
+        with self._locks.hold(f"task:{task_id}", f"task:{target_id}"):
+            task_data = self._load_task(task_id)
+            target_data = self._load_task(target_id)
 
-        links = task_data.links.setdefault(link_type, [])
-        target_links = target_data.links.setdefault(link_type, [])
+            links = task_data.links.setdefault(link_type, [])
+            target_links = target_data.links.setdefault(link_type, [])
 
-        if target_id in links and task_id in target_links:
-            raise LinkAlreadyExistsError(
-                f"Link between {task_id} and {target_id} already exists"
-            )
+            if target_id in links and task_id in target_links:
+                raise LinkAlreadyExistsError(
+                    f"Link between {task_id} and {target_id} already exists"
+                )
 
-        if target_id not in links:
-            links.append(target_id)
+            if target_id not in links:
+                links.append(target_id)
 
-        if task_id not in target_links:
-            target_links.append(task_id)
+            if task_id not in target_links:
+                target_links.append(task_id)
 
-        self._save_task(task_data)
-        self._save_task(target_data)
-        logger.info(
-            f"Link added between {task_id} and {target_id} (type: {link_type})"
-        )
+            self._save_task(task_data)
+            self._save_task(target_data)
+            logger.info(
+                f"Link added between {task_id} and {target_id} (type: {link_type})"
+            )
 
     def task_link_remove(
         self, task_id: str, target_id: str, link_type: str = "related"
     ) -> None:
         """Remove a link between two tasks."""
-        task_data = self._load_task(task_id)
-        target_data = self._load_task(target_id)
+        with self._locks.hold(f"task:{task_id}", f"task:{target_id}"):
+            task_data = self._load_task(task_id)
+            target_data = self._load_task(target_id)
 
-        removed = False
+            removed = False
 
-        if target_id in task_data.links.get(link_type, []):
-            task_data.links[link_type].remove(target_id)
-            if not task_data.links[link_type]:
-                del task_data.links[link_type]
-            removed = True
+            if target_id in task_data.links.get(link_type, []):
+                task_data.links[link_type].remove(target_id)
+                if not task_data.links[link_type]:
+                    del task_data.links[link_type]
+                removed = True
 
-        if task_id in target_data.links.get(link_type, []):
-            target_data.links[link_type].remove(task_id)
-            if not target_data.links[link_type]:
-                del target_data.links[link_type]
-            removed = True
+            if task_id in target_data.links.get(link_type, []):
+                target_data.links[link_type].remove(task_id)
+                if not target_data.links[link_type]:
+                    del target_data.links[link_type]
+                removed = True
 
-        if not removed:
-            raise LinkNotFoundError(
-                f"Link between {task_id} and {target_id} not found"
-            )
+            if not removed:
+                raise LinkNotFoundError(
+                    f"Link between {task_id} and {target_id} not found"
+                )
 
-        self._save_task(task_data)
-        self._save_task(target_data)
-        logger.info(
-            f"Link removed between {task_id} and {target_id} (type: {link_type})"
-        )
+            self._save_task(task_data)
+            self._save_task(target_data)
+            logger.info(
+                f"Link removed between {task_id} and {target_id} (type: {link_type})"
+            )
 
     def task_link_list(self, task_id: str) -> Dict[str, List[str]]:
         """List links for a task."""
@@ -521,32 +817,43 @@ class TaskManager:
 
     def queue_delete(self, name: str) -> None:
         """Delete an entire queue and all its tasks."""
-        queue_dir = self.tasks_root / name
-        if not queue_dir.exists() or not queue_dir.is_dir():
-            raise QueueNotFoundError(f"Queue '{name}' not found")
-
-        try:
-            import shutil
+        with self._locks.tree():
+            queue_dir = self.tasks_root / name
+            if not queue_dir.exists() or not queue_dir.is_dir():
+                raise QueueNotFoundError(f"Queue '{name}' not found")
 
-            shutil.rmtree(queue_dir)
-            logger.info(f"Queue '{name}' deleted successfully")
-            self._invalidate_queue_cache()
-            self._invalidate_task_cache()
-        except (OSError, IOError) as e:
-            raise StorageError(f"Error deleting queue '{name}': {e}")
+            try:
+                import shutil
+
+                shutil.rmtree(queue_dir)
+                if self._batch is not None:
+                    staged = self._batch.tasks
+                    for task_id in [t for t, (f, _) in staged.items() if f.parent == queue_dir]:
+                        del staged[task_id]
+                logger.info(f"Queue '{name}' deleted successfully")
+                self._index.remove_queue(name)
+                self._invalidate_queue_cache()
+                self._invalidate_task_cache()
+            except (OSError, IOError) as e:
+                raise StorageError(f"Error deleting queue '{name}': {e}")
 
     def task_delete(self, task_id: str) -> None:
         """Delete a task file from its queue."""
-        task_file = self._find_task_file(task_id)
-        if not task_file or not task_file.exists():
-            raise TaskNotFoundError(f"Task '{task_id}' not found")
+        with self._locks.hold(f"task:{task_id}"):
+            task_file = self._find_task_file(task_id)
+            if not task_file or not task_file.exists():
+                raise TaskNotFoundError(f"Task '{task_id}' not found")
 
-        try:
-            task_file.unlink()
-            logger.info(f"Task '{task_id}' deleted successfully")
-            self._invalidate_task_cache()
-        except (OSError, IOError) as e:
-            raise StorageError(f"Error deleting task '{task_id}': {e}")
+            try:
+                task_file.unlink()
+                if self._batch is not None:
+                    self._batch.tasks.pop(task_id, None)
+                logger.info(f"Task '{task_id}' deleted successfully")
+                old = self._index.get(task_id)
+                self._index.remove(task_file)
+                self._patch_task_cache(old, None)
+            except (OSError, IOError) as e:
+                raise StorageError(f"Error deleting task '{task_id}': {e}")
 
     # ------------------------------------------------------------------
     # Epic persistence methods
@@ -555,14 +862,17 @@ class TaskManager:
     def epic_add(self, title: str, description: str) -> str:
         """Create a new epic."""
         try:
-            epic_num = self._get_next_epic_number()
-            epic_id = f"epic-{epic_num}"
-            epic_file = self.epics_root / f"{epic_id}.json"
+            with self._locks.hold("epics"):
+                epic_num = self._get_next_epic_number()
+                epic_id = f"epic-{epic_num}"
+                epic_file = self.epics_root / f"{epic_id}.json"
+
+                epic_obj = Epic(id=epic_id, title=title, description=description)
 
-            epic_obj = Epic(id=epic_id, title=title, description=description)
+                if not save_json(epic_file, epic_obj.to_dict()):
+                    raise StorageError(f"Failed to save epic '{epic_id}' to file")
 
-            if not save_json(epic_file, epic_obj.to_dict()):
-                raise StorageError(f"Failed to save epic '{epic_id}' to file")
+                save_json(self.epics_root / EPICS_META_FILE, {"next_id": epic_num + 1})
 
             logger.info(f"Epic '{epic_id}' created successfully")
             self._invalidate_epic_cache()
@@ -586,31 +896,32 @@ class TaskManager:
 
     def epic_update(self, epic_id: str, field: str, value: str) -> None:
         """Update an epic field."""
-        epic_data = self._load_epic(epic_id)
-
-        allowed_fields = ["title", "description", "status"]
-        if field not in allowed_fields:
-            raise InvalidFieldError(
-                f"Field '{field}' is not allowed. Allowed fields: {', '.join(allowed_fields)}"
-            )
+        with self._locks.hold(f"epic:{epic_id}"):
+            epic_data = self._load_epic(epic_id)
 
-        actual_value: Union[str, EpicStatus] = value
-        if field == "status":
-            try:
-                actual_value = EpicStatus(value)
-            except ValueError:
-                valid = [s.value for s in EpicStatus]
+            allowed_fields = ["title", "description", "status"]
+            if field not in allowed_fields:
                 raise InvalidFieldError(
-                    f"Invalid status '{value}'. Valid statuses: {', '.join(valid)}"
-                )
-            if actual_value == EpicStatus.CLOSED and not self._can_close_epic(epic_data):
-                raise InvalidFieldError(
-                    f"Cannot close epic '{epic_id}' because child tasks or epics are incomplete"
+                    f"Field '{field}' is not allowed. Allowed fields: {', '.join(allowed_fields)}"
                 )
 
-        setattr(epic_data, field, actual_value)
-        self._save_epic(epic_data)
-        logger.info(f"Epic '{epic_id}' updated successfully")
+            actual_value: Union[str, EpicStatus] = value
+            if field == "status":
+                try:
+                    actual_value = EpicStatus(value)
+                except ValueError:
+                    valid = [s.value for s in EpicStatus]
+                    raise InvalidFieldError(
+                        f"Invalid status '{value}'. Valid statuses: {', '.join(valid)}"
+                    )
+                if actual_value == EpicStatus.CLOSED and not self._can_close_epic(epic_data):
+                    raise InvalidFieldError(
+                        f"Cannot close epic '{epic_id}' because child tasks or epics are incomplete"
+                    )
+
+            setattr(epic_data, field, actual_value)
+            self._save_epic(epic_data)
+            logger.info(f"Epic '{epic_id}' updated successfully")
 
         if field == "status" and actual_value == EpicStatus.CLOSED:
             if epic_data.parent_epic:
@@ -618,93 +929,94 @@ class TaskManager:
 
     def epic_add_task(self, epic_id: str, task_id: str) -> None:
         """Add a task to an epic."""
-        epic_data = self._load_epic(epic_id)
-        task_data = self._load_task(task_id)
+        with self._locks.hold(f"epic:{epic_id}", f"task:{task_id}"):
+            epic_data = self._load_epic(epic_id)
+            task_data = self._load_task(task_id)
 
-        if task_id not in epic_data.child_tasks:
-            epic_data.child_tasks.append(task_id)
-        if epic_id not in task_data.epics:
-            task_data.epics.append(epic_id)
+            if task_id not in epic_data.child_tasks:
+                epic_data.child_tasks.append(task_id)
+            if epic_id not in task_data.epics:
+                task_data.epics.append(epic_id)
 
-        self._save_epic(epic_data)
-        self._save_task(task_data)
+            self._save_epic(epic_data)
+            self._save_task(task_data)
 
     def epic_add_epic(self, epic_id: str, child_epic_id: str) -> None:
         """Add a child epic to an epic."""
-        parent_epic = self._load_epic(epic_id)
-        child_epic = self._load_epic(child_epic_id)
+        with self._locks.hold(f"epic:{epic_id}", f"epic:{child_epic_id}"):
+            parent_epic = self._load_epic(epic_id)
+            child_epic = self._load_epic(child_epic_id)
 
-        if child_epic_id not in parent_epic.child_epics:
-            parent_epic.child_epics.append(child_epic_id)
-        child_epic.parent_epic = epic_id
+            if child_epic_id not in parent_epic.child_epics:
+                parent_epic.child_epics.append(child_epic_id)
+            child_epic.parent_epic = epic_id
 
-        self._save_epic(parent_epic)
-        self._save_epic(child_epic)
+            self._save_epic(parent_epic)
+            self._save_epic(child_epic)
 
     def epic_delete(self, epic_id: str) -> None:
         """Delete an epic."""
-        epic_file = self._find_epic_file(epic_id)
-        if not epic_file or not epic_file.exists():
-            raise TaskNotFoundError(f"Epic '{epic_id}' not found")
-
-        try:
-            epic_file.unlink()
+        with self._locks.hold(f"epic:{epic_id}"):
+            self.epic_manager.delete_epic(epic_id)
+            if self._batch is not None:
+                self._batch.epics.pop(epic_id, None)
             logger.info(f"Epic '{epic_id}' deleted successfully")
             self._invalidate_epic_cache()
-        except (OSError, IOError) as e:
-            raise StorageError(f"Error deleting epic '{epic_id}': {e}")
 
     def epic_remove_task(self, epic_id: str, task_id: str) -> None:
         """Remove a task from an epic."""
-        epic_data = self._load_epic(epic_id)
-        try:
-            task_data = self._load_task(task_id)
-        except TaskNotFoundError:
-            task_data = None
-        try:
-            epic_data.child_tasks.remove(task_id)
-        except ValueError:
-            raise TaskNotFoundError(
-                f"Task '{task_id}' not found in epic '{epic_id}'"
-            )
+        with self._locks.hold(f"epic:{epic_id}", f"task:{task_id}"):
+            epic_data = self._load_epic(epic_id)
+            try:
+                task_data = self._load_task(task_id)
+            except TaskNotFoundError:
+                task_data = None
+            try:
+                epic_data.child_tasks.remove(task_id)
+            except ValueError:
+                raise TaskNotFoundError(
+                    f"Task '{task_id}' not found in epic '{epic_id}'"
+                )
 
-        if task_data and epic_id in task_data.epics:
-            task_data.epics.remove(epic_id)
+            if task_data and epic_id in task_data.epics:
+                task_data.epics.remove(epic_id)
 
-        self._save_epic(epic_data)
-        if task_data:
-            self._save_task(task_data)
+            self._save_epic(epic_data)
+            if task_data:
+                self._save_task(task_data)
 
     def epic_remove_epic(self, epic_id: str, child_epic_id: str) -> None:
         """Remove a child epic from an epic."""
-        parent_epic = self._load_epic(epic_id)
-        child_epic = self._load_epic(child_epic_id)
+        with self._locks.hold(f"epic:{epic_id}", f"epic:{child_epic_id}"):
+            parent_epic = self._load_epic(epic_id)
+            child_epic = self._load_epic(child_epic_id)
 
-        try:
-            parent_epic.child_epics.remove(child_epic_id)
-        except ValueError:
-            raise TaskNotFoundError(
-                f"Epic '{child_epic_id}' not found in epic '{epic_id}'"
-            )
+            try:
+                parent_epic.child_epics.remove(child_epic_id)
+            except ValueError:
+                raise TaskNotFoundError(
+                    f"Epic '{child_epic_id}' not found in epic '{epic_id}'"
+                )
 
-        if child_epic.parent_epic == epic_id:
-            child_epic.parent_epic = None
+            if child_epic.parent_epic == epic_id:
+                child_epic.parent_epic = None
 
-        self._save_epic(parent_epic)
-        self._save_epic(child_epic)
+            self._save_epic(parent_epic)
+            self._save_epic(child_epic)
 
     def epic_done(self, epic_id: str) -> None:
         """Mark an epic as closed if all children are complete."""
-        epic_data = self._load_epic(epic_id)
+        with self._locks.hold(f"epic:{epic_id}"):
+            epic_data = self._load_epic(epic_id)
 
-        if not self._can_close_epic(epic_data):
-            raise InvalidFieldError(
-                f"Cannot close epic '{epic_id}' because child tasks or epics are incomplete"
-            )
+            if not self._can_close_epic(epic_data):
+                raise InvalidFieldError(
+                    f"Cannot close epic '{epic_id}' because child tasks or epics are incomplete"
+                )
 
-        epic_data.status = EpicStatus.CLOSED
-        self._save_epic(epic_data)
-        logger.info(f"Epic '{epic_id}' updated successfully")
+            epic_data.status = EpicStatus.CLOSED
+            self._save_epic(epic_data)
+            logger.info(f"Epic '{epic_id}' updated successfully")
 
         if epic_data.parent_epic:
             self._auto_close_parent_epics(epic_id)
@@ -3,10 +3,328 @@
 from __future__ import annotations
 
 from pathlib import Path
+import hashlib
 import html
+import itertools
+import json
+import shutil
+import sys
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
 
 from .core import TaskManager
+from .models import TaskStatus
+from .export_shards import collect_task_sources, is_trusted, source_digest
 from .github_api import fetch_github_tasks
+from .index import path_stamp
+from .storage import atomic_output, load_json, save_json
+
+MANIFEST_VERSION = 1
+DATA_VERSION = 1
+# Fragment holding the rows of tasks fetched from other repositories.
+REMOTE_FRAGMENT = ".remote"
+
+STYLE = "table{border-collapse:collapse}th,td{border:1px solid #ccc;padding:4px}"
+TASK_HEADER = "<thead><tr><th>ID</th><th>Title</th><th>Status</th><th>Queue</th></tr></thead>"
+
+
+# Shell page for the virtualized layout. It loads the columnar data file and
+# only creates DOM rows for the part of the table that is scrolled into view.
+VIRTUAL_SHELL = """<!DOCTYPE html>
+<html lang='en'>
+<head>
+<meta charset='utf-8'>
+<title>Task Dashboard</title>
+<style>
+body{font-family:sans-serif}
+#view{height:80vh;overflow-y:auto;border:1px solid #ccc;position:relative}
+.row{position:absolute;left:0;right:0;height:24px;line-height:24px;display:flex;border-bottom:1px solid #eee}
+.head{display:flex;font-weight:bold;cursor:pointer}
+.row span,.head span{flex:1;overflow:hidden;white-space:nowrap;text-overflow:ellipsis;padding:0 4px}
+.row span:nth-child(2),.head span:nth-child(2){flex:3}
+</style>
+</head>
+<body>
+<h1>Task Dashboard</h1>
+<input id='filter' placeholder='Filter by id or title'>
+<select id='status'><option value=''>All statuses</option></select>
+<span id='count'></span>
+<div class='head'><span data-key='id'>ID</span><span data-key='title'>Title</span><span data-key='status'>Status</span><span data-key='queue'>Queue</span></div>
+<div id='view'><div id='spacer'></div></div>
+<script>
+const ROW = 24;
+const view = document.getElementById('view');
+const spacer = document.getElementById('spacer');
+let data, order = [], sortKey = null, sortDir = 1;
+
+function label(key, i) {
+  if (key === 'status') return data.statuses[data.status[i]];
+  if (key === 'queue') return data.queues[data.queue[i]];
+  return data[key][i];
+}
+
+function apply() {
+  const text = document.getElementById('filter').value.toLowerCase();
+  const status = document.getElementById('status').value;
+  order = [];
+  for (let i = 0; i < data.id.length; i++) {
+    if (status !== '' && data.status[i] !== Number(status)) continue;
+    if (text && !data.id[i].toLowerCase().includes(text) && !data.title[i].toLowerCase().includes(text)) continue;
+    order.push(i);
+  }
+  if (sortKey) {
+    order.sort((a, b) => label(sortKey, a) < label(sortKey, b) ? -sortDir : label(sortKey, a) > label(sortKey, b) ? sortDir : a - b);
+  }
+  document.getElementById('count').textContent = order.length + ' tasks';
+  spacer.style.height = order.length * ROW + 'px';
+  render();
+}
+
+function render() {
+  const first = Math.max(0, Math.floor(view.scrollTop / ROW) - 10);
+  const last = Math.min(order.length, Math.ceil((view.scrollTop + view.clientHeight) / ROW) + 10);
+  const rows = document.createDocumentFragment();
+  for (let n = first; n < last; n++) {
+    const row = document.createElement('div');
+    row.className = 'row';
+    row.style.top = n * ROW + 'px';
+    for (const key of ['id', 'title', 'status', 'queue']) {
+      const cell = document.createElement('span');
+      cell.textContent = label(key, order[n]);
+      row.appendChild(cell);
+    }
+    rows.appendChild(row);
+  }
+  spacer.replaceChildren(rows);
+}
+
+fetch(__DATA__).then(r => r.json()).then(d => {
+  data = d;
+  const select = document.getElementById('status');
+  data.statuses.forEach((s, i) => select.add(new Option(s, i)));
+  document.getElementById('filter').addEventListener('input', apply);
+  select.addEventListener('change', apply);
+  document.querySelectorAll('.head span').forEach(h => h.addEventListener('click', () => {
+    sortDir = sortKey === h.dataset.key ? -sortDir : 1;
+    sortKey = h.dataset.key;
+    apply();
+  }));
+  view.addEventListener('scroll', () => requestAnimationFrame(render));
+  apply();
+});
+</script>
+</body>
+</html>"""
+
+
+def _queue_of(task: Dict) -> str:
+    return task["id"].rsplit("-", 1)[0]
+
+
+def _row(task: Dict) -> str:
+    return "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>".format(
+        html.escape(task["id"]),
+        html.escape(task["title"]),
+        html.escape(task["status"]),
+        html.escape(_queue_of(task)),
+    )
+
+
+def _write_head(f: IO[str], title: str) -> None:
+    f.write(
+        "<!DOCTYPE html>\n<html lang='en'>\n<head>\n<meta charset='utf-8'>\n"
+        f"<title>{html.escape(title)}</title>\n<style>{STYLE}</style>\n</head>\n<body>\n"
+        f"<h1>{html.escape(title)}</h1>\n"
+    )
+
+
+def _write_rows(f: IO[str], tasks: Iterable[Dict]) -> int:
+    count = 0
+    for task in tasks:
+        f.write(_row(task))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def _write_table(f: IO[str], tasks: Iterable[Dict]) -> int:
+    f.write(f"<table>\n{TASK_HEADER}\n<tbody>\n")
+    count = _write_rows(f, tasks)
+    f.write("</tbody>\n</table>\n")
+    return count
+
+
+def _render_fragment(path: Path, tasks: Iterable[Dict], old_hash: str | None) -> str:
+    """Write the rows of ``tasks`` to ``path`` if they changed; return their hash."""
+    tmp = path.with_name(f".{path.name}.new")
+    with open(tmp, "w", encoding="utf-8") as f:
+        _write_rows(f, tasks)
+    digest = hashlib.sha256(tmp.read_bytes()).hexdigest()
+    if digest == old_hash and path.exists():
+        tmp.unlink()
+    else:
+        tmp.replace(path)
+    return digest
+
+
+def _incremental_cache(output: Path) -> Path:
+    return output.with_name(f".{output.name}.cache")
+
+
+def _generate_incremental(
+    tm: TaskManager, output: Path, remote: List[Dict], force: bool
+) -> bool:
+    """Assemble ``output`` from per-queue row fragments; return True if written.
+
+    Fragments are cached in ``.<output name>.cache`` next to the output with
+    a manifest of each queue's source file stamps and fragment hash. Only
+    queues whose task files changed are rendered again, and the output is
+    left untouched when no fragment hash changed and its own stamp still
+    matches the one recorded when it was written.
+    """
+    cache = _incremental_cache(output)
+    cache.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache / "manifest.json"
+    previous = load_json(manifest_path) or {}
+    if previous.get("version") != MANIFEST_VERSION:
+        previous = {}
+    old_fragments: Dict[str, Dict[str, Any]] = previous.get("fragments", {})
+    trusted_before = previous.get("scanned_at", 0)
+    scanned_at = time.time_ns()
+
+    fragments: Dict[str, Dict[str, Any]] = {}
+    rendered = False
+    for queue, sources in sorted(collect_task_sources(tm.tasks_root).items()):
+        digest = source_digest(sources)
+        old = old_fragments.get(queue, {})
+        path = cache / f"{queue}.html"
+        if (
+            old.get("source") == digest
+            and is_trusted(sources, trusted_before)
+            and path.exists()
+        ):
+            fragments[queue] = old
+            continue
+        rendered = True
+        fragment_hash = _render_fragment(path, tm.task_list(queue=queue), old.get("hash"))
+        fragments[queue] = {"source": digest, "hash": fragment_hash}
+    if remote or REMOTE_FRAGMENT in old_fragments:
+        rendered = True
+        path = cache / f"{REMOTE_FRAGMENT}.html"
+        old_hash = old_fragments.get(REMOTE_FRAGMENT, {}).get("hash")
+        fragments[REMOTE_FRAGMENT] = {"hash": _render_fragment(path, remote, old_hash)}
+    for name in old_fragments.keys() - fragments.keys():
+        (cache / f"{name}.html").unlink(missing_ok=True)
+
+    output_hash = hashlib.sha256(
+        "".join(f"{name}:{entry['hash']}\n" for name, entry in fragments.items()).encode()
+    ).hexdigest()
+    # Another mode, a checkout or an editor may have replaced the output
+    # since this manifest was written.
+    output_stamp = path_stamp(output)
+    write = (
+        force
+        or output_hash != previous.get("output")
+        or output_stamp is None
+        or output_stamp != previous.get("output_stamp")
+    )
+    if write:
+        with atomic_output(output) as f:
+            _write_head(f, "Task Dashboard")
+            f.write(f"<table>\n{TASK_HEADER}\n<tbody>\n")
+            for name in fragments:
+                with open(cache / f"{name}.html", encoding="utf-8") as fragment:
+                    shutil.copyfileobj(fragment, f)
+            f.write("</tbody>\n</table>\n</body>\n</html>")
+        output_stamp = path_stamp(output)
+    if write or rendered or old_fragments.keys() != fragments.keys():
+        save_json(
+            manifest_path,
+            {
+                "version": MANIFEST_VERSION,
+                "scanned_at": scanned_at,
+                "output": output_hash,
+                "output_stamp": output_stamp,
+                "fragments": fragments,
+            },
+            durable=False,
+        )
+    return write
+
+
+def _page_name(output: Path, group: str | None, number: int) -> str:
+    parts = [output.stem] + ([group] if group else []) + [str(number)]
+    return "-".join(parts) + output.suffix
+
+
+def _write_pages(
+    output: Path, group: str | None, tasks: Iterator[Dict], page_size: int
+) -> Tuple[List[str], int]:
+    """Write ``tasks`` to pages of ``page_size`` rows; return names and count."""
+    pages: List[str] = []
+    total = 0
+    chunk = list(itertools.islice(tasks, page_size))
+    label = f"Queue {group}" if group else "Tasks"
+    while chunk or not pages:
+        following = list(itertools.islice(tasks, page_size))
+        number = len(pages) + 1
+        name = _page_name(output, group, number)
+        with atomic_output(output.with_name(name)) as f:
+            _write_head(f, f"{label} - page {number}")
+            total += _write_table(f, chunk)
+            links = [f"<a href='{html.escape(output.name)}'>Index</a>"]
+            if pages:
+                links.insert(0, f"<a href='{html.escape(pages[-1])}'>Previous</a>")
+            if following:
+                next_name = _page_name(output, group, number + 1)
+                links.append(f"<a href='{html.escape(next_name)}'>Next</a>")
+            f.write(f"<nav>{' | '.join(links)}</nav>\n</body>\n</html>")
+        pages.append(name)
+        chunk = following
+    return pages, total
+
+
+def _remove_stale_pages(output: Path, keep: List[str]) -> None:
+    """Delete pages of earlier runs that are not in ``keep``.
+
+    The names of generated pages are recorded in ``.<output name>.pages.json``
+    next to the output, so only files this module wrote are ever removed.
+    """
+    manifest = output.with_name(f".{output.name}.pages.json")
+    previous = load_json(manifest) or {}
+    for name in previous.get("pages", []):
+        if name not in keep and Path(name).name == name:
+            output.with_name(name).unlink(missing_ok=True)
+    if keep:
+        save_json(manifest, {"pages": keep}, durable=False)
+    else:
+        manifest.unlink(missing_ok=True)
+
+
+def write_data_feed(path: Path, tasks: Iterable[Dict]) -> int:
+    """Write ``tasks`` as a columnar JSON file; return the number of tasks.
+
+    Ids and titles are parallel arrays; statuses and queues are stored as
+    indexes into the ``statuses`` and ``queues`` lists.
+    """
+    statuses = {status.value: i for i, status in enumerate(TaskStatus)}
+    queues: Dict[str, int] = {}
+    columns: Dict[str, List[Any]] = {"id": [], "title": [], "status": [], "queue": []}
+    for task in tasks:
+        columns["id"].append(task["id"])
+        columns["title"].append(task["title"])
+        columns["status"].append(statuses.setdefault(task["status"], len(statuses)))
+        queue = task.get("queue") or _queue_of(task)
+        columns["queue"].append(queues.setdefault(queue, len(queues)))
+    data = {
+        "version": DATA_VERSION,
+        "statuses": list(statuses),
+        "queues": list(queues),
+        **columns,
+    }
+    with atomic_output(path) as f:
+        json.dump(data, f, separators=(",", ":"))
+    return len(columns["id"])
 
 
 def generate_dashboard(
@@ -14,6 +332,11 @@ def generate_dashboard(
     output: str = "docs/index.html",
     repos: list[str] | None = None,
     token: str | None = None,
+    cache_dir: str | None = None,
+    page_size: int | None = None,
+    split_queues: bool = False,
+    force: bool = False,
+    virtual: bool = False,
 ) -> Path:
     """Create an HTML page listing all tasks.
 
@@ -27,46 +350,86 @@ def generate_dashboard(
         Optional list of remote repositories to include using GitHub API.
     token:
         GitHub token used for authenticated requests when fetching remote tasks.
+    cache_dir:
+        Directory caching remote responses between runs.
+    page_size:
+        Split the task table into pages of at most this many rows.
+    split_queues:
+        Give every queue its own pages.
+    force:
+        Rewrite the single-page output even if nothing changed.
+    virtual:
+        Write the tasks to ``<stem>.data.json`` as parallel arrays and make
+        ``output`` a small page that filters, sorts and renders only the
+        visible rows in the browser.
+
+    The single page is regenerated incrementally: rows are grouped by queue
+    and only queues whose task files changed since the previous run are
+    rendered again, from fragments cached in ``.<output name>.cache``. The
+    output file is not rewritten when its content would not change.
+
+    With ``page_size`` or ``split_queues``, ``output`` becomes an index
+    linking to ``<stem>[-<queue>]-<n>.html`` pages written next to it.
+    Pages written by earlier runs and not by this one are removed in every
+    mode. Rows are written to the
+    file as they are produced, so memory use does not grow with the number
+    of tasks.
 
     Returns
     -------
     Path
         Location of the generated HTML file.
     """
+    if page_size is not None and page_size < 1:
+        raise ValueError("page_size must be positive")
     tm = TaskManager(tasks_root)
-    tasks = tm.task_list()
-    if repos:
-        tasks.extend(fetch_github_tasks(repos, token))
-
-    rows = [
-        "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>".format(
-            html.escape(task["id"]),
-            html.escape(task["title"]),
-            html.escape(task["status"]),
-            html.escape(task["id"].rsplit("-", 1)[0]),
-        )
-        for task in tasks
-    ]
+    remote = fetch_github_tasks(repos, token, cache_dir=cache_dir) if repos else []
+    output_path = Path(output)
 
-    html_content = f"""<!DOCTYPE html>
-<html lang='en'>
-<head>
-<meta charset='utf-8'>
-<title>Task Dashboard</title>
-<style>table{{border-collapse:collapse}}th,td{{border:1px solid #ccc;padding:4px}}</style>
-</head>
-<body>
-<h1>Task Dashboard</h1>
-<table>
-<thead><tr><th>ID</th><th>Title</th><th>Status</th><th>Queue</th></tr></thead>
-<tbody>
-{'\n'.join(rows)}
-</tbody>
-</table>
-</body>
-</html>"""
+    if virtual:
+        data_path = output_path.with_name(f"{output_path.stem}.data.json")
+        write_data_feed(data_path, itertools.chain(tm.task_list(), remote))
+        with atomic_output(output_path) as f:
+            # A JavaScript string inside a <script> element, not HTML text.
+            url = json.dumps(data_path.name).replace("</", "<\\/")
+            f.write(VIRTUAL_SHELL.replace("__DATA__", url))
+        _remove_stale_pages(output_path, [])
+        shutil.rmtree(_incremental_cache(output_path), ignore_errors=True)
+        return output_path
 
-    output_path = Path(output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(html_content, encoding="utf-8")
+    if page_size is None and not split_queues:
+        _generate_incremental(tm, output_path, remote, force)
+        _remove_stale_pages(output_path, [])
+        return output_path
+
+    limit = page_size or sys.maxsize
+    groups: List[Tuple[str | None, Iterator[Dict]]] = []
+    if split_queues:
+        remote_by_queue: Dict[str, List[Dict]] = {}
+        for task in remote:
+            remote_by_queue.setdefault(_queue_of(task), []).append(task)
+        local = [q["name"] for q in tm.queue_list()]
+        for queue in sorted(set(local) | set(remote_by_queue)):
+            tasks = tm.task_list(queue=queue) if queue in local else []
+            groups.append((queue, itertools.chain(tasks, remote_by_queue.get(queue, []))))
+    else:
+        groups.append((None, itertools.chain(tm.task_list(), remote)))
+
+    written: List[str] = []
+    with atomic_output(output_path) as f:
+        _write_head(f, "Task Dashboard")
+        f.write("<table>\n<thead><tr><th>Queue</th><th>Tasks</th><th>Pages</th></tr></thead>\n")
+        f.write("<tbody>\n")
+        for group, rows in groups:
+            pages, total = _write_pages(output_path, group, rows, limit)
+            written.extend(pages)
+            links = " ".join(
+                f"<a href='{html.escape(name)}'>{i}</a>" for i, name in enumerate(pages, 1)
+            )
+            f.write(
+                f"<tr><td>{html.escape(group or 'All')}</td><td>{total}</td><td>{links}</td></tr>\n"
+            )
+        f.write("</tbody>\n</table>\n</body>\n</html>")
+    _remove_stale_pages(output_path, written)
+    shutil.rmtree(_incremental_cache(output_path), ignore_errors=True)
     return output_path
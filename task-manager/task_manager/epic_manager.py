@@ -2,18 +2,88 @@ from __future__ import annotations
 
 import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 
-from .models import Epic
+from .models import Epic, EpicStatus, TaskStatus
 from .storage import load_json, save_json
-from .exceptions import StorageError, TaskNotFoundError
+from .exceptions import ConflictError, StorageError, TaskNotFoundError
 from .utils import log_error
 
+def rollup_progress(
+    epics: Dict[str, Dict[str, Any]], statuses: Dict[str, str]
+) -> Dict[str, Dict[str, Any]]:
+    """Return the progress of every epic in ``epics``.
+
+    ``statuses`` maps task IDs to status values. ``done``/``total`` count the
+    tasks of an epic and of its nested child epics, each sub-epic once even
+    if reachable twice; missing children are ignored. ``complete`` is True
+    when every direct child task is done and every direct child epic closed.
+    """
+    done_value = TaskStatus.DONE.value
+    direct: Dict[str, List[int]] = {}
+    for epic_id, epic in epics.items():
+        known = [statuses[t] for t in epic.get("child_tasks", []) if t in statuses]
+        direct[epic_id] = [len(known), known.count(done_value)]
+
+    progress: Dict[str, Dict[str, Any]] = {}
+    for epic_id, epic in epics.items():
+        total = done = 0
+        seen = set()
+        stack = [epic_id]
+        while stack:
+            current = stack.pop()
+            if current in seen or current not in epics:
+                continue
+            seen.add(current)
+            total += direct[current][0]
+            done += direct[current][1]
+            stack.extend(epics[current].get("child_epics", []))
+        complete = all(
+            statuses.get(t) == done_value for t in epic.get("child_tasks", [])
+        ) and all(
+            c in epics and epics[c].get("status") == EpicStatus.CLOSED.value
+            for c in epic.get("child_epics", [])
+        )
+        progress[epic_id] = {"done": done, "total": total, "complete": complete}
+    return progress
+
+
 class EpicManager:
     """Service class for managing epics."""
 
-    def __init__(self, epics_root: Path):
+    def __init__(self, epics_root: Path, check_conflicts: bool = False):
         self.epics_root = epics_root
+        self.check_conflicts = check_conflicts
+        # Reverse index of epic membership: child (task or epic) id -> ids of
+        # epics listing it. Built on first use and patched by save/delete.
+        self._children: Optional[Dict[str, List[str]]] = None
+        self._parents: Dict[str, Dict[str, None]] = {}
+
+    def _build_parent_index(self) -> Dict[str, List[str]]:
+        self._children = {}
+        self._parents = {}
+        for epic in self.load_all_epics():
+            self._index_children(epic.id, epic.child_tasks + epic.child_epics)
+        return self._children
+
+    def _index_children(self, epic_id: str, children: List[str]) -> None:
+        assert self._children is not None
+        for child_id in self._children.pop(epic_id, []):
+            parents = self._parents.get(child_id)
+            if parents is not None:
+                parents.pop(epic_id, None)
+                if not parents:
+                    del self._parents[child_id]
+        if children:
+            self._children[epic_id] = list(children)
+            for child_id in children:
+                self._parents.setdefault(child_id, {})[epic_id] = None
+
+    def parent_ids(self, item_id: str) -> List[str]:
+        """Return IDs of epics listing ``item_id`` as a child task or epic."""
+        if self._children is None:
+            self._build_parent_index()
+        return list(self._parents.get(item_id, ()))
 
     def find_epic_file(self, epic_id: str) -> Optional[Path]:
         path = self.epics_root / f"{epic_id}.json"
@@ -28,13 +98,46 @@ class EpicManager:
             raise StorageError(f"Failed to read epic '{epic_id}'")
         return Epic.from_dict(data)
 
-    def save_epic(self, epic: Epic) -> None:
+    def prepare_save(self, epic: Epic, check: bool = True) -> Path:
+        """Check that ``epic`` may be saved, stamp it and return its file."""
         epic_file = self.find_epic_file(epic.id)
         if not epic_file:
             raise TaskNotFoundError(f"Epic '{epic.id}' not found")
+        if check and self.check_conflicts:
+            current = load_json(epic_file)
+            if current is not None and current.get("updated_at") != epic.updated_at:
+                raise ConflictError(
+                    f"Epic '{epic.id}' was modified by another writer since it was loaded"
+                )
         epic.updated_at = time.time()
+        return epic_file
+
+    def mark_saved(self, epic: Epic) -> None:
+        """Record the children of an epic that was saved or staged."""
+        if self._children is not None:
+            self._index_children(epic.id, epic.child_tasks + epic.child_epics)
+
+    def invalidate_parent_index(self) -> None:
+        """Drop the reverse index so it is rebuilt from disk on next use."""
+        self._children = None
+        self._parents = {}
+
+    def save_epic(self, epic: Epic) -> None:
+        epic_file = self.prepare_save(epic)
         if not save_json(epic_file, epic.to_dict()):
             raise StorageError(f"Failed to save epic '{epic.id}'")
+        self.mark_saved(epic)
+
+    def delete_epic(self, epic_id: str) -> None:
+        epic_file = self.find_epic_file(epic_id)
+        if not epic_file:
+            raise TaskNotFoundError(f"Epic '{epic_id}' not found")
+        try:
+            epic_file.unlink()
+        except OSError as e:
+            raise StorageError(f"Error deleting epic '{epic_id}': {e}")
+        if self._children is not None:
+            self._index_children(epic_id, [])
 
     def list_epics(self) -> List[Dict]:
         epics: List[Dict] = []
@@ -32,3 +32,11 @@ class LinkAlreadyExistsError(TaskManagerError):
 
 class StorageError(TaskManagerError):
     """Raised when an underlying storage operation fails."""
+
+
+class ConflictError(TaskManagerError):
+    """Raised when saving an item that was modified since it was loaded."""
+
+
+class LockOrderError(TaskManagerError):
+    """Raised when locks are requested in an order that could deadlock."""
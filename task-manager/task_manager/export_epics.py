@@ -3,23 +3,33 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
+from typing import Sequence
 
 from .core import TaskManager
+from .export_json import add_publish_arguments, publish_output
+from .storage import atomic_output
 
 
 def export_epics_json(
     tasks_root: str = ".tasks",
     epics_root: str = ".epics",
     output: str = "epics.json",
+    compress: Sequence[str] = (),
+    hashed: bool = False,
 ) -> Path:
-    """Export all epics to a JSON file."""
+    """Export all epics to a JSON file.
+
+    ``compress`` and ``hashed`` are passed to
+    :func:`~task_manager.export_json.publish_output`, whose result is
+    returned.
+    """
 
     tm = TaskManager(tasks_root, epics_root)
     epics = tm.epic_list()
     output_path = Path(output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(epics, indent=2), encoding="utf-8")
-    return output_path
+    with atomic_output(output_path) as f:
+        json.dump(epics, f, indent=2)
+    return publish_output(output_path, compress, hashed)
 
 
 def main() -> None:
@@ -27,12 +37,15 @@ def main() -> None:
     parser.add_argument("--tasks-root", default=".tasks", help="Tasks directory")
     parser.add_argument("--epics-root", default=".epics", help="Epics directory")
     parser.add_argument("--output", default="epics.json", help="Output file path")
+    add_publish_arguments(parser)
     args = parser.parse_args()
 
     path = export_epics_json(
         tasks_root=args.tasks_root,
         epics_root=args.epics_root,
         output=args.output,
+        compress=args.compress,
+        hashed=args.hashed,
     )
     print(path)
 
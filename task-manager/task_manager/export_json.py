@@ -1,11 +1,152 @@
 from __future__ import annotations
 
 import argparse
+import gzip
+import hashlib
+import itertools
 import json
+import logging
+import os
+import re
 from pathlib import Path
+from typing import IO, Dict, Iterable, Optional, Sequence
 
 from .core import TaskManager
 from .github_api import fetch_github_tasks
+from .storage import atomic_binary_output, atomic_output, load_json, save_json
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("json", "ndjson")
+# Precompressed variants and the suffix added to their file names.
+COMPRESSIONS = {"gzip": ".gz", "br": ".br"}
+HASH_LENGTH = 12
+CHUNK_SIZE = 1 << 16
+
+
+def write_items(f: IO[str], items: Iterable[dict], fmt: str = "json") -> int:
+    """Write ``items`` to ``f`` one at a time and return how many were written.
+
+    ``"json"`` writes the same indented array as ``json.dumps(items,
+    indent=2)``; ``"ndjson"`` writes one compact object per line.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format '{fmt}'. Valid formats: {', '.join(EXPORT_FORMATS)}")
+    count = 0
+    if fmt == "ndjson":
+        for item in items:
+            f.write(json.dumps(item, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+        return count
+
+    for item in items:
+        f.write(",\n  " if count else "[\n  ")
+        f.write(json.dumps(item, indent=2).replace("\n", "\n  "))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _compress(path: Path, method: str) -> Optional[Path]:
+    """Write ``path`` compressed with ``method`` next to it."""
+    if method == "br" and brotli is None:
+        logger.warning("Skipping brotli output: the 'brotli' package is not installed")
+        return None
+    target = path.with_name(path.name + COMPRESSIONS[method])
+    with open(path, "rb") as src, atomic_binary_output(target) as dst:
+        if method == "gzip":
+            # mtime=0 keeps the output identical for identical input.
+            with gzip.GzipFile(filename="", mode="wb", fileobj=dst, compresslevel=9, mtime=0) as gz:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    gz.write(chunk)
+        else:
+            compressor = brotli.Compressor(quality=11)
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                dst.write(compressor.process(chunk))
+            dst.write(compressor.finish())
+    return target
+
+
+def publish_output(path: Path, compress: Sequence[str] = (), hashed: bool = False) -> Path:
+    """Add precompressed and content-addressed variants of an export.
+
+    Each method in ``compress`` (``"gzip"``, ``"br"``) writes
+    ``<name>.gz``/``<name>.br`` next to the file; brotli is skipped with a
+    warning when the optional ``brotli`` package is missing.
+
+    With ``hashed``, the file is renamed to ``<stem>.<sha256 prefix><suffix>``
+    so it can be cached forever, and ``<stem>.latest.json`` records the
+    current name, digest, size and compressed variants. Files of older
+    exports are deleted, except those of the previous pointer so clients
+    that just read it can still fetch them. Returns the pointer, or ``path``
+    when not hashed.
+    """
+    for method in compress:
+        if method not in COMPRESSIONS:
+            raise ValueError(
+                f"Invalid compression '{method}'. Valid values: {', '.join(COMPRESSIONS)}"
+            )
+    if not hashed:
+        for method in compress:
+            _compress(path, method)
+        return path
+
+    digest = _file_digest(path)
+    final = path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}")
+    os.replace(path, final)
+    encodings: Dict[str, str] = {}
+    for method in compress:
+        variant = final.with_name(final.name + COMPRESSIONS[method])
+        # A hashed name already on disk holds the same content.
+        if variant.exists() or _compress(final, method):
+            encodings[method] = variant.name
+
+    pointer = path.with_name(f"{path.stem}.latest.json")
+    previous = load_json(pointer) or {}
+    keep = {final.name, str(previous.get("file", ""))}
+    pattern = re.compile(
+        rf"{re.escape(path.stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(path.suffix)}"
+    )
+    save_json(
+        pointer,
+        {"file": final.name, "sha256": digest, "size": final.stat().st_size, "encodings": encodings},
+    )
+    for entry in os.scandir(final.parent):
+        base = entry.name
+        for suffix in COMPRESSIONS.values():
+            base = base.removesuffix(suffix)
+        if pattern.fullmatch(base) and base not in keep:
+            Path(entry.path).unlink(missing_ok=True)
+    return pointer
+
+
+def add_publish_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--compress",
+        action="append",
+        choices=list(COMPRESSIONS),
+        default=[],
+        help="Also write a precompressed copy (can be used multiple times)",
+    )
+    parser.add_argument(
+        "--hashed",
+        action="store_true",
+        help="Name the output by content hash and write a <name>.latest.json pointer",
+    )
 
 
 def export_tasks_json(
@@ -13,20 +154,30 @@ def export_tasks_json(
     output: str = "tasks.json",
     repos: list[str] | None = None,
     token: str | None = None,
+    cache_dir: str | None = None,
+    fmt: str = "json",
+    compress: Sequence[str] = (),
+    hashed: bool = False,
 ) -> Path:
     """Export all tasks to a JSON file.
 
     If ``repos`` is provided, tasks from the given GitHub repositories are also
-    fetched and included in the output.
+    fetched and included in the output, caching responses in ``cache_dir``
+    when given.
+
+    Tasks are read and written one at a time, so memory use does not grow
+    with the number of tasks. ``fmt`` is ``"json"`` for an indented array or
+    ``"ndjson"`` for one compact task per line. ``compress`` and ``hashed``
+    are passed to :func:`publish_output`, whose result is returned.
     """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format '{fmt}'. Valid formats: {', '.join(EXPORT_FORMATS)}")
     tm = TaskManager(tasks_root)
-    tasks = tm.task_list()
-    if repos:
-        tasks.extend(fetch_github_tasks(repos, token))
+    remote = fetch_github_tasks(repos, token, cache_dir=cache_dir) if repos else []
     output_path = Path(output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(tasks, indent=2), encoding="utf-8")
-    return output_path
+    with atomic_output(output_path) as f:
+        write_items(f, itertools.chain(tm.iter_tasks(), remote), fmt)
+    return publish_output(output_path, compress, hashed)
 
 
 def main() -> None:
@@ -39,12 +190,24 @@ def main() -> None:
         help="GitHub repository in owner/repo format (can be used multiple times)",
     )
     parser.add_argument("--token", help="GitHub token for authenticated requests")
+    parser.add_argument("--cache-dir", help="Cache directory for GitHub responses")
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="json",
+        help="Output format: indented JSON array or one task per line",
+    )
+    add_publish_arguments(parser)
     args = parser.parse_args()
     path = export_tasks_json(
         args.tasks_root,
         args.output,
         repos=args.repo,
         token=args.token,
+        cache_dir=args.cache_dir,
+        fmt=args.format,
+        compress=args.compress,
+        hashed=args.hashed,
     )
     print(path)
 
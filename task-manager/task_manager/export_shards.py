@@ -0,0 +1,218 @@
+"""Incremental export of tasks and epics into shard files."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from .core import replay_pending_batch
+from .export_json import EXPORT_FORMATS, write_items
+from .index import file_stamp, stamp_trusted
+from .models import Epic, Task
+from .storage import atomic_output, load_json, save_json
+from .utils import log_error
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# (path, [mtime_ns, size, inode]) of each source file of a shard.
+Sources = List[Tuple[Path, List[int]]]
+
+
+class ShardExport(NamedTuple):
+    manifest: Path
+    written: List[str]
+    removed: List[str]
+
+
+def _bucket(stem: str, buckets: int) -> str:
+    value = int(hashlib.sha1(stem.encode("utf-8")).hexdigest()[:8], 16) % buckets
+    return f"{value:0{len(str(buckets - 1))}d}"
+
+
+def _scan(path: Path) -> List[os.DirEntry]:
+    try:
+        return list(os.scandir(path))
+    except OSError:
+        return []
+
+
+def _add(shards: Dict[str, Sources], name: str, entry: os.DirEntry) -> None:
+    try:
+        stamp = file_stamp(entry.stat())
+    except OSError:
+        return
+    shards.setdefault(name, []).append((Path(entry.path), stamp))
+
+
+def collect_task_sources(tasks_root: Path) -> Dict[str, Sources]:
+    """Map each queue name to its task files and their stamps."""
+    queues: Dict[str, Sources] = {}
+    for queue_dir in _scan(tasks_root):
+        if not queue_dir.is_dir() or queue_dir.name.startswith("."):
+            continue
+        queues[queue_dir.name] = []
+        for entry in _scan(Path(queue_dir.path)):
+            if entry.name.endswith(".json") and entry.name != "meta.json":
+                _add(queues, queue_dir.name, entry)
+    return queues
+
+
+def collect_sources(tasks_root: Path, epics_root: Path, buckets: int = 0) -> Dict[str, Sources]:
+    """Map each shard file name to the task or epic files it is built from.
+
+    Tasks are sharded per queue (``tasks/<queue>.json``) or, with
+    ``buckets``, by a hash of their id (``tasks/<n>.json``). Epics go to
+    ``epics.json`` or to ``epics/<n>.json`` when bucketed.
+    """
+    shards: Dict[str, Sources] = {}
+    for queue, sources in collect_task_sources(tasks_root).items():
+        for path, stamp in sources:
+            shard = _bucket(path.stem, buckets) if buckets else queue
+            shards.setdefault(f"tasks/{shard}.json", []).append((path, stamp))
+    for entry in _scan(epics_root):
+        if not (entry.name.startswith("epic-") and entry.name.endswith(".json")):
+            continue
+        name = f"epics/{_bucket(entry.name[:-5], buckets)}.json" if buckets else "epics.json"
+        _add(shards, name, entry)
+    return shards
+
+
+def source_digest(sources: Sources) -> str:
+    """Return a digest of the names and stamps of ``sources``."""
+    stamps = sorted((path.name, stamp) for path, stamp in sources)
+    return hashlib.sha256(json.dumps(stamps).encode("utf-8")).hexdigest()
+
+
+def is_trusted(sources: Sources, trusted_before: int) -> bool:
+    """Tell whether every stamp of ``sources`` passes :func:`stamp_trusted`."""
+    return all(stamp_trusted(stamp, trusted_before) for _, stamp in sources)
+
+
+def _load_items(name: str, sources: Sources) -> List[Dict[str, Any]]:
+    model = Epic if name.startswith("epics") else Task
+    items = []
+    for path, _ in sources:
+        data = load_json(path)
+        if data is None:
+            continue
+        try:
+            items.append(model.from_dict(data).to_dict())
+        except (TypeError, ValueError, KeyError) as e:
+            log_error(f"Error processing file '{path}': {e}")
+    items.sort(key=lambda item: (item.get("created_at", 0), item.get("id", "")))
+    return items
+
+
+def export_shards(
+    tasks_root: str = ".tasks",
+    epics_root: str = ".epics",
+    output: str = "export",
+    buckets: int = 0,
+    fmt: str = "json",
+) -> ShardExport:
+    """Export tasks and epics as shard files listed in ``manifest.json``.
+
+    The manifest records, for each shard, the SHA-256 of its content, its
+    item count and a digest of the mtime/size/inode stamps of its source
+    files. On the next run only shards whose sources changed are read and
+    serialized again, and a shard file is only replaced when its content
+    hash differs, so consumers can fetch just the shards whose hash
+    changed. Shards whose sources are gone are deleted.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format '{fmt}'. Valid formats: {', '.join(EXPORT_FORMATS)}")
+    if buckets < 0:
+        raise ValueError("buckets must not be negative")
+    output_dir = Path(output)
+    manifest_path = output_dir / MANIFEST_FILE
+    previous = load_json(manifest_path) or {}
+    if (
+        previous.get("version") != MANIFEST_VERSION
+        or previous.get("format") != fmt
+        or previous.get("buckets") != buckets
+    ):
+        previous = {}
+    old_shards: Dict[str, Dict[str, Any]] = previous.get("shards", {})
+    trusted_before = previous.get("scanned_at", 0)
+    scanned_at = time.time_ns()
+
+    # Completes any interrupted batch before the files are read.
+    replay_pending_batch(Path(tasks_root))
+    sources = collect_sources(Path(tasks_root), Path(epics_root), buckets)
+    shards: Dict[str, Dict[str, Any]] = {}
+    written: List[str] = []
+    rescanned = False
+    for name in sorted(sources):
+        digest = source_digest(sources[name])
+        old = old_shards.get(name)
+        if (
+            old is not None
+            and old.get("source") == digest
+            and is_trusted(sources[name], trusted_before)
+            and (output_dir / name).exists()
+        ):
+            shards[name] = old
+            continue
+
+        rescanned = True
+        items = _load_items(name, sources[name])
+        buf = io.StringIO()
+        write_items(buf, items, fmt)
+        content = buf.getvalue()
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        shards[name] = {"hash": content_hash, "count": len(items), "source": digest}
+        if old is not None and old.get("hash") == content_hash and (output_dir / name).exists():
+            continue
+        with atomic_output(output_dir / name) as f:
+            f.write(content)
+        written.append(name)
+
+    removed = sorted(name for name in old_shards if name not in shards)
+    for name in removed:
+        (output_dir / name).unlink(missing_ok=True)
+
+    if rescanned or removed or not previous:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "format": fmt,
+            "buckets": buckets,
+            "scanned_at": scanned_at,
+            "shards": shards,
+        }
+        output_dir.mkdir(parents=True, exist_ok=True)
+        save_json(manifest_path, manifest, durable=False)
+    return ShardExport(manifest_path, written, removed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export tasks and epics as incremental shards")
+    parser.add_argument("--tasks-root", default=".tasks", help="Tasks directory")
+    parser.add_argument("--epics-root", default=".epics", help="Epics directory")
+    parser.add_argument("--output", default="export", help="Output directory")
+    parser.add_argument(
+        "--buckets",
+        type=int,
+        default=0,
+        help="Shard by id hash into this many files instead of per queue",
+    )
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="json", help="Shard format")
+    args = parser.parse_args()
+    result = export_shards(
+        args.tasks_root, args.epics_root, args.output, buckets=args.buckets, fmt=args.format
+    )
+    for name in result.written:
+        print(f"written {name}")
+    for name in result.removed:
+        print(f"removed {name}")
+    print(result.manifest)
+
+
+if __name__ == "__main__":
+    main()
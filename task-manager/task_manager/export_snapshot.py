@@ -0,0 +1,124 @@
+"""Export tasks and epics as one denormalized snapshot."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from .core import replay_pending_batch
+from .epic_manager import rollup_progress
+from .models import Epic, Task
+from .storage import atomic_output, load_json
+from .utils import log_error
+
+SNAPSHOT_VERSION = 1
+
+
+def _iter_task_files(tasks_root: Path) -> Iterator[tuple[str, Path]]:
+    try:
+        queue_dirs = sorted(
+            e.name for e in os.scandir(tasks_root) if e.is_dir() and not e.name.startswith(".")
+        )
+    except OSError:
+        return
+    for queue in queue_dirs:
+        try:
+            names = sorted(e.name for e in os.scandir(tasks_root / queue))
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith(".json") and name != "meta.json":
+                yield queue, tasks_root / queue / name
+
+
+def _load(model: Any, path: Path) -> Dict[str, Any] | None:
+    data = load_json(path)
+    if data is None:
+        return None
+    try:
+        return model.from_dict(data).to_dict()
+    except (TypeError, ValueError, KeyError) as e:
+        log_error(f"Error processing file '{path}': {e}")
+        return None
+
+
+def _parent_chain(epic_id: str, epics: Dict[str, Dict[str, Any]]) -> List[str]:
+    chain: List[str] = []
+    parent = epics[epic_id].get("parent_epic")
+    while parent and parent in epics and parent not in chain and parent != epic_id:
+        chain.append(parent)
+        parent = epics[parent].get("parent_epic")
+    return chain
+
+
+def export_snapshot(
+    tasks_root: str = ".tasks",
+    epics_root: str = ".epics",
+    output: str = "snapshot.json",
+) -> Path:
+    """Write tasks and epics, already joined, to one JSON file.
+
+    Every task and epic file is read once. Tasks get their ``queue`` and
+    ``epic_chain``, the epics containing them directly or through parent
+    epics. Epics get ``progress`` (see
+    :func:`~task_manager.epic_manager.rollup_progress`) and ``parents``, the chain of ancestor epics nearest first.
+    """
+    # Completes any interrupted batch before the files are read.
+    replay_pending_batch(Path(tasks_root))
+
+    epics: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(Path(epics_root).glob("epic-*.json")):
+        epic = _load(Epic, path)
+        if epic is not None:
+            epics[epic["id"]] = epic
+    parents = {epic_id: _parent_chain(epic_id, epics) for epic_id in epics}
+
+    tasks: List[Dict[str, Any]] = []
+    statuses: Dict[str, str] = {}
+    for queue, path in _iter_task_files(Path(tasks_root)):
+        task = _load(Task, path)
+        if task is None:
+            continue
+        chain = list(dict.fromkeys(
+            e for direct in task["epics"] if direct in epics for e in [direct, *parents[direct]]
+        ))
+        task["queue"] = queue
+        task["epic_chain"] = chain
+        statuses[task["id"]] = task["status"]
+        tasks.append(task)
+    tasks.sort(key=lambda t: t["created_at"])
+
+    progress = rollup_progress(epics, statuses)
+    epic_list = sorted(epics.values(), key=lambda e: e["created_at"])
+    for epic in epic_list:
+        epic["progress"] = progress[epic["id"]]
+        epic["parents"] = parents[epic["id"]]
+
+    output_path = Path(output)
+    with atomic_output(output_path) as f:
+        f.write(f'{{"version": {SNAPSHOT_VERSION}, "generated_at": {time.time()},\n')
+        for key, items in (("epics", epic_list), ("tasks", tasks)):
+            f.write(f'"{key}": [')
+            for i, item in enumerate(items):
+                f.write(",\n" if i else "\n")
+                f.write(json.dumps(item))
+            f.write("\n]" if items else "]")
+            f.write(",\n" if key == "epics" else "}\n")
+    return output_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export a combined tasks and epics snapshot")
+    parser.add_argument("--tasks-root", default=".tasks", help="Tasks directory")
+    parser.add_argument("--epics-root", default=".epics", help="Epics directory")
+    parser.add_argument("--output", default="snapshot.json", help="Output file path")
+    args = parser.parse_args()
+    print(export_snapshot(args.tasks_root, args.epics_root, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,531 @@
 
 from __future__ import annotations
 
+import base64
+import http.client
 import json
-from typing import List, Dict, Optional
-from urllib.request import Request, urlopen
-from urllib.error import URLError
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import urljoin, urlsplit
 
+from .http_cache import HTTPCache
+
+logger = logging.getLogger(__name__)
 
 GITHUB_API_BASE = "https://api.github.com/repos"
+USER_AGENT = "codex-utils-task-manager"
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# ``contents`` lists the top level of ``.tasks`` file by file; ``tree`` lists
+# ``.tasks`` and ``.epics`` recursively with one git trees request.
+FETCH_MODES = ("contents", "tree")
+API_MEDIA_TYPE = "application/vnd.github+json"
+RAW_MEDIA_TYPE = "application/vnd.github.raw+json"
+# Request pacing and retries; GitHub's secondary limits trip well below the
+# hourly quota when many requests are issued at once.
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+# Longest rate limit pause worth waiting for instead of giving up.
+DEFAULT_MAX_WAIT = 60.0
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Response(NamedTuple):
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+
+@dataclass
+class FetchStats:
+    """Counters describing how a remote fetch went.
+
+    ``failures`` lists ``(url, reason)`` for every request that returned no
+    data, so a non-empty list means the result is partial.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    not_modified: int = 0
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+    rate_limit_remaining: Optional[int] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.failures)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def fail(self, url: str, reason: str) -> None:
+        with self._lock:
+            self.failures.append((url, reason))
+
+
+def _warn_partial(stats: FetchStats) -> None:
+    if stats.partial:
+        logger.warning(
+            "Remote fetch incomplete: %d of %d requests failed (first: %s %s)",
+            len(stats.failures),
+            stats.requests,
+            *stats.failures[0],
+        )
+
+
+class RateLimiter:
+    """Token bucket pacing requests to ``rate`` per second.
+
+    Up to ``burst`` requests may start at once. :meth:`pause` stops every
+    caller until the given time has passed, for when the server asked to
+    back off. A ``rate`` of 0 disables pacing.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return
+                    elapsed = now - self._updated
+                    self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for ``seconds``."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class GitHubClient:
+    """HTTP client fetching URLs concurrently over keep-alive connections.
+
+    Requests run on a pool of at most ``max_workers`` threads. Each thread
+    keeps one persistent connection per host, so a burst of requests to the
+    same host reuses a handful of connections instead of opening one per
+    file. ``timeout`` applies to connecting and to every socket read.
+
+    With a ``cache``, JSON responses carrying an ``ETag`` are stored and
+    revalidated with ``If-None-Match`` on the next request.
+
+    Requests are paced by ``limiter``. Rate limited responses (403/429 with
+    ``Retry-After`` or an exhausted ``X-RateLimit-Remaining``), other 429s,
+    5xx responses and network errors are retried up to ``max_retries``
+    times with jittered exponential backoff; a rate limit pause longer than
+    ``max_wait`` seconds is not waited for. Outcomes are counted in
+    ``stats``.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        max_workers: int = DEFAULT_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: Optional[HTTPCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        stats: Optional[FetchStats] = None,
+        max_retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ):
+        self.token = token
+        self.cache = cache
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.stats = stats if stats is not None else FetchStats()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> GitHubClient:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker threads and close all connections."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+    def map(self, func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """Apply ``func`` to ``items`` concurrently, keeping their order."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="github"
+            )
+        return list(self._executor.map(func, items))
+
+    def _thread_connections(self) -> Dict[Tuple[str, str], http.client.HTTPConnection]:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    def _connection(self, key: Tuple[str, str]) -> http.client.HTTPConnection:
+        connections = self._thread_connections()
+        conn = connections.get(key)
+        if conn is None:
+            scheme, netloc = key
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+            else:
+                conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            connections[key] = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _discard(self, key: Tuple[str, str]) -> None:
+        conn = self._thread_connections().pop(key, None)
+        if conn is not None:
+            conn.close()
+
+    def _send(self, url: str, headers: Dict[str, str]) -> Response:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        for attempt in range(2):
+            conn = self._connection(key)
+            reused = conn.sock is not None
+            self.limiter.acquire()
+            self.stats.count("requests")
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                self._discard(key)
+                # A kept-alive connection may have been closed by the server
+                # while idle; retry once on a fresh one.
+                if reused and attempt == 0 and not isinstance(e, TimeoutError):
+                    continue
+                raise
+            return Response(resp.status, resp.headers, body)
+        raise AssertionError("unreachable")
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = min(MAX_BACKOFF, self.backoff * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _rate_limit_delay(self, resp: Response) -> Optional[float]:
+        """Return how long the server asked all requests to wait, if at all."""
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        if resp.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset = float(resp.headers.get("X-RateLimit-Reset", ""))
+            except ValueError:
+                return None
+            return max(0.0, reset - time.time())
+        return None
+
+    def _retry_delay(self, resp: Response, attempt: int) -> Optional[float]:
+        """Return the delay before retrying ``resp``, or None to accept it."""
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.stats.rate_limit_remaining = int(remaining)
+
+        pause = self._rate_limit_delay(resp)
+        if pause is not None and pause <= self.max_wait:
+            # Applies to every worker, not just this request.
+            self.limiter.pause(pause)
+        if resp.status in (403, 429):
+            if pause is not None:
+                return pause if pause <= self.max_wait else None
+            return self._backoff_delay(attempt) if resp.status == 429 else None
+        if resp.status >= 500:
+            return self._backoff_delay(attempt)
+        return None
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        """GET ``url``, following redirects and retrying transient failures.
+
+        Raises ``OSError`` or ``http.client.HTTPException`` when network
+        errors persist; HTTP error statuses are returned as responses.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                resp = self._get_once(url, headers)
+            except (OSError, http.client.HTTPException) as e:
+                # A request that timed out would most likely time out again.
+                if attempt == self.max_retries or isinstance(e, TimeoutError):
+                    raise
+                delay = self._backoff_delay(attempt)
+            else:
+                retry = self._retry_delay(resp, attempt)
+                if retry is None or attempt == self.max_retries:
+                    return resp
+                delay = retry
+            self.stats.count("retries")
+            logger.debug("Retrying %s in %.1fs", url, delay)
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _get_once(self, url: str, headers: Optional[Dict[str, str]]) -> Response:
+        request_headers = {
+            "User-Agent": USER_AGENT,
+            "Accept": API_MEDIA_TYPE,
+            **(headers or {}),
+        }
+        if self.token:
+            request_headers["Authorization"] = f"token {self.token}"
+        host = urlsplit(url).netloc
+        for _ in range(MAX_REDIRECTS):
+            resp = self._send(url, request_headers)
+            location = resp.headers.get("Location")
+            if resp.status not in REDIRECT_STATUSES or not location:
+                return resp
+            url = urljoin(url, location)
+            if urlsplit(url).netloc != host:
+                # Never send credentials to another host.
+                request_headers.pop("Authorization", None)
+        return self._send(url, request_headers)
+
+    def get_json(
+        self, url: str, headers: Optional[Dict[str, str]] = None, use_cache: bool = True
+    ) -> Any:
+        """Return the decoded JSON body of ``url``, or None on any failure."""
+        headers = dict(headers or {})
+        cached = self.cache.get(url) if self.cache is not None and use_cache else None
+        if cached is not None:
+            headers["If-None-Match"] = cached["etag"]
+        try:
+            resp = self.get(url, headers)
+        except (OSError, http.client.HTTPException) as e:
+            self.stats.fail(url, f"{type(e).__name__}: {e}")
+            return None
+
+        if resp.status == 304 and cached is not None:
+            self.stats.count("not_modified")
+            body = cached["body"]
+        elif resp.status == 200:
+            try:
+                body = resp.body.decode("utf-8")
+            except UnicodeDecodeError:
+                self.stats.fail(url, "invalid UTF-8")
+                return None
+            etag = resp.headers.get("ETag")
+            if self.cache is not None and use_cache and etag:
+                self.cache.put(url, etag, body)
+        else:
+            self.stats.fail(url, f"HTTP {resp.status}")
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            self.stats.fail(url, "invalid JSON")
+            return None
+
+
+def _tree_kind(path: str) -> Optional[str]:
+    """Return ``"tasks"`` or ``"epics"`` for task and epic file paths."""
+    parts = path.split("/")
+    if not parts[-1].endswith(".json"):
+        return None
+    if parts[0] == ".tasks" and len(parts) in (2, 3) and parts[-1] != "meta.json":
+        return "tasks"
+    if parts[0] == ".epics" and len(parts) == 2:
+        return "epics"
+    return None
+
+
+def _fetch_blob(client: GitHubClient, api_base: str, repo: str, sha: str) -> Any:
+    # Blobs are cached by SHA, not by URL.
+    data = client.get_json(
+        f"{api_base}/{repo}/git/blobs/{sha}", {"Accept": RAW_MEDIA_TYPE}, use_cache=False
+    )
+    # Servers ignoring the raw media type answer with the blob object.
+    if isinstance(data, dict) and data.get("sha") == sha and data.get("encoding") == "base64":
+        try:
+            return json.loads(base64.b64decode(data.get("content", "")))
+        except ValueError:
+            return None
+    return data
+
+
+def _walk_tree(client: GitHubClient, api_base: str, repo: str, ref: str) -> List[Dict]:
+    """List the ``.tasks`` and ``.epics`` files of ``repo`` one directory at a time.
+
+    Fallback for repositories whose recursive tree listing GitHub truncated:
+    only the root, ``.tasks``, its queue directories and ``.epics`` are
+    requested. Listings that are still truncated are recorded as failures.
+    """
 
+    def listing(sha: str) -> List[Dict]:
+        url = f"{api_base}/{repo}/git/trees/{sha}"
+        tree = client.get_json(url)
+        if not isinstance(tree, dict) or not isinstance(tree.get("tree"), list):
+            return []
+        if tree.get("truncated"):
+            client.stats.fail(url, "truncated tree")
+        return [item for item in tree["tree"] if isinstance(item, dict)]
 
-def fetch_github_tasks(repos: List[str], token: Optional[str] = None) -> List[Dict]:
+    files: List[Dict] = []
+    dirs = [
+        (item["path"], item["sha"])
+        for item in listing(ref)
+        if item.get("type") == "tree" and item.get("path") in (".tasks", ".epics") and item.get("sha")
+    ]
+    while dirs:
+        queues: List[Tuple[str, str]] = []
+        for (path, _), items in zip(dirs, client.map(lambda d: listing(d[1]), dirs)):
+            for item in items:
+                full = f"{path}/{item.get('path', '')}"
+                if item.get("type") == "blob":
+                    files.append({**item, "path": full})
+                elif item.get("type") == "tree" and path == ".tasks" and item.get("sha"):
+                    queues.append((full, item["sha"]))
+        dirs = queues
+    files.sort(key=lambda item: item["path"])
+    return files
+
+
+def fetch_github_tree(
+    repos: List[str],
+    token: Optional[str] = None,
+    max_workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    api_base: str = GITHUB_API_BASE,
+    blobs: Optional[MutableMapping[str, Any]] = None,
+    ref: str = "HEAD",
+    cache_dir: Optional[str] = None,
+    stats: Optional[FetchStats] = None,
+) -> Dict[str, List[Dict]]:
+    """Fetch task and epic files of repositories via the git trees API.
+
+    One ``git/trees/<ref>?recursive=1`` request per repository lists every
+    file, including queue subdirectories of ``.tasks`` and ``.epics``. File
+    contents are then fetched by blob SHA, skipping SHAs already present in
+    ``blobs``, which maps SHA to parsed JSON and is updated in place. Passing
+    the same mapping on the next call makes it cost one request per
+    repository plus one per changed file.
+
+    With ``cache_dir``, tree listings are revalidated with their ETag and
+    blobs default to the cache's on-disk blob store, so repeated runs
+    download nothing that did not change.
+
+    Repositories too large for one recursive listing, which GitHub marks as
+    ``truncated``, are listed one directory at a time instead.
+
+    Returns ``{"tasks": [...], "epics": [...]}`` in repository order and then
+    path order. Unreadable files and network errors are skipped and recorded
+    in ``stats`` when given.
+    """
+    cache = HTTPCache(Path(cache_dir)) if cache_dir else None
+    stats = stats if stats is not None else FetchStats()
+    if blobs is None:
+        blobs = cache.blobs if cache is not None else {}
+    with GitHubClient(token, max_workers, timeout, cache, stats=stats) as client:
+        trees = client.map(
+            lambda repo: client.get_json(f"{api_base}/{repo}/git/trees/{ref}?recursive=1"),
+            repos,
+        )
+        entries: List[Tuple[str, str, str]] = []
+        for repo, tree in zip(repos, trees):
+            if not isinstance(tree, dict) or not isinstance(tree.get("tree"), list):
+                continue
+            items = tree["tree"]
+            if tree.get("truncated"):
+                logger.info("Tree of %s is truncated, listing it directory by directory", repo)
+                items = _walk_tree(client, api_base, repo, ref)
+            for item in items:
+                if not isinstance(item, dict) or item.get("type") != "blob":
+                    continue
+                kind = _tree_kind(item.get("path", ""))
+                if kind and item.get("sha"):
+                    entries.append((kind, repo, item["sha"]))
+
+        missing = list(dict.fromkeys((repo, sha) for _, repo, sha in entries if sha not in blobs))
+        fetched = client.map(lambda key: _fetch_blob(client, api_base, *key), missing)
+        for (_, sha), data in zip(missing, fetched):
+            if data is not None:
+                blobs[sha] = data
+
+    _warn_partial(stats)
+    result: Dict[str, List[Dict]] = {"tasks": [], "epics": []}
+    for kind, _, sha in entries:
+        data = blobs.get(sha)
+        if isinstance(data, dict):
+            result[kind].append(data)
+    return result
+
+
+def fetch_github_tasks(
+    repos: List[str],
+    token: Optional[str] = None,
+    max_workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    api_base: str = GITHUB_API_BASE,
+    mode: str = "tree",
+    cache_dir: Optional[str] = None,
+    stats: Optional[FetchStats] = None,
+) -> List[Dict]:
     """Fetch task JSON files from given GitHub repositories.
 
     Parameters
@@ -20,40 +535,68 @@ def fetch_github_tasks(repos: List[str], token: Optional[str] = None) -> List[Di
         List of repositories in ``owner/repo`` format.
     token:
         Optional GitHub token for authenticated requests.
+    max_workers:
+        Maximum number of requests in flight at once.
+    timeout:
+        Per-request timeout in seconds.
+    api_base:
+        Base URL of the repos API, for GitHub Enterprise or tests.
+    mode:
+        ``"tree"`` (default) reads every queue directory through
+        :func:`fetch_github_tree`; ``"contents"`` only reads JSON files at the
+        top level of ``.tasks``, one request each.
+    cache_dir:
+        Optional directory of an :class:`HTTPCache`. Listings are then
+        revalidated with ETags and files whose blob SHA is cached are not
+        downloaded again.
+    stats:
+        Optional :class:`FetchStats` filled with request, retry and failure
+        counts; ``stats.partial`` tells whether anything was skipped.
 
     Returns
     -------
     list[dict]
-        Parsed task dictionaries from all repositories. Invalid files or
-        network errors are ignored.
+        Parsed task dictionaries from all repositories, in repository order
+        and then directory listing order. Invalid files or network errors
+        are skipped.
     """
-    tasks: List[Dict] = []
-
-    for repo in repos:
-        contents_url = f"{GITHUB_API_BASE}/{repo}/contents/.tasks"
-        req = Request(contents_url)
-        if token:
-            req.add_header("Authorization", f"token {token}")
-        try:
-            with urlopen(req) as resp:
-                try:
-                    dir_listing = json.load(resp)
-                except json.JSONDecodeError:
-                    continue
-        except URLError:
-            continue
-
-        for item in dir_listing:
-            if item.get("type") != "file" or not item.get("name", "").endswith(".json"):
-                continue
-            file_req = Request(item["download_url"])
-            if token:
-                file_req.add_header("Authorization", f"token {token}")
-            try:
-                with urlopen(file_req) as file_resp:
-                    task_data = json.load(file_resp)
-                tasks.append(task_data)
-            except URLError:
-                continue
-    return tasks
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Invalid fetch mode '{mode}'. Valid modes: {', '.join(FETCH_MODES)}")
+    if mode == "tree":
+        return fetch_github_tree(
+            repos, token, max_workers, timeout, api_base, cache_dir=cache_dir, stats=stats
+        )["tasks"]
 
+    cache = HTTPCache(Path(cache_dir)) if cache_dir else None
+    stats = stats if stats is not None else FetchStats()
+    blobs: MutableMapping[str, Any] = cache.blobs if cache is not None else {}
+    with GitHubClient(token, max_workers, timeout, cache, stats=stats) as client:
+        listings = client.map(
+            lambda repo: client.get_json(f"{api_base}/{repo}/contents/.tasks"), repos
+        )
+        items = [
+            item
+            for listing in listings
+            if isinstance(listing, list)
+            for item in listing
+            if isinstance(item, dict)
+            and item.get("type") == "file"
+            and item.get("name", "").endswith(".json")
+            and item.get("download_url")
+        ]
+        missing = [
+            i for i, item in enumerate(items) if not item.get("sha") or item["sha"] not in blobs
+        ]
+        fetched = client.map(
+            lambda i: client.get_json(items[i]["download_url"], use_cache=False), missing
+        )
+    _warn_partial(stats)
+    downloaded = dict(zip(missing, fetched))
+    for i, data in downloaded.items():
+        if items[i].get("sha") and data is not None:
+            blobs[items[i]["sha"]] = data
+    tasks = [
+        downloaded[i] if i in downloaded else blobs.get(item["sha"])
+        for i, item in enumerate(items)
+    ]
+    return [task for task in tasks if isinstance(task, dict)]
@@ -0,0 +1,162 @@
+"""Size-bounded on-disk cache for GitHub responses."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, MutableMapping, Optional
+
+from .storage import load_json, save_json
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Return the default cache location, honouring ``XDG_CACHE_HOME``."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "codex-utils" / "github"
+
+
+class HTTPCache:
+    """Cache of HTTP responses by URL and of git blobs by SHA.
+
+    Responses are stored with their ``ETag`` so they can be revalidated with
+    ``If-None-Match``; blobs are immutable and never revalidated. Each entry
+    is one file under ``root``. Reading an entry refreshes its mtime, and
+    when the cache grows past ``max_bytes`` the least recently used entries
+    are deleted.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.blobs = _BlobStore(self)
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, kind: str, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.root / kind / digest[:2] / f"{digest}.json"
+
+    def _entries(self) -> Iterator[os.DirEntry]:
+        for kind in ("responses", "blobs"):
+            try:
+                shards = list(os.scandir(self.root / kind))
+            except OSError:
+                continue
+            for shard in shards:
+                try:
+                    yield from os.scandir(shard.path)
+                except OSError:
+                    continue
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        data = load_json(path)
+        if data is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return data
+
+    def _write(self, path: Path, data: Dict[str, Any]) -> None:
+        try:
+            old_size = path.stat().st_size
+        except OSError:
+            old_size = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not save_json(path, data, indent=None, durable=False):
+            return
+        try:
+            new_size = path.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = sum(e.stat().st_size for e in self._entries())
+            else:
+                self._size += new_size - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits."""
+        entries = []
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        entries.sort()
+        size = sum(e[1] for e in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached ``{"etag", "body"}`` entry for ``url``."""
+        entry = self._read(self._path("responses", url))
+        if entry is None or entry.get("url") != url:
+            return None
+        return entry
+
+    def put(self, url: str, etag: str, body: str) -> None:
+        """Store a response body with its ETag."""
+        self._write(self._path("responses", url), {"url": url, "etag": etag, "body": body})
+
+    def get_blob(self, sha: str) -> Any:
+        """Return the parsed content of blob ``sha`` or None."""
+        entry = self._read(self._path("blobs", sha))
+        if entry is None or entry.get("sha") != sha:
+            return None
+        return entry.get("data")
+
+    def put_blob(self, sha: str, data: Any) -> None:
+        """Store the parsed content of blob ``sha``."""
+        self._write(self._path("blobs", sha), {"sha": sha, "data": data})
+
+    def has_blob(self, sha: str) -> bool:
+        return self._path("blobs", sha).exists()
+
+
+class _BlobStore(MutableMapping[str, Any]):
+    """Mapping view of the blobs in an :class:`HTTPCache`."""
+
+    def __init__(self, cache: HTTPCache):
+        self.cache = cache
+
+    def __getitem__(self, sha: str) -> Any:
+        data = self.cache.get_blob(sha)
+        if data is None:
+            raise KeyError(sha)
+        return data
+
+    def __setitem__(self, sha: str, data: Any) -> None:
+        self.cache.put_blob(sha, data)
+
+    def __delitem__(self, sha: str) -> None:
+        try:
+            self.cache._path("blobs", sha).unlink()
+        except FileNotFoundError:
+            raise KeyError(sha)
+
+    def __contains__(self, sha: object) -> bool:
+        return isinstance(sha, str) and self.cache.has_blob(sha)
+
+    def __iter__(self) -> Iterator[str]:
+        for entry in self.cache._entries():
+            data = load_json(Path(entry.path))
+            if data is not None and "sha" in data:
+                yield data["sha"]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
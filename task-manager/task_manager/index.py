@@ -0,0 +1,325 @@
+"""Persistent summary index of task files."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Task
+from .storage import load_json, save_json
+from .utils import log_error
+
+INDEX_FILE = ".index"
+INDEX_VERSION = 1
+
+
+def task_summary(task: Task, queue: str) -> Dict[str, Any]:
+    """Return the fields of ``task`` kept in the index."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "status": task.status.value,
+        "queue": queue,
+        "epics": list(task.epics),
+        "created_at": task.created_at,
+    }
+
+
+def file_stamp(st: os.stat_result) -> List[int]:
+    """Return the mtime/size/inode stamp identifying a version of a file."""
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def path_stamp(path: Path) -> Optional[List[int]]:
+    """Return the stamp of the file at ``path``, or None if it is missing."""
+    try:
+        return file_stamp(path.stat())
+    except OSError:
+        return None
+
+
+def stamp_trusted(stamp: List[int], trusted_before: int) -> bool:
+    """Tell whether an unchanged ``stamp`` proves its file is unchanged.
+
+    Files modified at or after ``trusted_before``, when the previous scan
+    started, may have been rewritten within the same timestamp tick.
+    """
+    return stamp[0] < trusted_before
+
+
+class TaskIndex:
+    """Summary index of task files stored in ``<tasks_root>/.index``.
+
+    Entries are keyed by ``<queue>/<file>`` and carry the mtime/size/inode
+    stamp of the file they were read from; each queue directory's mtime is
+    recorded as well. The first scan of a process walks the tree once with
+    ``os.scandir`` and re-reads only files whose stamp changed. Later calls
+    to :meth:`sync` only stat the queue directories and rescan those whose
+    mtime changed, which every file creation, atomic rewrite or deletion
+    in them does. A task file edited in place, without a rename, is picked
+    up once its directory changes or by the next process.
+
+    In memory the summaries are also indexed by status, queue and epic so
+    :meth:`query` can answer any combination of filters by set
+    intersection. :meth:`update` and :meth:`remove` patch these postings in
+    place after a write.
+    """
+
+    def __init__(self, tasks_root: Path):
+        self.tasks_root = tasks_root
+        self.path = tasks_root / INDEX_FILE
+        # queue -> file name -> {"stamp": ..., "task": summary or None}
+        self._queues: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+        self._dirs: Dict[str, int] = {}
+        self._scanned_at = 0
+        self._dirty = False
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_queue: Dict[str, Set[str]] = {}
+        self._by_epic: Dict[str, Set[str]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        data = load_json(self.path)
+        if not data or data.get("version") != INDEX_VERSION:
+            return {}
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        queues: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for key, entry in entries.items():
+            queue, _, name = key.partition("/")
+            queues.setdefault(queue, {})[name] = entry
+        self._scanned_at = data.get("scanned_at", 0)
+        return queues
+
+    def _postings(self, summary: Dict[str, Any]) -> Iterable[Set[str]]:
+        yield self._by_status.setdefault(summary["status"], set())
+        yield self._by_queue.setdefault(summary["queue"], set())
+        for epic_id in summary["epics"]:
+            yield self._by_epic.setdefault(epic_id, set())
+
+    def _link(self, summary: Dict[str, Any]) -> None:
+        self._by_id[summary["id"]] = summary
+        for ids in self._postings(summary):
+            ids.add(summary["id"])
+
+    def _unlink(self, summary: Dict[str, Any]) -> None:
+        if self._by_id.get(summary["id"]) is summary:
+            del self._by_id[summary["id"]]
+        for ids in self._postings(summary):
+            ids.discard(summary["id"])
+
+    def _link_files(self, files: Dict[str, Dict[str, Any]]) -> None:
+        for entry in files.values():
+            if entry["task"] is not None:
+                self._link(entry["task"])
+
+    def _unlink_files(self, files: Dict[str, Dict[str, Any]]) -> None:
+        for entry in files.values():
+            if entry["task"] is not None:
+                self._unlink(entry["task"])
+
+    def _read(self, task_file: Path, queue: str) -> Optional[Dict[str, Any]]:
+        data = load_json(task_file)
+        if data is None:
+            return None
+        try:
+            return task_summary(Task.from_dict(data), queue)
+        except (TypeError, ValueError, KeyError) as e:
+            log_error(f"Error processing task file '{task_file}': {e}")
+            return None
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Bring the index up to date and return all task summaries."""
+        self._scan()
+        return list(self._by_id.values())
+
+    def sync(self) -> bool:
+        """Bring the index up to date; return True if any task summary changed."""
+        return self._scan()
+
+    def queue_dirs(self) -> Dict[str, int]:
+        """Return the mtime of each queue directory as of the last sync."""
+        return self._dirs
+
+    def _scan_queue(
+        self, queue: str, previous: Dict[str, Dict[str, Any]], trusted_before: int
+    ) -> Tuple[Dict[str, Dict[str, Any]], bool, bool]:
+        """Re-stat the task files of ``queue``.
+
+        Returns the new entries, whether any summary changed and whether any
+        entry was re-read or dropped.
+        """
+        try:
+            file_entries = list(os.scandir(self.tasks_root / queue))
+        except OSError:
+            return {}, bool(previous), bool(previous)
+        files: Dict[str, Dict[str, Any]] = {}
+        changed = stale = False
+        for file_entry in file_entries:
+            name = file_entry.name
+            if not name.endswith(".json") or name == "meta.json":
+                continue
+            try:
+                stamp = file_stamp(file_entry.stat())
+            except OSError:
+                continue
+            old = previous.get(name)
+            if old is not None and old["stamp"] == stamp and stamp_trusted(stamp, trusted_before):
+                files[name] = old
+                continue
+            task = self._read(Path(file_entry.path), queue)
+            files[name] = {"stamp": stamp, "task": task}
+            stale = True
+            if old is None or old["task"] != task:
+                changed = True
+        if any(name not in files for name in previous):
+            changed = stale = True
+        return files, changed, stale
+
+    def _scan(self) -> bool:
+        first = self._queues is None
+        previous = self._load() if self._queues is None else self._queues
+        trusted_before = self._scanned_at
+        scanned_at = time.time_ns()
+
+        dirs: Dict[str, int] = {}
+        try:
+            for entry in os.scandir(self.tasks_root):
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                try:
+                    dirs[entry.name] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+        except OSError:
+            pass
+
+        queues: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        rescanned: List[Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]] = []
+        changed = stale = False
+        for queue, mtime in dirs.items():
+            old_files = previous.get(queue, {})
+            if (
+                not first
+                and queue in previous
+                and self._dirs.get(queue) == mtime
+                and mtime < trusted_before
+            ):
+                queues[queue] = old_files
+                continue
+            files, files_changed, files_stale = self._scan_queue(queue, old_files, trusted_before)
+            queues[queue] = files
+            rescanned.append((old_files, files))
+            changed = changed or files_changed
+            stale = stale or files_stale
+        for queue, old_files in previous.items():
+            if queue not in queues:
+                rescanned.append((old_files, {}))
+                changed = changed or bool(old_files)
+                stale = stale or bool(old_files)
+
+        dirty = self._dirty or stale
+        self._queues = queues
+        self._dirs = dirs
+        self._scanned_at = scanned_at
+        self._dirty = False
+        if first:
+            for files in queues.values():
+                self._link_files(files)
+        else:
+            for old_files, files in rescanned:
+                self._unlink_files(old_files)
+            for old_files, files in rescanned:
+                self._link_files(files)
+        if dirty:
+            self.save()
+        return changed
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        queue: Optional[str] = None,
+        epic: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return summaries matching all given filters, oldest first, then by id.
+
+        The tree is scanned on first use only; afterwards the in-memory
+        postings are kept current by :meth:`update` and :meth:`remove`,
+        and changes made by other processes are picked up by :meth:`sync`.
+        """
+        if self._queues is None:
+            self._scan()
+
+        postings = []
+        if status:
+            postings.append(self._by_status.get(status, set()))
+        if queue:
+            postings.append(self._by_queue.get(queue, set()))
+        if epic:
+            postings.append(self._by_epic.get(epic, set()))
+
+        if postings:
+            postings.sort(key=len)
+            ids: Iterable[str] = postings[0].intersection(*postings[1:])
+        else:
+            ids = self._by_id.keys()
+        summaries = [self._by_id[task_id] for task_id in ids]
+        summaries.sort(key=lambda t: (t.get("created_at", 0), t["id"]))
+        return summaries
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return the in-memory summary for ``task_id`` if it is indexed."""
+        return self._by_id.get(task_id)
+
+    def update(self, task_file: Path, task: Task) -> None:
+        """Record a task that was just written to ``task_file``."""
+        if self._queues is None:
+            return
+        try:
+            stamp = file_stamp(task_file.stat())
+        except OSError:
+            return
+        files = self._queues.setdefault(task_file.parent.name, {})
+        old = files.get(task_file.name)
+        if old is not None and old["task"] is not None:
+            self._unlink(old["task"])
+        summary = task_summary(task, task_file.parent.name)
+        files[task_file.name] = {"stamp": stamp, "task": summary}
+        self._link(summary)
+        self._dirty = True
+
+    def remove(self, task_file: Path) -> None:
+        """Forget a task file that was deleted."""
+        if self._queues is None:
+            return
+        old = self._queues.get(task_file.parent.name, {}).pop(task_file.name, None)
+        if old is not None:
+            if old["task"] is not None:
+                self._unlink(old["task"])
+            self._dirty = True
+
+    def remove_queue(self, queue: str) -> None:
+        """Forget every task of a deleted queue."""
+        if self._queues is None:
+            return
+        self._unlink_files(self._queues.pop(queue, {}))
+        self._dirs.pop(queue, None)
+        self._by_queue.pop(queue, None)
+        self._dirty = True
+
+    def save(self) -> bool:
+        """Write the index to disk."""
+        entries = {
+            f"{queue}/{name}": entry
+            for queue, files in (self._queues or {}).items()
+            for name, entry in files.items()
+        }
+        data = {
+            "version": INDEX_VERSION,
+            "scanned_at": self._scanned_at,
+            "entries": entries,
+        }
+        return save_json(self.path, data, indent=None, durable=False)
@@ -0,0 +1,96 @@
+"""Cross-process advisory locks for the task store."""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from .exceptions import LockOrderError
+from .storage import file_lock
+
+LOCKS_DIR = ".locks"
+TREE_LOCK = "tree.lock"
+STRIPES = 64
+
+
+class LockManager:
+    """Hand out ``flock`` based locks stored in ``<root>/.locks``.
+
+    Every writer takes the tree lock shared plus exclusive locks on the keys
+    it touches (``"task:q-1"``, ``"epic:epic-2"``...); operations spanning the
+    whole store take the tree lock exclusively. Keys are hashed onto a fixed
+    set of lock files and always acquired in sorted order, so the number of
+    lock files stays bounded and writers cannot deadlock each other.
+
+    Locks are re-entrant per thread: acquiring a lock file the thread already
+    holds is a no-op and keeps the outer lock mode. Asking for an exclusive
+    lock while only holding it shared raises :class:`LockOrderError`, as
+    does a nested :meth:`hold` that would take a new key lock sorting
+    before one already held, unless the tree lock is held exclusively.
+    """
+
+    def __init__(self, root: Path, stripes: int = STRIPES):
+        self.root = root / LOCKS_DIR
+        self.stripes = stripes
+        self._local = threading.local()
+
+    def _held(self) -> Dict[str, List[Any]]:
+        held = getattr(self._local, "held", None)
+        if held is None:
+            held = self._local.held = {}
+        return held
+
+    def _stripe(self, key: str) -> str:
+        return f"{zlib.crc32(key.encode('utf-8')) % self.stripes:02d}.lock"
+
+    @contextmanager
+    def _acquire(self, name: str, shared: bool) -> Iterator[None]:
+        held = self._held()
+        if name in held:
+            if held[name][1] and not shared:
+                raise LockOrderError(f"Cannot upgrade shared lock '{name}' to exclusive")
+            held[name][0] += 1
+            try:
+                yield
+            finally:
+                held[name][0] -= 1
+            return
+
+        self.root.mkdir(exist_ok=True)
+        with file_lock(self.root / name, shared=shared):
+            held[name] = [1, shared]
+            try:
+                yield
+            finally:
+                del held[name]
+
+    @contextmanager
+    def hold(self, *keys: str) -> Iterator[None]:
+        """Lock ``keys`` exclusively while sharing the tree lock."""
+        names = sorted({self._stripe(key) for key in keys})
+        held = self._held()
+        tree = held.get(TREE_LOCK)
+        if tree is None or tree[1]:
+            # Other writers may hold key locks, so new ones must sort after
+            # every key lock this thread already holds.
+            new = [name for name in names if name not in held]
+            top = max((name for name in held if name != TREE_LOCK), default=None)
+            if new and top is not None and new[0] < top:
+                raise LockOrderError(
+                    f"Cannot lock '{new[0]}' while holding '{top}'; "
+                    "take all keys in one hold() call"
+                )
+        with ExitStack() as stack:
+            stack.enter_context(self._acquire(TREE_LOCK, shared=True))
+            for name in names:
+                stack.enter_context(self._acquire(name, shared=False))
+            yield
+
+    @contextmanager
+    def tree(self, shared: bool = False) -> Iterator[None]:
+        """Lock the whole store, excluding all other writers unless ``shared``."""
+        with self._acquire(TREE_LOCK, shared=shared):
+            yield
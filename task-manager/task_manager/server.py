@@ -0,0 +1,114 @@
+"""Resident ``tm serve`` daemon keeping a warm :class:`TaskManager`."""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .client import is_serving, socket_path
+from .core import TaskManager
+from .storage import flush, get_durability, set_durability
+from .utils import capture_output, log_error
+
+Runner = Callable[[List[str]], int]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: TaskServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            # A client checking whether the daemon is up.
+            return
+        try:
+            request = json.loads(line)
+            argv = request["argv"]
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError("'argv' must be a list of strings")
+        except (ValueError, KeyError, TypeError) as e:
+            response: Dict[str, Any] = {
+                "exit_code": 2,
+                "stdout": "",
+                "stderr": f"Error: invalid request: {e}\n",
+            }
+        else:
+            response = self.server.execute(argv, request.get("durability"))
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class TaskServer(socketserver.UnixStreamServer):
+    """Serve CLI commands for one tasks root over a Unix socket.
+
+    Requests are handled one at a time on a single :class:`TaskManager`,
+    which is refreshed before each command so changes made by other
+    processes are seen. A refresh stats the queue directories and rescans
+    only those whose mtime changed.
+    """
+
+    def __init__(self, tm: TaskManager, run: Runner):
+        self.tm = tm
+        self.run = run
+        self.path = socket_path(tm.tasks_root)
+        super().__init__(str(self.path), _RequestHandler)
+        os.chmod(self.path, 0o600)
+
+    def execute(self, argv: List[str], durability: Optional[str] = None) -> Dict[str, Any]:
+        """Run one command and return its exit code and captured output."""
+        previous = get_durability()
+        with capture_output() as (out, err):
+            try:
+                if durability:
+                    set_durability(durability)
+                self.tm.refresh()
+                code = self.run(argv)
+            except Exception as e:
+                log_error(f"Error: {e}")
+                code = 1
+            finally:
+                flush()
+                set_durability(previous)
+        return {"exit_code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def _raise_interrupt(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
+def serve(tm: TaskManager, run: Runner) -> int:
+    """Serve commands for ``tm`` until interrupted."""
+    path = socket_path(tm.tasks_root)
+    if is_serving(tm.tasks_root):
+        log_error(f"Error: a tm daemon is already listening on {path}")
+        return 1
+    try:
+        Path(path).unlink()
+    except FileNotFoundError:
+        pass
+
+    try:
+        server = TaskServer(tm, run)
+    except OSError as e:
+        log_error(f"Error: cannot listen on {path}: {e}")
+        return 1
+
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    print(f"Serving {tm.tasks_root} on {path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
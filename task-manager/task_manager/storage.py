@@ -1,6 +1,89 @@
 import json
+import os
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+# Durability modes for ``save_json``:
+#   none  - atomic replace only, data reaches disk whenever the OS flushes it
+#   fsync - fsync every written file and its directory before returning
+#   batch - remember written files and fsync them once in ``flush``
+DURABILITY_MODES = ("none", "fsync", "batch")
+
+_durability = "fsync"
+_pending_files: set[Path] = set()
+_pending_dirs: set[Path] = set()
+
+
+def set_durability(mode: str) -> None:
+    """Select how ``save_json`` makes writes durable."""
+    global _durability
+    if mode not in DURABILITY_MODES:
+        raise ValueError(
+            f"Invalid durability mode '{mode}'. Valid modes: {', '.join(DURABILITY_MODES)}"
+        )
+    if _durability == "batch" and mode != "batch":
+        flush()
+    _durability = mode
+
+
+def get_durability() -> str:
+    """Return the current durability mode."""
+    return _durability
+
+
+def _fsync_path(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _discard(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def flush() -> None:
+    """Fsync files written in ``batch`` mode, then their directories once each."""
+    files = sorted(_pending_files)
+    dirs = sorted(_pending_dirs)
+    _pending_files.clear()
+    _pending_dirs.clear()
+    for path in files:
+        _fsync_path(path)
+    for path in dirs:
+        _fsync_path(path)
+
+
+@contextmanager
+def file_lock(path: Path, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory ``flock`` on ``path`` for the duration of the block.
+
+    The lock file is created if needed. On platforms without ``fcntl`` the
+    block runs unlocked.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
 
 
 def load_json(path: Path) -> Optional[dict[str, Any]]:
@@ -12,12 +95,152 @@ def load_json(path: Path) -> Optional[dict[str, Any]]:
         return None
 
 
-def save_json(path: Path, data: dict[str, Any]) -> bool:
-    """Save JSON data to a file."""
+def _create_temp(path: Path) -> Tuple[Path, int]:
+    """Create a uniquely named temporary file next to ``path``; return it and its fd."""
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    return tmp, os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+
+
+def _write_temp(path: Path, data: dict[str, Any], indent: Optional[int], mode: str) -> Path:
+    """Write ``data`` to a new temporary file next to ``path``."""
+    tmp, fd = _create_temp(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            if mode == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        _discard(tmp)
+        raise
+    return tmp
+
+
+def _sync_dirs(paths: Iterable[Path], mode: str) -> None:
+    """Make the renames of ``paths`` durable according to ``mode``."""
+    if mode == "fsync":
+        for directory in sorted({path.parent for path in paths}):
+            _fsync_path(directory)
+    elif mode == "batch":
+        for path in paths:
+            _pending_files.add(path)
+            _pending_dirs.add(path.parent)
+
+
+@contextmanager
+def _atomic_file(path: Path, binary: bool, durable: bool) -> Iterator[IO[Any]]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = _durability if durable else "none"
+    tmp, fd = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+            yield f
+            if mode == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        _discard(tmp)
+        raise
+    _sync_dirs([path], mode)
+
+
+@contextmanager
+def atomic_output(path: Path, durable: bool = True) -> Iterator[IO[str]]:
+    """Open a temporary file that replaces ``path`` once fully written.
+
+    Like :func:`save_json`, the write follows the durability mode unless
+    ``durable`` is False.
+    """
+    with _atomic_file(path, False, durable) as f:
+        yield f
+
+
+@contextmanager
+def atomic_binary_output(path: Path, durable: bool = True) -> Iterator[IO[bytes]]:
+    """Binary counterpart of :func:`atomic_output`."""
+    with _atomic_file(path, True, durable) as f:
+        yield f
+
+
+def save_json(
+    path: Path,
+    data: dict[str, Any],
+    indent: Optional[int] = 2,
+    durable: bool = True,
+) -> bool:
+    """Save JSON data to a file.
+
+    The data is written to a temporary file in the same directory and moved
+    over ``path`` with ``os.replace``, so readers never see a partially
+    written file. ``durable=False`` skips fsync regardless of the durability
+    mode, for files that can be rebuilt such as caches.
+    """
+    path = Path(path)
+    mode = _durability if durable else "none"
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-        return True
-    except (OSError, IOError):
+        tmp = _write_temp(path, data, indent, mode)
+    except OSError:
         return False
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        _discard(tmp)
+        return False
+
+    _sync_dirs([path], mode)
+    return True
+
+
+def save_json_batch(files: Dict[Path, dict[str, Any]], journal: Path) -> bool:
+    """Replace several JSON files as one unit.
+
+    Every file is first written to a temporary file. The pending renames are
+    then recorded in ``journal`` before any file is moved into place, so an
+    interrupted batch is completed by :func:`replay_journal` instead of
+    leaving only some of the files updated. The journal holds absolute
+    paths, so it can be replayed from any working directory.
+    """
+    temps: List[Tuple[str, str]] = []
+    try:
+        for path, data in files.items():
+            temp = _write_temp(Path(path), data, 2, _durability)
+            temps.append((os.path.abspath(temp), os.path.abspath(path)))
+    except BaseException as e:
+        for tmp, _ in temps:
+            _discard(Path(tmp))
+        if isinstance(e, OSError):
+            return False
+        raise
+
+    if not save_json(journal, {"renames": temps}):
+        for tmp, _ in temps:
+            _discard(Path(tmp))
+        return False
+    if not replay_journal(journal):
+        return False
+    _sync_dirs([Path(path) for path in files], _durability)
+    return True
+
+
+def replay_journal(journal: Path) -> bool:
+    """Finish the renames recorded by :func:`save_json_batch`.
 
+    Returns False, keeping the journal for another attempt, if a rename
+    fails or a temporary file is missing while its target does not exist.
+    A missing journal means there is nothing to do.
+    """
+    data = load_json(journal)
+    if data is not None:
+        for tmp, path in data.get("renames", []):
+            try:
+                os.replace(tmp, path)
+            except FileNotFoundError:
+                if os.path.exists(path):
+                    # Already moved into place by an earlier replay.
+                    continue
+                return False
+            except OSError:
+                return False
+    _discard(journal)
+    return True
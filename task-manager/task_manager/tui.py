@@ -1,11 +1,13 @@
 import logging
 import time
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:  # pragma: no cover - type hints only
     from textual.app import App, ComposeResult  # type: ignore
     from textual.containers import Vertical  # type: ignore
-    from textual.widgets import Header, Footer, Button, Static, Input, DataTable  # type: ignore
+    from textual.widget import Widget  # type: ignore
+    from textual.widgets import Header, Footer, Button, Static, Input, DataTable, LoadingIndicator  # type: ignore
     from textual.screen import Screen  # type: ignore
 from .core import TaskManager
 from .exceptions import TaskManagerError
@@ -13,7 +15,8 @@ from .exceptions import TaskManagerError
 try:
     from textual.app import App, ComposeResult  # type: ignore
     from textual.containers import Vertical  # type: ignore
-    from textual.widgets import Header, Footer, Button, Static, Input, DataTable  # type: ignore
+    from textual.widget import Widget  # type: ignore
+    from textual.widgets import Header, Footer, Button, Static, Input, DataTable, LoadingIndicator  # type: ignore
     from textual.screen import Screen  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     logging.getLogger(__name__).error(
@@ -24,6 +27,7 @@ except Exception:  # pragma: no cover - optional dependency
 
     launch_tui = _launch_tui_noop
 else:
+    from textual.coordinate import Coordinate
     from textual.message import Message
 
     def _parse_comment_id(cid_str: str) -> int | None:
@@ -110,6 +114,43 @@ else:
             super().__init__()
             self.cid = cid
 
+    class LazyDataTable(DataTable):
+        """DataTable asking for more rows when scrolled near its end."""
+
+        class NearEnd(Message):
+            """The visible rows reach the end of the loaded rows."""
+
+        def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+            super().watch_scroll_y(old_value, new_value)
+            if new_value > old_value and self.max_scroll_y - new_value < self.size.height:
+                self.post_message(self.NearEnd())
+
+        def watch_cursor_coordinate(
+            self, old_coordinate: Coordinate, new_coordinate: Coordinate
+        ) -> None:
+            super().watch_cursor_coordinate(old_coordinate, new_coordinate)
+            if new_coordinate.row > old_coordinate.row and new_coordinate.row >= self.row_count - 1:
+                self.post_message(self.NearEnd())
+
+    def sync_rows(table: DataTable, rows: dict[str, tuple], keys: Iterable[str]) -> None:
+        """Bring the rows of ``table`` for ``keys`` in line with ``rows``.
+
+        Keys missing from ``rows`` have their row removed, new keys get a row
+        appended and existing rows only have their changed cells updated.
+        """
+        columns = list(table.columns)
+        for key in keys:
+            cells = rows.get(key)
+            if key not in table.rows:
+                if cells is not None:
+                    table.add_row(*cells, key=key)
+            elif cells is None:
+                table.remove_row(key)
+            else:
+                for column, old, new in zip(columns, table.get_row(key), cells):
+                    if old != new:
+                        table.update_cell(key, column, new)
+
     class BaseScreen(Screen):
         def __init__(self, manager: "TaskManager") -> None:
             super().__init__()
@@ -120,8 +161,32 @@ else:
             with Vertical(id="main"):
                 self.body = Vertical(id="body")
                 yield self.body
+                self.dialog = Vertical(id="dialog")
+                self.dialog.display = False
+                yield self.dialog
             yield Footer()
 
+        def show_dialog(self, *widgets: Widget) -> None:
+            """Show ``widgets`` in place of the body, which stays mounted."""
+            self.dialog.remove_children()
+            self.dialog.mount_all(widgets)
+            self.body.display = False
+            self.dialog.display = True
+
+        def close_dialog(self) -> None:
+            self.dialog.remove_children()
+            self.dialog.display = False
+            self.body.display = True
+
+        def apply_changes(self, task_ids: set[str]) -> None:
+            """Update what the screen shows of the tasks in ``task_ids``."""
+
+        def tasks_changed(self, task_ids: set[str]) -> None:
+            """Let every open screen update after ``task_ids`` were modified."""
+            for screen in self.app.screen_stack:
+                if isinstance(screen, BaseScreen):
+                    screen.apply_changes(task_ids)
+
         def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover - UI callbacks
             bid = event.button.id
             if bid == "back":
@@ -183,21 +248,29 @@ else:
             self._delete_target: str | None = None
 
         def on_mount(self) -> None:
-            self.refresh_screen()
-
-        def refresh_screen(self) -> None:
             assert self.body is not None
-            self.body.remove_children()
-            table: DataTable = DataTable()
+            table: DataTable = DataTable(id="queues_table")
             table.add_columns("Name", "Title", "Description")
-            for q in self.manager.queue_list():
-                table.add_row(q["name"], q["title"], q["description"])
             self.body.mount(table)
             self.set_focus(table)
             self.body.mount(Input(placeholder="Queue name", id="del_queue_name"))
             self.body.mount(Button("Delete Queue", id="queue_delete"))
             self.body.mount(Button("Add Queue", id="queue_add"))
             self.body.mount(Button("Back", id="back"))
+            self.refresh_rows()
+
+        def refresh_rows(self, names: Iterable[str] | None = None) -> None:
+            """Update the rows of queues ``names``, or of every queue."""
+            table = self.query_one("#queues_table", DataTable)
+            rows = {
+                q["name"]: (q["name"], q["title"], q["description"])
+                for q in self.manager.queue_list()
+            }
+            if names is None:
+                names = list(rows) + [
+                    key.value for key in table.rows if key.value is not None and key.value not in rows
+                ]
+            sync_rows(table, rows, names)
 
         def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover - UI callbacks
             super().on_button_pressed(event)  # Handle common actions
@@ -220,59 +293,62 @@ else:
                 self.post_message(Cancel())
 
         def on_queue_add(self, message: QueueAdd) -> None:  # pragma: no cover - UI callbacks
-            assert self.body is not None
-            self.body.remove_children()
-            self.body.mount(Static("Add New Queue", classes="title"))
-            self.body.mount(Input(placeholder="Queue name", id="q_name"))
-            self.body.mount(Input(placeholder="Queue title", id="q_title"))
-            self.body.mount(Input(placeholder="Queue description", id="q_desc"))
-            self.body.mount(Button("Create", id="create_queue"))
-            self.body.mount(Button("Cancel", id="cancel"))
+            self.show_dialog(
+                Static("Add New Queue", classes="title"),
+                Input(placeholder="Queue name", id="q_name"),
+                Input(placeholder="Queue title", id="q_title"),
+                Input(placeholder="Queue description", id="q_desc"),
+                Button("Create", id="create_queue"),
+                Button("Cancel", id="cancel"),
+            )
 
         def on_create_queue(self, message: CreateQueue) -> None:  # pragma: no cover - UI callbacks
+            self.close_dialog()
             self._handle_manager_operation(
                 self.manager.queue_add, message.name, message.title, message.desc
             )
-            self.refresh_screen()
+            self.refresh_rows([message.name])
 
         def on_cancel(self, message: Cancel) -> None:  # pragma: no cover - UI callbacks
-            self.refresh_screen()
+            self._delete_target = None
+            self.close_dialog()
 
         def on_queue_delete(self, message: QueueDelete) -> None:  # pragma: no cover - UI callbacks
-            assert self.body is not None
-            self.body.remove_children()
-            self.body.mount(
-                Static(
-                    f"Are you sure you want to delete queue '{message.name}'?",
-                    id="confirm_delete",
-                )
+            self.show_dialog(
+                Static(f"Are you sure you want to delete queue '{message.name}'?"),
+                Button("Yes", id="confirm_delete"),
+                Button("No", id="cancel"),
             )
-            self.body.mount(Button("Yes", id="confirm_delete"))
-            self.body.mount(Button("No", id="cancel"))
             self._delete_target = message.name
 
         def on_confirm_delete(self, message: ConfirmDelete) -> None:  # pragma: no cover - UI callbacks
             delete_name: str | None = getattr(self, "_delete_target", None)
-            if delete_name:
-                self._handle_manager_operation(self.manager.queue_delete, delete_name)
             self._delete_target = None
-            self.refresh_screen()
+            self.close_dialog()
+            if not delete_name:
+                return
+            tasks = self._handle_manager_operation(self.manager.task_list, queue=delete_name) or []
+            self._handle_manager_operation(self.manager.queue_delete, delete_name)
+            self.refresh_rows([delete_name])
+            self.tasks_changed({t["id"] for t in tasks})
 
     class TasksScreen(BaseScreen):
+        # Rows fetched and added to the table at a time as the user scrolls down.
+        PAGE_SIZE = 200
+
         def __init__(self, manager: "TaskManager") -> None:
             super().__init__(manager)
             self._delete_target: str | None = None
+            self._fetching = False
+            self._exhausted = False
+            # (created_at, id) of the last task fetched; pages continue after it.
+            self._last: tuple[float, str] | None = None
 
         def on_mount(self) -> None:
-            self.refresh_screen()
-
-        def refresh_screen(self) -> None:
             assert self.body is not None
-            self.body.remove_children()
-            table: DataTable = DataTable()
+            table = LazyDataTable(id="tasks_table")
             table.add_columns("ID", "Title", "Status")
-            for t in self.manager.task_list():
-                table.add_row(t["id"], t["title"], t["status"])
+            self.body.mount(LoadingIndicator(id="loading"))
             self.body.mount(table)
             self.set_focus(table)
             self.body.mount(Input(placeholder="Task ID", id="task_id"))
@@ -280,6 +356,64 @@ else:
             self.body.mount(Button("View Comments", id="view_comments"))
             self.body.mount(Button("Delete Task", id="task_delete"))
             self.body.mount(Button("Back", id="back"))
+            self._load_more()
+
+        def _load_page(self, after: tuple[float, str] | None) -> None:
+            try:
+                page = self.manager.task_list(after=after, limit=self.PAGE_SIZE)
+            except TaskManagerError as e:
+                self.app.call_from_thread(self.show_error, str(e))
+                page = []
+            self.app.call_from_thread(self._show_page, page)
+
+        def _show_page(self, page: list[dict]) -> None:
+            self._fetching = False
+            self.query("#loading").remove()
+            for table in self.query("#tasks_table").results(LazyDataTable):
+                for t in page:
+                    table.add_row(t["id"], t["title"], t["status"], key=t["id"])
+                if page:
+                    self._last = (page[-1]["created_at"], page[-1]["id"])
+                self._exhausted = len(page) < self.PAGE_SIZE
+
+        def _load_more(self) -> None:
+            """Fetch the page of tasks following the last one fetched.
+
+            Pages are keyed by the last task's ``(created_at, id)`` rather
+            than the row count, so tasks deleted or created by other
+            processes meanwhile neither shift nor repeat rows.
+            """
+            if self._fetching or self._exhausted:
+                return
+            if self.query("#tasks_table"):
+                self._fetching = True
+                # Reading the index may touch many files; keep the UI responsive.
+                self.run_worker(
+                    partial(self._load_page, self._last), thread=True, group="task_list"
+                )
+
+        def on_lazy_data_table_near_end(self, message: LazyDataTable.NearEnd) -> None:  # pragma: no cover - UI callbacks
+            self._load_more()
+
+        def apply_changes(self, task_ids: set[str]) -> None:
+            """Re-read the tasks in ``task_ids`` and patch their rows.
+
+            Deleted tasks lose their row and new tasks are appended once
+            every page is loaded; other rows are left untouched.
+            """
+            rows: dict[str, tuple] = {}
+            for tid in task_ids:
+                try:
+                    t = self.manager.task_show(tid)
+                except TaskManagerError:
+                    continue
+                rows[tid] = (t["id"], t["title"], t["status"])
+            for table in self.query("#tasks_table").results(LazyDataTable):
+                keys = [
+                    tid for tid in sorted(task_ids)
+                    if tid in table.rows or (self._exhausted and tid in rows)
+                ]
+                sync_rows(table, rows, keys)
 
         def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover - UI callbacks
             super().on_button_pressed(event)  # Handle common actions
@@ -310,46 +444,36 @@ else:
                 self.app.push_screen(TaskDetailScreen(self.manager, message.task_id))
 
         def on_task_delete(self, message: TaskDelete) -> None:  # pragma: no cover - UI callbacks
-            assert self.body is not None
-            self.body.remove_children()
-            self.body.mount(
-                Static(
-                    f"Are you sure you want to delete task '{message.task_id}'?",
-                    id="confirm_delete",
-                )
+            self.show_dialog(
+                Static(f"Are you sure you want to delete task '{message.task_id}'?"),
+                Button("Yes", id="confirm_task_delete"),
+                Button("No", id="cancel"),
             )
-            self.body.mount(Button("Yes", id="confirm_task_delete"))
-            self.body.mount(Button("No", id="cancel"))
             self._delete_target = message.task_id
 
+        def on_cancel(self, message: Cancel) -> None:  # pragma: no cover - UI callbacks
+            self._delete_target = None
+            self.close_dialog()
+
         def on_confirm_task_delete(self, message: ConfirmTaskDelete) -> None:  # pragma: no cover - UI callbacks
             tid: str | None = getattr(self, "_delete_target", None)
+            self._delete_target = None
+            self.close_dialog()
             if tid:
                 self._handle_manager_operation(self.manager.task_delete, tid)
-            self._delete_target = None
-            self.refresh_screen()
+                self.tasks_changed({tid})
 
     class EpicsScreen(BaseScreen):
         def __init__(self, manager: "TaskManager") -> None:
             super().__init__(manager)
+            self._progress_map: dict[str, dict] = {}
 
         def on_mount(self) -> None:
             self.refresh_screen()
 
         def _progress(self, epic: dict) -> str:
-            done = 0
-            total = len(epic.get("child_tasks", [])) + len(epic.get("child_epics", []))
-            for tid in epic.get("child_tasks", []):
-                data = self._handle_manager_operation(self.manager.task_show, tid)
-                if data and data.get("status") == "done":
-                    done += 1
-            for eid in epic.get("child_epics", []):
-                data = self._handle_manager_operation(self.manager.epic_show, eid)
-                if data and data.get("status") == "closed":
-                    done += 1
-            if total == 0:
-                return "0/0"
-            return f"{done}/{total}"
+            progress = self._progress_map.get(epic["id"], {})
+            return f"{progress.get('done', 0)}/{progress.get('total', 0)}"
 
         def _status_label(self, status: str) -> str:
             """Format status for display."""
@@ -360,6 +484,7 @@ else:
             self.body.remove_children()
             table: DataTable = DataTable()
             table.add_columns("ID", "Title", "Status", "Progress")
+            self._progress_map = self._handle_manager_operation(self.manager.epic_progress_all) or {}
             for e in self.manager.epic_list():
                 table.add_row(
                     e["id"],
@@ -390,21 +515,23 @@ else:
             super().__init__(manager)
             self.task_id = task_id
 
-        def on_mount(self) -> None:
-            self.refresh_screen()
+        @staticmethod
+        def _comment_label(comment: dict) -> str:
+            created = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(comment.get("created_at", 0))
+            )
+            return f"[{comment.get('id')}] {created}: {comment.get('text')}"
 
-        def refresh_screen(self) -> None:
+        def on_mount(self) -> None:
             assert self.body is not None
-            self.body.remove_children()
             self.body.mount(Static(f"Comments for {self.task_id}", classes="title"))
             comments = self._handle_manager_operation(self.manager.task_comment_list, self.task_id) or []
-            for c in comments:
-                created = time.strftime(
-                    "%Y-%m-%d %H:%M:%S", time.localtime(c.get("created_at", 0))
-                )
-                self.body.mount(
-                    Static(f"[{c.get('id')}] {created}: {c.get('text')}")
-                )
+            container = Vertical(
+                *(Static(self._comment_label(c), id=f"comment_{c.get('id')}", markup=False) for c in comments),
+                id="comments",
+            )
+            container.styles.height = "auto"
+            self.body.mount(container)
             self.body.mount(Input(placeholder="New comment", id="new_comment"))
             self.body.mount(Button("Add Comment", id="add_comment"))
             self.body.mount(Input(placeholder="Comment ID", id="edit_comment_id"))
@@ -435,23 +562,46 @@ else:
                     if cid_int is not None:
                         self.post_message(RemoveComment(cid_int))
 
+        def apply_comment_changes(self, cids: Iterable[int]) -> None:
+            """Add, update or remove the lines of comments ``cids``."""
+            comments = self._handle_manager_operation(self.manager.task_comment_list, self.task_id)
+            if comments is None:
+                return
+            by_id = {c.get("id"): c for c in comments}
+            container = self.query_one("#comments", Vertical)
+            for cid in cids:
+                comment = by_id.get(cid)
+                lines = container.query(f"#comment_{cid}").results(Static)
+                line = next(lines, None)
+                if comment is None:
+                    if line is not None:
+                        line.remove()
+                elif line is None:
+                    container.mount(Static(self._comment_label(comment), id=f"comment_{cid}", markup=False))
+                else:
+                    line.update(self._comment_label(comment))
+
         def on_add_comment(self, message: AddComment) -> None:  # pragma: no cover - UI callbacks
-            self._handle_manager_operation(
+            cid = self._handle_manager_operation(
                 self.manager.task_comment_add, self.task_id, message.text
             )
-            self.refresh_screen()
+            if cid is not None:
+                self.apply_comment_changes([cid])
+                self.tasks_changed({self.task_id})
 
         def on_edit_comment(self, message: EditComment) -> None:  # pragma: no cover - UI callbacks
             self._handle_manager_operation(
                 self.manager.task_comment_edit, self.task_id, message.cid, message.text
             )
-            self.refresh_screen()
+            self.apply_comment_changes([message.cid])
+            self.tasks_changed({self.task_id})
 
         def on_remove_comment(self, message: RemoveComment) -> None:  # pragma: no cover - UI callbacks
             self._handle_manager_operation(
                 self.manager.task_comment_remove, self.task_id, message.cid
             )
-            self.refresh_screen()
+            self.apply_comment_changes([message.cid])
+            self.tasks_changed({self.task_id})
 
     class TaskDetailScreen(BaseScreen):
         def __init__(self, manager: "TaskManager", task_id: str) -> None:
@@ -475,17 +625,13 @@ else:
             return " > ".join(reversed(chain))
 
         def on_mount(self) -> None:
-            self.refresh_screen()
-
-        def refresh_screen(self) -> None:
             assert self.body is not None
-            self.body.remove_children()
             data = self._handle_manager_operation(self.manager.task_show, self.task_id)
             if not data:
                 return
             self.body.mount(Static(f"Task {data['id']}", classes="title"))
-            self.body.mount(Static(f"Title: {data['title']}"))
-            self.body.mount(Static(f"Status: {data['status']}"))
+            self.body.mount(Static(f"Title: {data['title']}", id="task_title"))
+            self.body.mount(Static(f"Status: {data['status']}", id="task_status"))
             epics = self._handle_manager_operation(
                 self.manager.task_parent_epics, self.task_id
             ) or []
@@ -520,6 +666,27 @@ else:
             self.body.mount(Button("View Comments", id="view_comments"))
             self.body.mount(Button("Back", id="back"))
 
+        def apply_changes(self, task_ids: set[str]) -> None:
+            """Update the header and the epic task buttons of ``task_ids``."""
+            for tid in task_ids:
+                header = tid == self.task_id and bool(self.query("#task_title"))
+                buttons = list(self.query(f"#open_task_{tid}").results(Button))
+                if not header and not buttons:
+                    continue
+                try:
+                    data = self.manager.task_show(tid)
+                except TaskManagerError:
+                    for button in buttons:
+                        button.remove()
+                    if header:
+                        self.query_one("#task_status", Static).update("Status: deleted")
+                    continue
+                for button in buttons:
+                    button.label = f"{tid}: {data['title']} ({data['status']})"
+                if header:
+                    self.query_one("#task_title", Static).update(f"Title: {data['title']}")
+                    self.query_one("#task_status", Static).update(f"Status: {data['status']}")
+
         def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover - UI callbacks
             super().on_button_pressed(event)
             bid = event.button.id or ""
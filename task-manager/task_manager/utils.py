@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import datetime
+import io
 import logging
 import sys
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from typing import Iterator, List, TextIO, Tuple
 
 
 def format_timestamp(timestamp: float) -> str:
@@ -23,28 +26,33 @@ class _LessThanFilter(logging.Filter):
         return record.levelno < self.max_level
 
 
-def setup_logging(level: int = logging.INFO) -> None:
-    """Configure basic logging for the CLI."""
-
-    logger = logging.getLogger()
-    if logger.handlers:
-        # Logger already configured
-        return
-
-    logger.setLevel(level)
+def _cli_handlers(out: TextIO, err: TextIO) -> List[logging.Handler]:
+    """Return handlers sending info messages to ``out`` and errors to ``err``."""
     fmt = logging.Formatter("%(message)s")
 
-    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler = logging.StreamHandler(out)
     stdout_handler.setLevel(logging.INFO)
     stdout_handler.addFilter(_LessThanFilter(logging.ERROR))
     stdout_handler.setFormatter(fmt)
 
-    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler = logging.StreamHandler(err)
     stderr_handler.setLevel(logging.ERROR)
     stderr_handler.setFormatter(fmt)
 
-    logger.addHandler(stdout_handler)
-    logger.addHandler(stderr_handler)
+    return [stdout_handler, stderr_handler]
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Configure basic logging for the CLI."""
+
+    logger = logging.getLogger()
+    if logger.handlers:
+        # Logger already configured
+        return
+
+    logger.setLevel(level)
+    for handler in _cli_handlers(sys.stdout, sys.stderr):
+        logger.addHandler(handler)
 
 
 def log_error(message: str) -> None:
@@ -52,5 +60,32 @@ def log_error(message: str) -> None:
     logging.getLogger(__name__).error(message)
 
 
+@contextmanager
+def capture_output() -> Iterator[Tuple[io.StringIO, io.StringIO]]:
+    """Collect everything printed or logged to stdout/stderr in the block.
 
-
+    Log handlers writing to the console are pointed at the buffers; if
+    logging is not set up for the console, CLI style handlers are added for
+    the duration of the block.
+    """
+    logger = logging.getLogger()
+    out, err = io.StringIO(), io.StringIO()
+    swapped: List[Tuple[logging.StreamHandler, object]] = []
+    for handler in logger.handlers:
+        if not isinstance(handler, logging.StreamHandler):
+            continue
+        if handler.stream is sys.stdout:
+            swapped.append((handler, handler.setStream(out)))
+        elif handler.stream is sys.stderr:
+            swapped.append((handler, handler.setStream(err)))
+    added = [] if swapped else _cli_handlers(out, err)
+    for handler in added:
+        logger.addHandler(handler)
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            yield out, err
+    finally:
+        for handler, stream in swapped:
+            handler.setStream(stream)
+        for handler in added:
+            logger.removeHandler(handler)
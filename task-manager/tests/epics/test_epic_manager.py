@@ -12,3 +12,26 @@ def test_list_epics(tmp_path: Path):
     manager = EpicManager(epics_root)
     epics = manager.list_epics()
     assert epics[0]["id"] == "epic-1"
+
+
+def test_parent_ids_patched_on_save_and_delete(tmp_path: Path):
+    epics_root = tmp_path / "epics"
+    epics_root.mkdir()
+    for eid in ("epic-1", "epic-2"):
+        save_json(epics_root / f"{eid}.json", Epic(id=eid, title="T", description="D").to_dict())
+    manager = EpicManager(epics_root)
+    assert manager.parent_ids("q-1") == []
+
+    parent = manager.load_epic("epic-1")
+    parent.child_tasks.append("q-1")
+    parent.child_epics.append("epic-2")
+    manager.save_epic(parent)
+    assert manager.parent_ids("q-1") == ["epic-1"]
+    assert manager.parent_ids("epic-2") == ["epic-1"]
+
+    parent.child_tasks.remove("q-1")
+    manager.save_epic(parent)
+    assert manager.parent_ids("q-1") == []
+
+    manager.delete_epic("epic-1")
+    assert manager.parent_ids("epic-2") == []
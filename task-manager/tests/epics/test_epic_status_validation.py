@@ -3,6 +3,7 @@ import shutil
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from task_manager import TaskManager
 
@@ -28,5 +29,20 @@ class TestEpicStatusValidation(unittest.TestCase):
         invalid = self.tm.invalid_closed_epics()
         self.assertIn(epic_id, invalid)
 
+    def test_epic_progress_all(self):
+        done_id = self.tm.task_add("Done", "D", "q")
+        self.tm.task_done(done_id)
+        parent = self.tm.epic_add("Parent", "D")
+        child = self.tm.epic_add("Child", "D")
+        self.tm.epic_add_epic(parent, child)
+        self.tm.epic_add_task(parent, self.task_id)
+        self.tm.epic_add_task(child, done_id)
+
+        with patch.object(self.tm, "_load_task", side_effect=AssertionError("file read")):
+            progress = self.tm.epic_progress_all()
+        self.assertEqual(progress[child], {"done": 1, "total": 1, "complete": True})
+        self.assertEqual(progress[parent], {"done": 1, "total": 2, "complete": False})
+        self.assertEqual(self.tm.invalid_closed_epics(), [])
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 import tempfile
 import shutil
 from pathlib import Path
+from unittest.mock import patch
 from task_manager.core import TaskManager
 
 
@@ -21,3 +22,23 @@ def test_task_parent_epics():
     finally:
         shutil.rmtree(tmp)
 
+
+
+def test_auto_close_cascade_does_not_rescan_epics():
+    tmp = tempfile.mkdtemp()
+    try:
+        tm = TaskManager(tmp, epics_root=str(Path(tmp)/"epics"))
+        tm.queue_add("q", "Q", "d")
+        tid = tm.task_add("T", "d", "q")
+        top = tm.epic_add("Top", "d")
+        mid = tm.epic_add("Mid", "d")
+        tm.epic_add_epic(top, mid)
+        tm.epic_add_task(mid, tid)
+        tm.task_parent_epics(tid)
+        with patch.object(tm.epic_manager, "load_all_epics") as load_all:
+            tm.task_done(tid)
+        load_all.assert_not_called()
+        assert tm.epic_show(mid)["status"] == "closed"
+        assert tm.epic_show(top)["status"] == "closed"
+    finally:
+        shutil.rmtree(tmp)
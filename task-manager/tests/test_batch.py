@@ -0,0 +1,97 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from task_manager import TaskManager, core, storage
+from task_manager.core import BATCH_JOURNAL_FILE
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.tasks_root = Path(self.tmpdir) / "tasks"
+        self.epics_root = Path(self.tmpdir) / "epics"
+        self.tm = TaskManager(str(self.tasks_root), str(self.epics_root))
+        self.tm.queue_add("q", "Queue", "desc")
+        self.t1 = self.tm.task_add("One", "d", "q")
+        self.t2 = self.tm.task_add("Two", "d", "q")
+        self.epic_id = self.tm.epic_add("E", "d")
+        self.tm.epic_add_task(self.epic_id, self.t1)
+        self.tm.epic_add_task(self.epic_id, self.t2)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def _on_disk(self, task_id: str) -> dict:
+        return json.loads((self.tasks_root / "q" / f"{task_id}.json").read_text())
+
+    def test_changes_staged_until_commit(self) -> None:
+        with self.tm.batch():
+            self.tm.task_comment_add(self.t1, "first")
+            self.tm.task_comment_add(self.t1, "second")
+            self.tm.task_start(self.t1)
+            self.assertEqual(self._on_disk(self.t1)["comments"], [])
+            self.assertEqual(len(self.tm.task_comment_list(self.t1)), 2)
+
+        data = self._on_disk(self.t1)
+        self.assertEqual([c["text"] for c in data["comments"]], ["first", "second"])
+        self.assertEqual(data["status"], "in_progress")
+        self.assertEqual(self.tm.task_list(status="in_progress")[0]["id"], self.t1)
+        self.assertFalse((self.tasks_root / BATCH_JOURNAL_FILE).exists())
+
+    def test_files_written_once_in_one_pass(self) -> None:
+        with patch.object(core, "save_json_batch", wraps=core.save_json_batch) as batch_save:
+            with patch.object(core, "save_json", wraps=core.save_json) as single_save:
+                with self.tm.batch():
+                    for i in range(5):
+                        self.tm.task_comment_add(self.t1, str(i))
+                    self.tm.task_link_add(self.t1, self.t2)
+        single_save.assert_not_called()
+        batch_save.assert_called_once()
+        self.assertEqual(len(batch_save.call_args.args[0]), 2)
+
+    def test_auto_close_runs_once_at_commit(self) -> None:
+        with patch.object(self.tm, "_can_close_epic", wraps=self.tm._can_close_epic) as check:
+            with self.tm.batch():
+                self.tm.task_done(self.t1)
+                self.tm.task_done(self.t2)
+                self.assertEqual(self.tm.epic_show(self.epic_id)["status"], "open")
+                check.assert_not_called()
+        self.assertEqual(check.call_count, 1)
+        self.assertEqual(self.tm.epic_show(self.epic_id)["status"], "closed")
+
+    def test_error_discards_staged_changes(self) -> None:
+        with self.assertRaises(RuntimeError):
+            with self.tm.batch():
+                self.tm.task_done(self.t1)
+                self.tm.epic_remove_task(self.epic_id, self.t2)
+                raise RuntimeError("boom")
+        self.assertEqual(self._on_disk(self.t1)["status"], "todo")
+        self.assertEqual(self.tm.task_show(self.t1)["status"], "todo")
+        self.assertEqual(
+            [e["id"] for e in self.tm.task_parent_epics(self.t2)], [self.epic_id]
+        )
+
+    def test_interrupted_commit_replayed_on_open(self) -> None:
+        real_replay = storage.replay_journal
+        with patch.object(storage, "replay_journal", return_value=False):
+            with self.assertRaises(core.StorageError):
+                with self.tm.batch():
+                    self.tm.task_done(self.t1)
+                    self.tm.task_update(self.t2, "title", "Renamed")
+        self.assertTrue((self.tasks_root / BATCH_JOURNAL_FILE).exists())
+        self.assertEqual(self._on_disk(self.t1)["status"], "todo")
+
+        with patch.object(core, "replay_journal", wraps=real_replay) as replay:
+            TaskManager(str(self.tasks_root), str(self.epics_root))
+        replay.assert_called_once()
+        self.assertEqual(self._on_disk(self.t1)["status"], "done")
+        self.assertEqual(self._on_disk(self.t2)["title"], "Renamed")
+        self.assertFalse((self.tasks_root / BATCH_JOURNAL_FILE).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for the `batch` command.
+"""
+
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from task_manager.cli import parse_batch_line
+
+
+class TestBatchCommand(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.tasks_root = Path(self.test_dir) / "test_tasks"
+        self.task_manager_path = Path(__file__).parent.parent / "task_manager.py"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def run_batch(self, commands, *options):
+        cmd = [
+            "python",
+            str(self.task_manager_path),
+            "--tasks-root",
+            str(self.tasks_root),
+            "batch",
+            *options,
+        ]
+        result = subprocess.run(
+            cmd, input=commands, capture_output=True, text=True, cwd=self.test_dir
+        )
+        results = [json.loads(line) for line in result.stdout.splitlines()]
+        return result, results
+
+    def test_commands_share_one_process(self):
+        commands = "\n".join(
+            [
+                "queue add --name q --title Q --description 'Queue one'",
+                "# comments and blank lines are skipped",
+                "",
+                '["task", "add", "--title", "First task", "--description", "d", "--queue", "q"]',
+                '{"argv": ["task", "done", "--id", "q-1"]}',
+                "task list --status done",
+            ]
+        )
+        result, results = self.run_batch(commands)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual([r["line"] for r in results], [1, 4, 5, 6])
+        self.assertTrue(all(r["exit_code"] == 0 for r in results))
+        self.assertEqual(results[0]["argv"][-1], "Queue one")
+        self.assertIn("First task", results[3]["stdout"])
+
+    def test_failures_reported_per_command(self):
+        commands = "task show --id missing-1\ntask frobnicate\n[1, 2]\nqueue list\n"
+        result, results = self.run_batch(commands)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual([r["exit_code"] for r in results], [1, 2, 2, 0])
+        self.assertIn("not found", results[0]["stderr"])
+        self.assertIn("invalid choice", results[1]["stderr"])
+        self.assertIsNone(results[2]["argv"])
+
+    def test_global_options_rejected_per_line(self):
+        other = Path(self.test_dir) / "other"
+        commands = (
+            f"--tasks-root {other} queue add --name q --title Q --description d\n"
+            "--durability none queue list\n"
+            "queue list\n"
+        )
+        result, results = self.run_batch(commands)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual([r["exit_code"] for r in results], [2, 2, 0])
+        self.assertIn("whole batch", results[0]["stderr"])
+        self.assertIn("--durability", results[1]["stderr"])
+        self.assertFalse(other.exists())
+        self.assertFalse((self.tasks_root / "q").exists())
+
+    def test_stop_on_error(self):
+        commands = "task show --id missing-1\nqueue list\n"
+        result, results = self.run_batch(commands, "--stop-on-error")
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(len(results), 1)
+
+    def test_atomic_failure_discards_updates(self):
+        setup = "queue add --name q --title Q --description d\ntask add --title T --description d --queue q\n"
+        self.run_batch(setup)
+        commands = "task comment add --id q-1 --comment hello\ntask show --id missing-1\n"
+        result, results = self.run_batch(commands, "--atomic")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("discarded", result.stderr)
+        data = json.loads((self.tasks_root / "q" / "q-1.json").read_text())
+        self.assertEqual(data["comments"], [])
+
+        result, _ = self.run_batch("task comment add --id q-1 --comment hello\n", "--atomic")
+        self.assertEqual(result.returncode, 0)
+        data = json.loads((self.tasks_root / "q" / "q-1.json").read_text())
+        self.assertEqual(len(data["comments"]), 1)
+
+    def test_parse_batch_line(self):
+        self.assertIsNone(parse_batch_line("   "))
+        self.assertEqual(parse_batch_line("task show --id 'a b'"), ["task", "show", "--id", "a b"])
+        self.assertEqual(parse_batch_line('{"argv": ["verify"]}'), ["verify"])
+        with self.assertRaises(ValueError):
+            parse_batch_line('{"cmd": "verify"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
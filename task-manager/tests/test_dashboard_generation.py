@@ -1,3 +1,4 @@
+import json
 import tempfile
 import unittest
 from pathlib import Path
@@ -28,3 +29,128 @@ class TestDashboardGeneration(unittest.TestCase):
         self.assertTrue(out_path.exists())
         html = out_path.read_text(encoding="utf-8")
         self.assertIn("Title", html)
+
+    def test_incremental_regeneration(self) -> None:
+        self.tm.queue_add("a", "A", "desc")
+        self.tm.queue_add("b", "B", "desc")
+        a_id = self.tm.task_add("Task A", "Desc", "a")
+        self.tm.task_add("Task B", "Desc", "b")
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        cache = self.output.parent / ".index.html.cache"
+        stamps = {p.name: p.stat().st_mtime_ns for p in [self.output, *cache.iterdir()]}
+
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        self.assertEqual(
+            {p.name: p.stat().st_mtime_ns for p in [self.output, *cache.iterdir()]}, stamps
+        )
+
+        self.tm.task_update(a_id, "title", "Renamed A")
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        self.assertNotEqual(self.output.stat().st_mtime_ns, stamps["index.html"])
+        self.assertNotEqual((cache / "a.html").stat().st_mtime_ns, stamps["a.html"])
+        self.assertEqual((cache / "b.html").stat().st_mtime_ns, stamps["b.html"])
+        html = self.output.read_text(encoding="utf-8")
+        self.assertIn("Renamed A", html)
+        self.assertIn("Task B", html)
+
+        self.tm.queue_delete("b")
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        self.assertNotIn("Task B", self.output.read_text(encoding="utf-8"))
+        self.assertFalse((cache / "b.html").exists())
+
+    def test_output_replaced_by_other_modes_is_rewritten(self) -> None:
+        self.tm.queue_add("a", "A", "desc")
+        self.tm.task_add("Task A", "Desc", "a")
+        cache = self.output.parent / ".index.html.cache"
+        generate_dashboard(str(self.tasks_root), str(self.output))
+
+        generate_dashboard(str(self.tasks_root), str(self.output), virtual=True)
+        self.assertFalse(cache.exists())
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        self.assertEqual(self.output.read_text(encoding="utf-8").count("<tr><td>a-"), 1)
+
+        generate_dashboard(str(self.tasks_root), str(self.output), page_size=1)
+        self.assertFalse(cache.exists())
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        self.assertEqual(self.output.read_text(encoding="utf-8").count("<tr><td>a-"), 1)
+
+        # A checkout replacing the file leaves the cache in place.
+        self.output.write_text("stale", encoding="utf-8")
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        self.assertEqual(self.output.read_text(encoding="utf-8").count("<tr><td>a-"), 1)
+
+    def test_virtual_dashboard(self) -> None:
+        self.tm.queue_add("a", "A", "desc")
+        self.tm.queue_add("b", "B", "desc")
+        a_id = self.tm.task_add("Task <A>", "Desc", "a")
+        b_id = self.tm.task_add("Task B", "Desc", "b")
+        self.tm.task_done(b_id)
+
+        page = generate_dashboard(str(self.tasks_root), str(self.output), virtual=True)
+        shell = page.read_text(encoding="utf-8")
+        self.assertIn('fetch("index.data.json")', shell)
+        self.assertNotIn("Task", shell.split("<script>")[0].replace("Task Dashboard", ""))
+
+        data = json.loads((self.output.parent / "index.data.json").read_text())
+        self.assertEqual(data["id"], [a_id, b_id])
+        self.assertEqual(data["title"], ["Task <A>", "Task B"])
+        self.assertEqual([data["statuses"][s] for s in data["status"]], ["todo", "done"])
+        self.assertEqual([data["queues"][q] for q in data["queue"]], ["a", "b"])
+
+    def test_virtual_dashboard_quotes_data_url(self) -> None:
+        output = self.output.with_name("it's.html")
+        page = generate_dashboard(str(self.tasks_root), str(output), virtual=True)
+        self.assertIn('fetch("it\'s.data.json")', page.read_text(encoding="utf-8"))
+
+    def test_paginated_dashboard(self) -> None:
+        self.tm.queue_add("a", "A", "desc")
+        self.tm.queue_add("b", "B", "desc")
+        for i in range(5):
+            self.tm.task_add(f"Task A{i}", "Desc", "a")
+        self.tm.task_add("Task B0", "Desc", "b")
+
+        index = generate_dashboard(
+            str(self.tasks_root), str(self.output), page_size=2, split_queues=True
+        ).read_text(encoding="utf-8")
+        site = self.output.parent
+        pages = sorted(p.name for p in site.glob("index-*.html"))
+        self.assertEqual(pages, ["index-a-1.html", "index-a-2.html", "index-a-3.html", "index-b-1.html"])
+        for name in pages:
+            self.assertIn(f"href='{name}'", index)
+        second = (site / "index-a-2.html").read_text(encoding="utf-8")
+        self.assertEqual(second.count("<tr><td>a-"), 2)
+        self.assertIn("href='index-a-1.html'>Previous", second)
+        self.assertIn("href='index-a-3.html'>Next", second)
+        self.assertNotIn("Next", (site / "index-a-3.html").read_text(encoding="utf-8"))
+
+        generate_dashboard(str(self.tasks_root), str(self.output), page_size=10)
+        self.assertEqual(sorted(p.name for p in site.glob("index-*.html")), ["index-1.html"])
+        self.assertEqual(
+            (site / "index-1.html").read_text(encoding="utf-8").count("<tr><td>"), 6
+        )
+
+    def test_stale_pages_removed_in_every_mode(self) -> None:
+        self.tm.queue_add("a", "A", "desc")
+        for i in range(3):
+            self.tm.task_add(f"Task A{i}", "Desc", "a")
+        site = self.output.parent
+        site.mkdir(parents=True)
+        (site / "index-old.html").write_text("kept", encoding="utf-8")
+
+        generate_dashboard(str(self.tasks_root), str(self.output), page_size=1)
+        self.assertEqual(
+            sorted(p.name for p in site.glob("index-*.html")),
+            ["index-1.html", "index-2.html", "index-3.html", "index-old.html"],
+        )
+        generate_dashboard(str(self.tasks_root), str(self.output), page_size=2)
+        self.assertEqual(
+            sorted(p.name for p in site.glob("index-*.html")),
+            ["index-1.html", "index-2.html", "index-old.html"],
+        )
+        generate_dashboard(str(self.tasks_root), str(self.output))
+        self.assertEqual(sorted(p.name for p in site.glob("index-*.html")), ["index-old.html"])
+        self.assertFalse((site / ".index.html.pages.json").exists())
+
+        generate_dashboard(str(self.tasks_root), str(self.output), page_size=2)
+        generate_dashboard(str(self.tasks_root), str(self.output), virtual=True)
+        self.assertEqual(sorted(p.name for p in site.glob("index-*.html")), ["index-old.html"])
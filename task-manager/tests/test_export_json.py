@@ -1,10 +1,13 @@
+import gzip
+import io
 import json
 import tempfile
 import unittest
 from pathlib import Path
+from typing import Any, Dict, List
 from unittest.mock import patch
 
-from task_manager.export_json import export_tasks_json
+from task_manager.export_json import export_tasks_json, write_items
 from task_manager.core import TaskManager
 
 
@@ -32,6 +35,70 @@ class TestExportJson(unittest.TestCase):
         self.assertIn(local_task_id, ids)
         self.assertIn("REMOTE-1", ids)
 
+    def test_export_ndjson(self) -> None:
+        self.tm.queue_add("q", "Queue", "Desc")
+        ids = [self.tm.task_add(f"Task {i}", "Desc", "q") for i in range(3)]
+
+        path = export_tasks_json(str(self.tasks_root), str(self.output), fmt="ndjson")
+
+        lines = Path(path).read_text().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], ids)
+        self.assertEqual(list(self.tmpdir_files()), ["out.json"])
+
+    def test_streamed_array_matches_json_dumps(self) -> None:
+        items: List[Dict[str, Any]] = [
+            {"id": "a", "tags": ["x", "y"], "nested": {"k": 1}},
+            {"id": "b"},
+        ]
+        for data in ([], items):
+            out = io.StringIO()
+            self.assertEqual(write_items(out, iter(data)), len(data))
+            self.assertEqual(out.getvalue(), json.dumps(data, indent=2))
+
+    def test_invalid_format(self) -> None:
+        with self.assertRaises(ValueError):
+            export_tasks_json(str(self.tasks_root), str(self.output), fmt="xml")
+        self.assertFalse(self.output.exists())
+
+    def test_gzip_variant(self) -> None:
+        self.tm.queue_add("q", "Queue", "Desc")
+        self.tm.task_add("Title", "Desc", "q")
+        path = export_tasks_json(str(self.tasks_root), str(self.output), compress=["gzip"])
+        self.assertEqual(path, self.output)
+        compressed = Path(f"{self.output}.gz").read_bytes()
+        self.assertEqual(gzip.decompress(compressed), self.output.read_bytes())
+
+    def test_hashed_output_and_pointer(self) -> None:
+        self.tm.queue_add("q", "Queue", "Desc")
+        task_id = self.tm.task_add("Title", "Desc", "q")
+        names = []
+        for title in ("One", "Two", "Three"):
+            self.tm.task_update(task_id, "title", title)
+            pointer_path = export_tasks_json(
+                str(self.tasks_root), str(self.output), compress=["gzip"], hashed=True
+            )
+            pointer = json.loads(pointer_path.read_text())
+            names.append(pointer["file"])
+
+        self.assertEqual(pointer_path.name, "out.latest.json")
+        data = (Path(self.tmpdir) / pointer["file"]).read_bytes()
+        self.assertEqual(json.loads(data)[0]["title"], "Three")
+        self.assertEqual(pointer["size"], len(data))
+        self.assertEqual(pointer["encodings"], {"gzip": pointer["file"] + ".gz"})
+        # The previous export is kept for clients holding the old pointer.
+        self.assertEqual(
+            self.tmpdir_files(),
+            sorted([names[1], names[1] + ".gz", names[2], names[2] + ".gz", "out.latest.json"]),
+        )
+
+    def test_brotli_skipped_when_unavailable(self) -> None:
+        with patch("task_manager.export_json.brotli", None):
+            export_tasks_json(str(self.tasks_root), str(self.output), compress=["br"])
+        self.assertEqual(self.tmpdir_files(), ["out.json"])
+
+    def tmpdir_files(self) -> List[str]:
+        return sorted(p.name for p in Path(self.tmpdir).iterdir() if p.is_file())
+
 
 if __name__ == "__main__":
     unittest.main()
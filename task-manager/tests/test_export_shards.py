@@ -0,0 +1,98 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import patch
+
+from task_manager import StorageError, storage
+from task_manager.core import BATCH_JOURNAL_FILE, TaskManager
+from task_manager.export_shards import ShardExport, export_shards
+
+
+class TestExportShards(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.tasks_root = Path(self.tmpdir) / "tasks"
+        self.epics_root = Path(self.tmpdir) / "epics"
+        self.output = Path(self.tmpdir) / "export"
+        self.tm = TaskManager(str(self.tasks_root), str(self.epics_root))
+        self.tm.queue_add("a", "A", "d")
+        self.tm.queue_add("b", "B", "d")
+        self.a_ids = [self.tm.task_add(f"A{i}", "d", "a") for i in range(3)]
+        self.b_ids = [self.tm.task_add(f"B{i}", "d", "b") for i in range(2)]
+        self.epic_id = self.tm.epic_add("Epic", "d")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def export(self, **kwargs: Any) -> ShardExport:
+        return export_shards(
+            str(self.tasks_root), str(self.epics_root), str(self.output), **kwargs
+        )
+
+    def manifest(self) -> dict:
+        return json.loads((self.output / "manifest.json").read_text())
+
+    def test_per_queue_shards(self) -> None:
+        result = self.export()
+        self.assertEqual(result.written, ["epics.json", "tasks/a.json", "tasks/b.json"])
+        shard = json.loads((self.output / "tasks/a.json").read_text())
+        self.assertEqual([t["id"] for t in shard], self.a_ids)
+        self.assertEqual(self.manifest()["shards"]["tasks/b.json"]["count"], 2)
+
+    def test_rerun_rewrites_only_changed_shards(self) -> None:
+        self.export()
+        manifest_mtime = (self.output / "manifest.json").stat().st_mtime_ns
+        before = self.manifest()["shards"]
+
+        result = self.export()
+        self.assertEqual(result.written, [])
+        self.assertEqual((self.output / "manifest.json").stat().st_mtime_ns, manifest_mtime)
+
+        self.tm.task_update(self.b_ids[0], "title", "Changed")
+        result = self.export()
+        self.assertEqual(result.written, ["tasks/b.json"])
+        after = self.manifest()["shards"]
+        self.assertEqual(after["tasks/a.json"], before["tasks/a.json"])
+        self.assertNotEqual(after["tasks/b.json"]["hash"], before["tasks/b.json"]["hash"])
+
+    def test_removed_queue_deletes_shard(self) -> None:
+        self.export()
+        self.tm.queue_delete("b")
+        result = self.export()
+        self.assertEqual(result.removed, ["tasks/b.json"])
+        self.assertFalse((self.output / "tasks/b.json").exists())
+        self.assertNotIn("tasks/b.json", self.manifest()["shards"])
+
+    def test_hash_buckets(self) -> None:
+        self.export(buckets=4, fmt="ndjson")
+        ids: List[str] = []
+        for name, entry in self.manifest()["shards"].items():
+            lines = (self.output / name).read_text().splitlines()
+            self.assertEqual(len(lines), entry["count"])
+            ids.extend(json.loads(line)["id"] for line in lines)
+        self.assertEqual(sorted(ids), sorted(self.a_ids + self.b_ids + [self.epic_id]))
+
+    def test_missing_roots_are_not_created(self) -> None:
+        tasks_root = Path(self.tmpdir) / "missing-tasks"
+        epics_root = Path(self.tmpdir) / "missing-epics"
+        result = export_shards(str(tasks_root), str(epics_root), str(self.output))
+        self.assertEqual(result.written, [])
+        self.assertFalse(tasks_root.exists())
+        self.assertFalse(epics_root.exists())
+
+    def test_interrupted_batch_is_replayed(self) -> None:
+        with patch.object(storage, "replay_journal", return_value=False):
+            with self.assertRaises(StorageError):
+                with self.tm.batch():
+                    self.tm.task_update(self.a_ids[0], "title", "Batched")
+        self.export()
+        shard = json.loads((self.output / "tasks/a.json").read_text())
+        self.assertEqual(shard[0]["title"], "Batched")
+        self.assertFalse((self.tasks_root / BATCH_JOURNAL_FILE).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
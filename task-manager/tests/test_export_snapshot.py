@@ -0,0 +1,59 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from task_manager.core import TaskManager
+from task_manager.export_snapshot import export_snapshot
+
+
+class TestExportSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.tasks_root = Path(self.tmpdir) / "tasks"
+        self.epics_root = Path(self.tmpdir) / "epics"
+        self.output = Path(self.tmpdir) / "snapshot.json"
+        self.tm = TaskManager(str(self.tasks_root), str(self.epics_root))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def test_snapshot_joins_tasks_and_epics(self) -> None:
+        self.tm.queue_add("q", "Q", "d")
+        t1 = self.tm.task_add("One", "d", "q")
+        t2 = self.tm.task_add("Two", "d", "q")
+        t3 = self.tm.task_add("Three", "d", "q")
+        root = self.tm.epic_add("Root", "d")
+        child = self.tm.epic_add("Child", "d")
+        self.tm.epic_add_epic(root, child)
+        self.tm.epic_add_task(root, t1)
+        self.tm.epic_add_task(child, t2)
+        self.tm.epic_add_task(child, t3)
+        self.tm.task_done(t2)
+
+        data = json.loads(export_snapshot(
+            str(self.tasks_root), str(self.epics_root), str(self.output)
+        ).read_text())
+
+        epics = {e["id"]: e for e in data["epics"]}
+        self.assertEqual(epics[root]["progress"], {"total": 3, "done": 1, "complete": False})
+        self.assertEqual(epics[child]["progress"], {"total": 2, "done": 1, "complete": False})
+        self.assertEqual(epics[child]["parents"], [root])
+        self.assertEqual(epics[root]["parents"], [])
+
+        tasks = {t["id"]: t for t in data["tasks"]}
+        self.assertEqual([t["id"] for t in data["tasks"]], [t1, t2, t3])
+        self.assertEqual(tasks[t1]["epic_chain"], [root])
+        self.assertEqual(tasks[t2]["epic_chain"], [child, root])
+        self.assertEqual(tasks[t2]["queue"], "q")
+
+    def test_empty_snapshot(self) -> None:
+        data = json.loads(export_snapshot(
+            str(self.tasks_root), str(self.epics_root), str(self.output)
+        ).read_text())
+        self.assertEqual((data["tasks"], data["epics"]), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,48 +1,376 @@
-import io
+import hashlib
 import json
+import shutil
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from task_manager.github_api import fetch_github_tasks
+from task_manager.github_api import (
+    FetchStats,
+    GitHubClient,
+    RateLimiter,
+    fetch_github_tasks,
+    fetch_github_tree,
+)
+
+
+class StubGitHub:
+    """Local stand-in for the GitHub API serving canned JSON routes."""
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, Any] = {}
+        self.delays: Dict[str, float] = {}
+        # Error responses served, in order, before a route answers normally.
+        self.errors: Dict[str, List[Tuple[int, Dict[str, str]]]] = {}
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def do_GET(self) -> None:
+                with stub.lock:
+                    stub.requests.append((self.path, dict(self.headers)))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delays.get(self.path, 0))
+                    with stub.lock:
+                        errors = stub.errors.get(self.path)
+                        error = errors.pop(0) if errors else None
+                    if error is not None:
+                        self.send_response(error[0])
+                        for name, value in error[1].items():
+                            self.send_header(name, value)
+                        self.send_header("Content-Length", "2")
+                        self.end_headers()
+                        self.wfile.write(b"{}")
+                        return
+                    body = stub.routes.get(self.path)
+                    status = 200 if body is not None else 404
+                    data = json.dumps(body).encode() if body is not None else b"{}"
+                    etag = '"%s"' % hashlib.sha1(data).hexdigest()
+                    if status == 200 and self.headers.get("If-None-Match") == etag:
+                        status, data = 304, b""
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    if status != 404:
+                        self.send_header("ETag", etag)
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StubGitHub":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_repo(self, repo: str, tasks: list) -> None:
+        listing: List[Dict[str, Any]] = []
+        for task in tasks:
+            name = f"{task['id']}.json"
+            path = f"/raw/{repo}/{name}"
+            sha = hashlib.sha1(json.dumps(task).encode()).hexdigest()
+            listing.append(
+                {"name": name, "type": "file", "sha": sha, "download_url": self.base + path}
+            )
+            self.routes[path] = task
+        listing.append({"name": "queue", "type": "dir", "download_url": None})
+        self.routes[f"/repos/{repo}/contents/.tasks"] = listing
+
+    def add_tree(self, repo: str, files: Dict[str, Any], truncated: bool = False) -> None:
+        """Serve ``files`` (path -> JSON data) through the git trees API.
+
+        Every directory is also served on its own. With ``truncated`` the
+        recursive listing only holds its first entry.
+        """
+        tree = []
+        dirs: Dict[str, List[Dict[str, str]]] = {"": []}
+        for path in sorted(files):
+            content = json.dumps(files[path]).encode()
+            sha = hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+            tree.append({"path": path, "type": "blob", "sha": sha})
+            self.routes[f"/repos/{repo}/git/blobs/{sha}"] = files[path]
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                directory = "/".join(parts[:depth])
+                entry = {"path": parts[depth - 1], "type": "tree", "sha": self.tree_sha(directory)}
+                siblings = dirs.setdefault("/".join(parts[: depth - 1]), [])
+                if entry not in siblings:
+                    siblings.append(entry)
+            dirs.setdefault("/".join(parts[:-1]), []).append(
+                {"path": parts[-1], "type": "blob", "sha": sha}
+            )
+        for path, entries in dirs.items():
+            ref = self.tree_sha(path) if path else "HEAD"
+            self.routes[f"/repos/{repo}/git/trees/{ref}"] = {"tree": entries, "truncated": False}
+        tree.append({"path": ".tasks/q", "type": "tree", "sha": "0" * 40})
+        if truncated:
+            tree = tree[:1]
+        self.routes[f"/repos/{repo}/git/trees/HEAD?recursive=1"] = {"tree": tree, "truncated": truncated}
+
+    @staticmethod
+    def tree_sha(path: str) -> str:
+        return hashlib.sha1(path.encode()).hexdigest()
+
+    def blob_requests(self) -> List[str]:
+        return [path for path, _ in self.requests if "/git/blobs/" in path]
+
+    def downloads(self) -> List[str]:
+        """Return requests answered with a full body."""
+        return [path for path, headers in self.requests if "If-None-Match" not in headers]
 
 
 class TestGitHubAPI(unittest.TestCase):
     def test_fetch_github_tasks(self) -> None:
         repo = "owner/repo"
-        dir_listing = [
-            {
-                "name": "DEV-1.json",
-                "type": "file",
-                "download_url": "https://example.com/DEV-1.json",
-            }
-        ]
         task_data = {"id": "DEV-1", "title": "Remote task", "description": "Desc"}
+        with StubGitHub() as stub:
+            stub.add_repo(repo, [task_data])
+            tasks = fetch_github_tasks([repo], api_base=f"{stub.base}/repos", mode="contents")
+        self.assertEqual(len(tasks), 1)
+        self.assertEqual(tasks[0]["id"], "DEV-1")
 
-        class FakeResponse(io.BytesIO):
-            def __enter__(self):
-                return self
+    def test_results_keep_repo_and_listing_order(self) -> None:
+        with StubGitHub() as stub:
+            stub.add_repo("a/one", [{"id": f"A-{i}"} for i in range(5)])
+            stub.add_repo("b/two", [{"id": f"B-{i}"} for i in range(5)])
+            # Earlier files answer last.
+            for i in range(5):
+                stub.delays[f"/raw/a/one/A-{i}.json"] = 0.05 * (5 - i)
+            tasks = fetch_github_tasks(
+                ["a/one", "missing/repo", "b/two"], api_base=f"{stub.base}/repos", mode="contents"
+            )
+        self.assertEqual(
+            [t["id"] for t in tasks], [f"A-{i}" for i in range(5)] + [f"B-{i}" for i in range(5)]
+        )
 
-            def __exit__(self, *args):
-                return False
+    def test_concurrency_limit_and_connection_reuse(self) -> None:
+        with StubGitHub() as stub:
+            stub.add_repo("o/r", [{"id": f"T-{i}"} for i in range(40)])
+            for i in range(40):
+                stub.delays[f"/raw/o/r/T-{i}.json"] = 0.01
+            tasks = fetch_github_tasks(
+                ["o/r"], max_workers=4, api_base=f"{stub.base}/repos", mode="contents"
+            )
+        self.assertEqual(len(tasks), 40)
+        self.assertLessEqual(stub.max_in_flight, 4)
+        self.assertGreater(stub.max_in_flight, 1)
+        self.assertLessEqual(stub.connections, 4)
 
-        def fake_urlopen(request):
-            url = request.full_url if hasattr(request, "full_url") else request.get_full_url()
-            if url == f"https://api.github.com/repos/{repo}/contents/.tasks":
-                return FakeResponse(json.dumps(dir_listing).encode())
-            if url == dir_listing[0]["download_url"]:
-                return FakeResponse(json.dumps(task_data).encode())
-            raise RuntimeError("Unexpected URL")
+    def test_slow_requests_time_out(self) -> None:
+        with StubGitHub() as stub:
+            stub.add_repo("o/r", [{"id": "FAST-1"}, {"id": "SLOW-1"}])
+            stub.delays["/raw/o/r/SLOW-1.json"] = 2
+            start = time.monotonic()
+            tasks = fetch_github_tasks(
+                ["o/r"], timeout=0.2, api_base=f"{stub.base}/repos", mode="contents"
+            )
+            elapsed = time.monotonic() - start
+        self.assertEqual([t["id"] for t in tasks], ["FAST-1"])
+        self.assertLess(elapsed, 1.5)
 
-        with patch("task_manager.github_api.urlopen", side_effect=fake_urlopen):
-            tasks = fetch_github_tasks([repo])
-        self.assertEqual(len(tasks), 1)
-        self.assertEqual(tasks[0]["id"], "DEV-1")
+    def test_token_sent_as_authorization(self) -> None:
+        with StubGitHub() as stub:
+            stub.routes["/x"] = {"ok": True}
+            with GitHubClient(token="secret") as client:
+                self.assertEqual(client.get_json(f"{stub.base}/x"), {"ok": True})
+        self.assertEqual(stub.requests[0][1]["Authorization"], "token secret")
+
+    def test_tree_mode_reads_queues_and_epics(self) -> None:
+        files = {
+            ".tasks/a/a-1.json": {"id": "a-1"},
+            ".tasks/a/meta.json": {"title": "A"},
+            ".tasks/b/b-1.json": {"id": "b-1"},
+            ".tasks/LEGACY-1.json": {"id": "LEGACY-1"},
+            ".epics/epic-1.json": {"id": "epic-1"},
+            ".epics/.meta": {"next_id": 2},
+            "README.json": {"id": "other"},
+        }
+        with StubGitHub() as stub:
+            stub.add_tree("o/r", files)
+            data = fetch_github_tree(["o/r"], api_base=f"{stub.base}/repos")
+            tasks = fetch_github_tasks(["o/r"], api_base=f"{stub.base}/repos")
+        self.assertEqual([t["id"] for t in data["tasks"]], ["LEGACY-1", "a-1", "b-1"])
+        self.assertEqual([e["id"] for e in data["epics"]], ["epic-1"])
+        self.assertEqual(tasks, data["tasks"])
+        self.assertEqual(stub.requests[0][1]["Accept"], "application/vnd.github+json")
+
+    def test_truncated_tree_is_listed_per_directory(self) -> None:
+        files = {
+            ".tasks/a/a-1.json": {"id": "a-1"},
+            ".tasks/b/b-1.json": {"id": "b-1"},
+            ".tasks/LEGACY-1.json": {"id": "LEGACY-1"},
+            ".epics/epic-1.json": {"id": "epic-1"},
+            "src/big/file.json": {"id": "other"},
+        }
+        stats = FetchStats()
+        with StubGitHub() as stub:
+            stub.add_tree("o/r", files, truncated=True)
+            data = fetch_github_tree(["o/r"], api_base=f"{stub.base}/repos", stats=stats)
+        self.assertEqual([t["id"] for t in data["tasks"]], ["LEGACY-1", "a-1", "b-1"])
+        self.assertEqual([e["id"] for e in data["epics"]], ["epic-1"])
+        self.assertFalse(stats.partial)
+        listed = [path for path, _ in stub.requests if "/git/trees/" in path]
+        self.assertNotIn(f"/repos/o/r/git/trees/{stub.tree_sha('src')}", listed)
+
+    def test_truncated_subtree_is_reported(self) -> None:
+        stats = FetchStats()
+        with StubGitHub() as stub:
+            stub.add_tree("o/r", {".tasks/a/a-1.json": {"id": "a-1"}}, truncated=True)
+            stub.routes[f"/repos/o/r/git/trees/{stub.tree_sha('.tasks/a')}"]["truncated"] = True
+            data = fetch_github_tree(["o/r"], api_base=f"{stub.base}/repos", stats=stats)
+        self.assertEqual([t["id"] for t in data["tasks"]], ["a-1"])
+        self.assertTrue(stats.partial)
+        self.assertEqual(stats.failures[0][1], "truncated tree")
+
+    def test_tree_mode_fetches_only_changed_blobs(self) -> None:
+        files = {f".tasks/q/q-{i}.json": {"id": f"q-{i}", "status": "todo"} for i in range(5)}
+        blobs: Dict[str, Any] = {}
+        with StubGitHub() as stub:
+            stub.add_tree("o/r", files)
+            fetch_github_tree(["o/r"], api_base=f"{stub.base}/repos", blobs=blobs)
+            self.assertEqual(len(stub.blob_requests()), 5)
+
+            files[".tasks/q/q-2.json"] = {"id": "q-2", "status": "done"}
+            stub.add_tree("o/r", files)
+            data = fetch_github_tree(["o/r"], api_base=f"{stub.base}/repos", blobs=blobs)
+        self.assertEqual(len(stub.blob_requests()), 6)
+        self.assertEqual(data["tasks"][2]["status"], "done")
+
+
+class TestGitHubRateLimits(unittest.TestCase):
+    def client(self, **kwargs: Any) -> GitHubClient:
+        kwargs.setdefault("backoff", 0.01)
+        return GitHubClient(limiter=RateLimiter(rate=0), **kwargs)
+
+    def test_server_errors_are_retried(self) -> None:
+        with StubGitHub() as stub:
+            stub.routes["/x"] = {"ok": True}
+            stub.errors["/x"] = [(503, {}), (502, {})]
+            with self.client() as client:
+                self.assertEqual(client.get_json(f"{stub.base}/x"), {"ok": True})
+        self.assertEqual(client.stats.retries, 2)
+        self.assertEqual(client.stats.requests, 3)
+        self.assertFalse(client.stats.partial)
+
+    def test_retry_after_is_honoured(self) -> None:
+        with StubGitHub() as stub:
+            stub.routes["/x"] = {"ok": True}
+            stub.errors["/x"] = [(429, {"Retry-After": "0.3"})]
+            start = time.monotonic()
+            with self.client() as client:
+                self.assertEqual(client.get_json(f"{stub.base}/x"), {"ok": True})
+            elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 0.3)
+
+    def test_exhausted_rate_limit_is_reported(self) -> None:
+        reset = str(int(time.time()) + 3600)
+        limited = (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})
+        stats = FetchStats()
+        with StubGitHub() as stub:
+            stub.add_repo("o/r", [{"id": "T-1"}, {"id": "T-2"}])
+            stub.errors["/raw/o/r/T-2.json"] = [limited]
+            tasks = fetch_github_tasks(
+                ["o/r"], api_base=f"{stub.base}/repos", mode="contents", stats=stats
+            )
+        self.assertEqual([t["id"] for t in tasks], ["T-1"])
+        self.assertTrue(stats.partial)
+        self.assertEqual(stats.failures, [(f"{stub.base}/raw/o/r/T-2.json", "HTTP 403")])
+        self.assertEqual(stats.retries, 0)
+
+    def test_giving_up_after_max_retries(self) -> None:
+        with StubGitHub() as stub:
+            stub.routes["/x"] = {"ok": True}
+            stub.errors["/x"] = [(500, {})] * 5
+            with self.client(max_retries=2) as client:
+                self.assertIsNone(client.get_json(f"{stub.base}/x"))
+        self.assertEqual(client.stats.requests, 3)
+        self.assertEqual(client.stats.failures, [(f"{stub.base}/x", "HTTP 500")])
+
+    def test_token_bucket_paces_requests(self) -> None:
+        now = [0.0]
+
+        def sleep(seconds: float) -> None:
+            now[0] += seconds
+
+        limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(6):
+            limiter.acquire()
+        # Two requests burst at once, the other four are spaced 0.5s apart.
+        self.assertAlmostEqual(now[0], 2.0)
+        limiter.pause(5)
+        limiter.acquire()
+        self.assertAlmostEqual(now[0], 7.0)
+
+
+class TestGitHubCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def test_tree_mode_repeat_run_downloads_nothing(self) -> None:
+        files = {f".tasks/q/q-{i}.json": {"id": f"q-{i}"} for i in range(5)}
+        with StubGitHub() as stub:
+            stub.add_tree("o/r", files)
+            api_base = f"{stub.base}/repos"
+            first = fetch_github_tasks(["o/r"], api_base=api_base, cache_dir=self.cache_dir)
+            self.assertEqual(len(stub.downloads()), 6)
+
+            stub.requests.clear()
+            second = fetch_github_tasks(["o/r"], api_base=api_base, cache_dir=self.cache_dir)
+        self.assertEqual(second, first)
+        self.assertEqual(stub.downloads(), [])
+        self.assertEqual(len(stub.requests), 1)
+
+    def test_contents_mode_skips_cached_blobs(self) -> None:
+        with StubGitHub() as stub:
+            stub.add_repo("o/r", [{"id": f"T-{i}"} for i in range(3)])
+            api_base = f"{stub.base}/repos"
+            fetch_github_tasks(["o/r"], api_base=api_base, mode="contents", cache_dir=self.cache_dir)
+
+            stub.add_repo("o/r", [{"id": "T-0"}, {"id": "T-1", "status": "done"}, {"id": "T-2"}])
+            stub.requests.clear()
+            tasks = fetch_github_tasks(
+                ["o/r"], api_base=api_base, mode="contents", cache_dir=self.cache_dir
+            )
+        self.assertEqual(tasks[1]["status"], "done")
+        self.assertEqual(
+            [path for path, _ in stub.requests], ["/repos/o/r/contents/.tasks", "/raw/o/r/T-1.json"]
+        )
 
 
 if __name__ == "__main__":
     unittest.main()
-
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from task_manager.http_cache import HTTPCache
+
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = Path(self.tmpdir) / "cache"
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def _age(self, cache: HTTPCache, url: str, seconds: int) -> None:
+        path = cache._path("responses", url)
+        os.utime(path, (seconds, seconds))
+
+    def test_responses_and_blobs_round_trip(self) -> None:
+        cache = HTTPCache(self.root)
+        cache.put("https://x/a", '"etag-a"', '{"a": 1}')
+        cache.blobs["abc"] = {"id": "T-1"}
+
+        fresh = HTTPCache(self.root)
+        entry = fresh.get("https://x/a")
+        assert entry is not None
+        self.assertEqual(entry["etag"], '"etag-a"')
+        self.assertIsNone(fresh.get("https://x/b"))
+        self.assertIn("abc", fresh.blobs)
+        self.assertEqual(fresh.blobs["abc"], {"id": "T-1"})
+        self.assertEqual(list(fresh.blobs), ["abc"])
+
+    def test_least_recently_used_entries_evicted(self) -> None:
+        body = "x" * 1000
+        cache = HTTPCache(self.root, max_bytes=3500)
+        for i, name in enumerate(["a", "b", "c"]):
+            cache.put(f"https://x/{name}", "e", body)
+            self._age(cache, f"https://x/{name}", 1000 + i)
+        # Reading "a" makes "b" the least recently used entry.
+        self.assertIsNotNone(cache.get("https://x/a"))
+        cache.put("https://x/d", "e", body)
+
+        self.assertIsNone(cache.get("https://x/b"))
+        for name in ["a", "c", "d"]:
+            self.assertIsNotNone(cache.get(f"https://x/{name}"))
+
+
+if __name__ == "__main__":
+    unittest.main()
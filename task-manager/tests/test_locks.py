@@ -0,0 +1,119 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from task_manager import ConflictError, LockOrderError, TaskManager
+from task_manager.locks import LockManager
+
+
+class TestConcurrentWriters(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.tasks_root = str(Path(self.tmpdir) / "tasks")
+        self.epics_root = str(Path(self.tmpdir) / "epics")
+        self.tm = TaskManager(self.tasks_root, self.epics_root)
+        self.tm.queue_add("q", "Queue", "desc")
+        self.task_id = self.tm.task_add("T", "d", "q")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def _manager(self, **kwargs) -> TaskManager:
+        return TaskManager(self.tasks_root, self.epics_root, **kwargs)
+
+    def test_parallel_comments_are_not_lost(self) -> None:
+        def add_comments(n: int) -> None:
+            tm = self._manager()
+            for i in range(10):
+                tm.task_comment_add(self.task_id, f"{n}-{i}")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(add_comments, range(4)))
+        comments = self.tm.task_comment_list(self.task_id)
+        self.assertEqual(len(comments), 40)
+        self.assertEqual(len({c["id"] for c in comments}), 40)
+
+    def test_stale_task_save_raises_conflict(self) -> None:
+        tm = self._manager(check_conflicts=True)
+        stale = tm._load_task(self.task_id)
+        self._manager().task_update(self.task_id, "title", "Newer")
+        stale.title = "Older"
+        with self.assertRaises(ConflictError):
+            tm._save_task(stale)
+        self.assertEqual(self.tm.task_show(self.task_id)["title"], "Newer")
+
+    def test_stale_epic_save_raises_conflict(self) -> None:
+        epic_id = self.tm.epic_add("E", "d")
+        tm = self._manager(check_conflicts=True)
+        stale = tm._load_epic(epic_id)
+        self._manager().epic_update(epic_id, "title", "Newer")
+        with self.assertRaises(ConflictError):
+            tm._save_epic(stale)
+
+    def test_conflict_check_allows_normal_updates(self) -> None:
+        tm = self._manager(check_conflicts=True)
+        tm.task_update(self.task_id, "title", "One")
+        tm.task_done(self.task_id)
+        self.assertEqual(tm.task_show(self.task_id)["status"], "done")
+
+
+class TestLockManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def test_tree_lock_excludes_item_writers(self) -> None:
+        root = Path(self.tmpdir)
+        entered = threading.Event()
+
+        def writer() -> None:
+            with LockManager(root).hold("task:q-1"):
+                entered.set()
+
+        with LockManager(root).tree():
+            thread = threading.Thread(target=writer)
+            thread.start()
+            self.assertFalse(entered.wait(0.2))
+        thread.join(5)
+        self.assertTrue(entered.is_set())
+
+    def test_reentrant_hold(self) -> None:
+        locks = LockManager(Path(self.tmpdir))
+        with locks.hold("task:q-1", "task:q-2"):
+            with locks.hold("task:q-1"):
+                pass
+
+    def test_shared_tree_lock_is_not_upgraded(self) -> None:
+        locks = LockManager(Path(self.tmpdir))
+        with locks.hold("task:q-1"):
+            with self.assertRaises(LockOrderError):
+                with locks.tree():
+                    pass
+        with locks.tree():
+            with locks.tree(shared=True):
+                pass
+
+    def test_nested_hold_keeps_key_order(self) -> None:
+        locks = LockManager(Path(self.tmpdir), stripes=4)
+        keys = {locks._stripe(f"task:q-{i}"): f"task:q-{i}" for i in range(50)}
+        low, high = keys[min(keys)], keys[max(keys)]
+        with locks.hold(low):
+            with locks.hold(high):
+                pass
+        with locks.hold(high):
+            with self.assertRaises(LockOrderError):
+                with locks.hold(low):
+                    pass
+        with locks.tree():
+            with locks.hold(high):
+                with locks.hold(low):
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
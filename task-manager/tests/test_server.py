@@ -0,0 +1,131 @@
+"""
+Tests for the `serve` daemon and the CLI client forwarding to it.
+"""
+
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from task_manager.cli import build_parser, run_command
+from task_manager.client import forward, is_serving, socket_path
+from task_manager.core import TaskManager
+from task_manager.server import TaskServer
+from task_manager.storage import load_json, save_json
+
+
+class TestTaskServer(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.tasks_root = Path(self.test_dir) / "tasks"
+        self.epics_root = Path(self.test_dir) / "epics"
+        self.tm = TaskManager(str(self.tasks_root), str(self.epics_root))
+        parser = build_parser()
+        self.received = []
+
+        def run(argv):
+            self.received.append(argv)
+            return run_command(parser, argv, self.tm)
+
+        self.server = TaskServer(self.tm, run)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.stop_server()
+        shutil.rmtree(self.test_dir)
+
+    def stop_server(self):
+        if self.thread.is_alive():
+            self.server.shutdown()
+            self.thread.join()
+        self.server.server_close()
+
+    def test_commands_run_in_daemon(self):
+        self.assertTrue(is_serving(self.tasks_root))
+        response = forward(self.tasks_root, ["queue", "add", "--name", "q", "--title", "Q", "--description", "d"])
+        self.assertEqual(response["exit_code"], 0)
+        forward(self.tasks_root, ["task", "add", "--title", "Remote", "--description", "d", "--queue", "q"])
+
+        response = forward(self.tasks_root, ["task", "list"])
+        self.assertEqual(response["exit_code"], 0)
+        self.assertIn("Remote", response["stdout"])
+
+        response = forward(self.tasks_root, ["task", "show", "--id", "q-9"])
+        self.assertEqual(response["exit_code"], 1)
+        self.assertIn("not found", response["stderr"])
+
+    def test_changes_by_other_processes_are_seen(self):
+        forward(self.tasks_root, ["queue", "add", "--name", "q", "--title", "Q", "--description", "d"])
+        self.assertIn("No tasks found", forward(self.tasks_root, ["task", "list"])["stdout"])
+
+        other = TaskManager(str(self.tasks_root), str(self.epics_root))
+        task_id = other.task_add("Outside", "d", "q")
+        epic_id = other.epic_add("Epic", "d")
+        other.epic_add_task(epic_id, task_id)
+
+        self.assertIn("Outside", forward(self.tasks_root, ["task", "list"])["stdout"])
+        self.assertIn("Epic", forward(self.tasks_root, ["epic", "list"])["stdout"])
+        forward(self.tasks_root, ["task", "done", "--id", task_id])
+        self.assertEqual(other.epic_show(epic_id)["status"], "closed")
+
+    def test_queue_edits_by_other_processes_are_seen(self):
+        forward(self.tasks_root, ["queue", "add", "--name", "q", "--title", "Q", "--description", "d"])
+        self.assertIn("Q", forward(self.tasks_root, ["queue", "list"])["stdout"])
+
+        # Replaces meta.json, changing the queue directory but not the root.
+        meta = self.tasks_root / "q" / "meta.json"
+        save_json(meta, {**load_json(meta), "title": "Renamed"})
+        self.assertIn("Renamed", forward(self.tasks_root, ["queue", "list"])["stdout"])
+
+    def test_cli_forwards_to_daemon(self):
+        forward(self.tasks_root, ["queue", "add", "--name", "q", "--title", "Q", "--description", "d"])
+        cmd = [
+            "python",
+            str(Path(__file__).parent.parent / "task_manager.py"),
+            "--tasks-root",
+            str(self.tasks_root),
+            "task",
+            "add",
+            "--title",
+            "Via CLI",
+            "--description",
+            "d",
+            "--queue",
+            "q",
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.test_dir)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(self.received[-1], cmd[2:])
+        self.assertEqual([t["title"] for t in self.tm.task_list()], ["Via CLI"])
+
+    def test_cli_runs_in_process_without_daemon(self):
+        self.stop_server()
+        self.assertFalse(is_serving(self.tasks_root))
+
+        cmd = [
+            "python",
+            str(Path(__file__).parent.parent / "task_manager.py"),
+            "--tasks-root",
+            str(self.tasks_root),
+            "queue",
+            "list",
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.test_dir)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("No queues found", result.stdout)
+        self.assertEqual(self.received, [])
+
+    def test_invalid_request(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path(self.tasks_root)))
+            sock.sendall(b'{"argv": "task list"}\n')
+            data = sock.makefile("rb").readline()
+        self.assertIn(b"invalid request", data)
+
+
+if __name__ == "__main__":
+    unittest.main()
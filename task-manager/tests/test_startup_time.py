@@ -0,0 +1,68 @@
+"""
+Regression tests for CLI startup cost.
+"""
+
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+# Cumulative import time budget for the task_manager package, in microseconds.
+IMPORT_BUDGET_US = int(os.environ.get("TM_IMPORT_BUDGET_US", "300000"))
+
+HEAVY_MODULES = [
+    "textual",
+    "urllib.request",
+    "task_manager.tui",
+    "task_manager.dashboard",
+    "task_manager.github_api",
+]
+
+
+class TestStartupTime(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.task_manager_path = Path(__file__).parent.parent / "task_manager.py"
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.test_dir)
+
+    def import_times(self, *args):
+        """Run the CLI under ``-X importtime`` and return cumulative times by module."""
+        cmd = [
+            "python",
+            "-X",
+            "importtime",
+            str(self.task_manager_path),
+            "--tasks-root",
+            str(Path(self.test_dir) / "tasks"),
+            *args,
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.test_dir)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+        return times
+
+    def test_task_list_skips_heavy_imports(self):
+        times = self.import_times("task", "list")
+        self.assertIn("task_manager.core", times)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_task_list_import_budget(self):
+        # Run twice so the measured run uses compiled bytecode.
+        self.import_times("task", "list")
+        times = self.import_times("task", "list")
+        self.assertLess(times["task_manager"], IMPORT_BUDGET_US)
+
+
+if __name__ == "__main__":
+    unittest.main()
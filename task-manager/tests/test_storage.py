@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+from task_manager import storage
+from task_manager.storage import load_json, save_json
+
+
+class TestAtomicSave(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.path = self.tmpdir / "data.json"
+
+    def tearDown(self) -> None:
+        storage.set_durability("fsync")
+        shutil.rmtree(self.tmpdir)
+
+    def test_failed_write_keeps_original(self) -> None:
+        save_json(self.path, {"v": 1})
+        with self.assertRaises(TypeError):
+            save_json(self.path, {"v": object()})
+        self.assertEqual(load_json(self.path), {"v": 1})
+        self.assertEqual(os.listdir(self.tmpdir), ["data.json"])
+
+    def test_replace_failure_returns_false(self) -> None:
+        with patch("task_manager.storage.os.replace", side_effect=OSError("boom")):
+            self.assertFalse(save_json(self.path, {"v": 1}))
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_batch_mode_defers_fsync_to_flush(self) -> None:
+        storage.set_durability("batch")
+        with patch("task_manager.storage.os.fsync") as fsync:
+            save_json(self.path, {"v": 1})
+            save_json(self.path, {"v": 2})
+            fsync.assert_not_called()
+            storage.flush()
+        # One fsync for the file and one for its directory.
+        self.assertEqual(fsync.call_count, 2)
+        self.assertEqual(json.loads(self.path.read_text()), {"v": 2})
+
+    def test_fsync_mode_syncs_each_write(self) -> None:
+        with patch("task_manager.storage.os.fsync") as fsync:
+            save_json(self.path, {"v": 1})
+        self.assertEqual(fsync.call_count, 2)
+
+    def test_atomic_output_follows_durability(self) -> None:
+        out = self.tmpdir / "out.txt"
+        with patch("task_manager.storage.os.fsync") as fsync:
+            with storage.atomic_output(out) as f:
+                f.write("a")
+            self.assertEqual(fsync.call_count, 2)
+            with storage.atomic_output(out, durable=False) as f:
+                f.write("b")
+            self.assertEqual(fsync.call_count, 2)
+        self.assertEqual(out.read_text(), "b")
+
+    def test_concurrent_atomic_outputs_do_not_collide(self) -> None:
+        out = self.tmpdir / "out.bin"
+        entered = threading.Barrier(2)
+        errors: List[BaseException] = []
+
+        def write(data: bytes) -> None:
+            try:
+                with storage.atomic_binary_output(out) as f:
+                    f.write(data)
+                    entered.wait(5)
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(b * 1000,)) for b in (b"a", b"b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(errors, [])
+        self.assertIn(out.read_bytes(), (b"a" * 1000, b"b" * 1000))
+        self.assertEqual(os.listdir(self.tmpdir), ["out.bin"])
+
+    def test_invalid_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            storage.set_durability("sometimes")
+
+
+
+class TestBatchJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.journal = self.tmpdir / ".journal"
+        self.cwd = os.getcwd()
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def test_journal_replayed_from_another_directory(self) -> None:
+        os.chdir(self.tmpdir)
+        with patch.object(storage, "replay_journal", return_value=False):
+            self.assertFalse(
+                storage.save_json_batch({Path("a.json"): {"v": 1}}, Path(".journal"))
+            )
+        renames = json.loads(self.journal.read_text())["renames"]
+        self.assertTrue(all(os.path.isabs(p) for pair in renames for p in pair))
+
+        os.chdir(self.cwd)
+        self.assertTrue(storage.replay_journal(self.journal))
+        self.assertEqual(load_json(self.tmpdir / "a.json"), {"v": 1})
+        self.assertFalse(self.journal.exists())
+
+    def test_missing_temp_file_keeps_journal(self) -> None:
+        target = self.tmpdir / "a.json"
+        save_json(self.journal, {"renames": [[str(self.tmpdir / ".gone.tmp"), str(target)]]})
+        self.assertFalse(storage.replay_journal(self.journal))
+        self.assertTrue(self.journal.exists())
+
+        save_json(target, {"v": 1})
+        self.assertTrue(storage.replay_journal(self.journal))
+        self.assertFalse(self.journal.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
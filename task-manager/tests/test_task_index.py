@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from task_manager import index
+from task_manager.core import TaskManager
+from task_manager.index import INDEX_FILE
+
+
+class TestTaskIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.tasks_root = Path(self.tmpdir) / "tasks"
+        self.tm = TaskManager(str(self.tasks_root), str(Path(self.tmpdir) / "epics"))
+        self.tm.queue_add("q", "Queue", "desc")
+        self.t1 = self.tm.task_add("One", "d", "q")
+        self.t2 = self.tm.task_add("Two", "d", "q")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def _age(self, task_id: str) -> None:
+        """Push a task file's mtime into the past so its stamp is trusted."""
+        path = self.tasks_root / "q" / f"{task_id}.json"
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    def test_index_written_with_summaries(self) -> None:
+        tasks = self.tm.task_list()
+        self.assertEqual([t["id"] for t in tasks], [self.t1, self.t2])
+        self.assertEqual(
+            set(tasks[0]), {"id", "title", "status", "queue", "epics", "created_at"}
+        )
+        data = json.loads((self.tasks_root / INDEX_FILE).read_text())
+        self.assertIn(f"q/{self.t1}.json", data["entries"])
+
+    def test_unchanged_files_not_reread(self) -> None:
+        self._age(self.t1)
+        self._age(self.t2)
+        self.tm.task_list()
+
+        fresh = TaskManager(str(self.tasks_root), str(Path(self.tmpdir) / "epics"))
+        with patch.object(index, "load_json", wraps=index.load_json) as loader:
+            tasks = fresh.task_list()
+        read = [c.args[0].name for c in loader.call_args_list]
+        self.assertEqual(read, [INDEX_FILE])
+        self.assertEqual(len(tasks), 2)
+
+    def test_changed_and_deleted_files_detected(self) -> None:
+        self.tm.task_list()
+        path = self.tasks_root / "q" / f"{self.t1}.json"
+        data = json.loads(path.read_text())
+        data["status"] = "done"
+        path.write_text(json.dumps(data))
+        (self.tasks_root / "q" / f"{self.t2}.json").unlink()
+
+        fresh = TaskManager(str(self.tasks_root), str(Path(self.tmpdir) / "epics"))
+        tasks = fresh.task_list()
+        self.assertEqual([(t["id"], t["status"]) for t in tasks], [(self.t1, "done")])
+
+    def test_filters_intersect(self) -> None:
+        self.tm.queue_add("other", "Other", "desc")
+        t3 = self.tm.task_add("Three", "d", "other")
+        epic_id = self.tm.epic_add("E", "d")
+        self.tm.epic_add_task(epic_id, self.t1)
+        self.tm.epic_add_task(epic_id, t3)
+        self.tm.task_start(t3)
+
+        def ids(**filters):
+            return [t["id"] for t in self.tm.task_list(**filters)]
+
+        self.assertEqual(ids(epic=epic_id), [self.t1, t3])
+        self.assertEqual(ids(status="todo", epic=epic_id), [self.t1])
+        self.assertEqual(ids(status="in_progress", queue="q"), [])
+        self.assertEqual(ids(queue="other", epic=epic_id), [t3])
+
+    def test_mutations_update_index_without_rescan(self) -> None:
+        self.tm.task_list()
+        with patch.object(self.tm._index, "refresh") as refresh:
+            self.tm.task_done(self.t1)
+            t3 = self.tm.task_add("Three", "d", "q")
+            self.tm.task_delete(self.t2)
+            done = self.tm.task_list(status="done")
+            todo = self.tm.task_list(status="todo")
+        refresh.assert_not_called()
+        self.assertEqual([t["id"] for t in done], [self.t1])
+        self.assertEqual([t["id"] for t in todo], [t3])
+
+    def test_sync_rescans_changed_queues_only(self) -> None:
+        self.tm.queue_add("other", "Other", "desc")
+        self.tm.task_list()
+        self.tm._index.sync()
+        with patch.object(index.os, "scandir", wraps=os.scandir) as scandir:
+            self.assertFalse(self.tm._index.sync())
+            self.assertEqual(scandir.call_count, 1)
+            other = TaskManager(str(self.tasks_root), str(Path(self.tmpdir) / "epics"))
+            other.task_add("Three", "d", "other")
+            scandir.reset_mock()
+            self.assertTrue(self.tm._index.sync())
+        scanned = [Path(c.args[0]).name for c in scandir.call_args_list]
+        self.assertEqual(scanned, ["tasks", "other"])
+        self.assertEqual(len(self.tm.task_list(queue="other")), 1)
+
+    def test_long_lived_manager_sees_other_writers(self) -> None:
+        self.assertEqual(len(self.tm.task_list(queue="q")), 2)
+        other = TaskManager(str(self.tasks_root), str(Path(self.tmpdir) / "epics"))
+        t3 = other.task_add("Three", "d", "q")
+        other.task_delete(self.t1)
+        self.assertEqual([t["id"] for t in self.tm.task_list(queue="q")], [self.t2, t3])
+
+    def test_task_list_pages(self) -> None:
+        t3 = self.tm.task_add("Three", "d", "q")
+        first = self.tm.task_list(limit=1)
+        self.assertEqual([t["id"] for t in first], [self.t1])
+        after = (first[0]["created_at"], first[0]["id"])
+        self.assertEqual([t["id"] for t in self.tm.task_list(after=after, limit=1)], [self.t2])
+        self.tm.task_delete(self.t1)
+        self.assertEqual([t["id"] for t in self.tm.task_list(after=after)], [self.t2, t3])
+        last = self.tm.task_list()[-1]
+        self.assertEqual(self.tm.task_list(after=(last["created_at"], last["id"]), limit=5), [])
+
+    def test_queue_delete_drops_tasks(self) -> None:
+        self.tm.task_list()
+        self.tm.queue_delete("q")
+        self.assertEqual(self.tm.task_list(queue="q"), [])
+        self.assertEqual(self.tm.task_list(), [])
+
+    def test_iter_tasks_returns_full_data(self) -> None:
+        tasks = list(self.tm.iter_tasks(queue="q"))
+        self.assertEqual(tasks[0]["description"], "d")
+        self.assertIn("comments", tasks[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,8 @@ import unittest
 from pathlib import Path
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 # Add the parent directory to the path to import task_manager
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -296,6 +298,50 @@ class TestTaskManagerInternal(unittest.TestCase):
         self.tm.task_add("A", "B", queue_name)
         self.assertEqual(self.tm._get_next_task_number(queue_name), 2)
 
+    def test_next_task_number_uses_meta_counter(self):
+        """Task numbers come from the queue meta counter, not a scan."""
+        queue_name = self._create_basic_queue()
+        self.tm.task_add("A", "B", queue_name)
+        meta = json.loads((self.tasks_root / queue_name / "meta.json").read_text())
+        self.assertEqual(meta["next_id"], 2)
+        self.assertEqual(meta["title"], "Queue")
+
+        with patch.object(self.tm, "_scan_next_task_number") as scan:
+            self.assertEqual(self.tm.task_add("C", "D", queue_name), "q-2")
+        scan.assert_not_called()
+
+        # Deleting the newest task does not hand its ID out again.
+        self.tm.task_delete("q-2")
+        self.assertEqual(self.tm.task_add("E", "F", queue_name), "q-3")
+
+    def test_next_task_number_stale_counter_rescans(self):
+        """A counter pointing at an existing task triggers a rescan."""
+        queue_name, task_ids = self._create_multiple_tasks("q", 3)
+        meta_file = self.tasks_root / queue_name / "meta.json"
+        meta = json.loads(meta_file.read_text())
+        meta["next_id"] = 2
+        meta_file.write_text(json.dumps(meta))
+        self.assertEqual(self.tm.task_add("X", "Y", queue_name), "q-4")
+
+    def test_concurrent_task_add_unique_ids(self):
+        """Parallel writers never receive the same task ID."""
+        queue_name = self._create_basic_queue()
+
+        def add_tasks(_: int) -> list:
+            tm = TaskManager(str(self.tasks_root))
+            return [tm.task_add("T", "D", queue_name) for _ in range(10)]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            ids = [tid for batch in pool.map(add_tasks, range(4)) for tid in batch]
+        self.assertEqual(len(set(ids)), 40)
+
+    def test_next_epic_number_uses_counter(self):
+        """Epic numbers come from the counter in the epics root."""
+        tm = TaskManager(str(self.tasks_root), str(Path(self.test_dir) / "epics"))
+        first = tm.epic_add("E1", "d")
+        tm.epic_delete(first)
+        self.assertEqual(tm.epic_add("E2", "d"), "epic-2")
+
     def test_queue_add_empty_name_internal(self):
         """Queue name cannot be empty."""
         with self.assertRaises(ValueError):
@@ -368,7 +414,7 @@ class TestTaskManagerInternal(unittest.TestCase):
         self.assertEqual(len(updated), 2)
 
     def test_task_list_caching(self) -> None:
-        """task_list results are cached and invalidated on changes."""
+        """task_list results are cached and replaced, not mutated, on changes."""
         self.tm.queue_add("qc", "Q", "d")
         self.tm.task_add("t1", "d1", "qc")
         tasks_first = self.tm.task_list()
@@ -378,10 +424,40 @@ class TestTaskManagerInternal(unittest.TestCase):
         self.assertIs(tasks_first, tasks_second)
 
         self.tm.task_add("t2", "d2", "qc")
-        self.assertFalse(self.tm._task_list_cache)
+        self.assertEqual(len(tasks_first), 1)
         tasks_updated = self.tm.task_list()
+        self.assertIs(tasks_updated, self.tm._task_list_cache[cache_key])
         self.assertEqual(len(tasks_updated), 2)
 
+    def test_task_list_cache_patched_per_task(self) -> None:
+        """Saving a task moves it between cached filtered lists."""
+        queue_name, task_ids = self._create_multiple_tasks("qp", 3)
+        todo = self.tm.task_list(status="todo")
+        self.tm.task_list(status="done")
+        self.assertEqual([t["id"] for t in todo], task_ids)
+
+        def ids(status: str) -> list:
+            return [t["id"] for t in self.tm.task_list(status=status)]
+
+        with patch.object(self.tm._index, "query") as query:
+            self.tm.task_done(task_ids[1])
+            self.assertEqual(ids("todo"), [task_ids[0], task_ids[2]])
+            self.assertEqual(ids("done"), [task_ids[1]])
+
+            self.tm.task_update(task_ids[1], "status", "todo")
+            self.assertEqual(ids("todo"), task_ids)
+            self.assertEqual(ids("done"), [])
+
+            self.tm.task_update(task_ids[0], "title", "Renamed")
+            self.assertEqual(self.tm.task_list(status="todo")[0]["title"], "Renamed")
+
+            self.tm.task_delete(task_ids[2])
+            self.assertEqual(ids("todo"), task_ids[:2])
+        query.assert_not_called()
+        # Lists handed out earlier are left as they were.
+        self.assertEqual([t["id"] for t in todo], task_ids)
+        self.assertEqual(todo[0]["title"], "Task1")
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
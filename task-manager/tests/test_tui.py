@@ -1,5 +1,7 @@
 import tempfile
 import unittest
+from unittest.mock import patch
+
 from task_manager.core import TaskManager
 from task_manager.tui import (
     TMApp,
@@ -9,6 +11,12 @@ from task_manager.tui import (
     EpicsScreen,
     TaskDetailScreen,
     EpicDetailScreen,
+    LazyDataTable,
+    CommentsScreen,
+    TaskDelete,
+    ConfirmTaskDelete,
+    AddComment,
+    RemoveComment,
 )
 
 
@@ -68,3 +76,120 @@ class TestTaskEpicNavigation(unittest.IsolatedAsyncioTestCase):
             self.assertIsInstance(pilot.app.screen, EpicDetailScreen)
             await pilot.press("q")
 
+
+
+class TestLazyTaskTable(unittest.IsolatedAsyncioTestCase):
+    async def test_rows_are_paged_in(self) -> None:
+        manager = TaskManager(tempfile.mkdtemp(), epics_root=tempfile.mkdtemp())
+        manager.queue_add("q", "Q", "d")
+        ids = [manager.task_add(f"T{i}", "d", "q") for i in range(25)]
+        with (
+            patch.object(TasksScreen, "PAGE_SIZE", 10),
+            patch.object(manager, "task_list", wraps=manager.task_list) as task_list,
+        ):
+            async with TMApp(manager).run_test() as pilot:
+                await pilot.press("2")
+                await pilot.app.workers.wait_for_complete()
+                await pilot.pause()
+                screen = pilot.app.screen
+                self.assertFalse(screen.query("#loading"))
+                table = screen.query_one("#tasks_table", LazyDataTable)
+                self.assertEqual(table.row_count, 10)
+
+                table.move_cursor(row=9)
+                await pilot.pause()
+                await pilot.app.workers.wait_for_complete()
+                await pilot.pause()
+                self.assertEqual(table.row_count, 20)
+                table.move_cursor(row=19)
+                await pilot.pause()
+                await pilot.app.workers.wait_for_complete()
+                await pilot.pause()
+                self.assertEqual(table.row_count, 25)
+                self.assertEqual(table.get_row_at(24)[0], ids[24])
+                pages = [(c.kwargs["after"], c.kwargs["limit"]) for c in task_list.call_args_list]
+                keys = {t["id"]: (t["created_at"], t["id"]) for t in manager.task_list()}
+                self.assertEqual(pages, [(None, 10), (keys[ids[9]], 10), (keys[ids[19]], 10)])
+                await pilot.press("q")
+
+    async def test_tasks_deleted_elsewhere_between_pages(self) -> None:
+        tasks_dir, epics_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        manager = TaskManager(tasks_dir, epics_root=epics_dir)
+        manager.queue_add("q", "Q", "d")
+        ids = [manager.task_add(f"T{i}", "d", "q") for i in range(15)]
+        with patch.object(TasksScreen, "PAGE_SIZE", 10):
+            async with TMApp(manager).run_test() as pilot:
+                await pilot.press("2")
+                await pilot.app.workers.wait_for_complete()
+                await pilot.pause()
+                table = pilot.app.screen.query_one("#tasks_table", LazyDataTable)
+                self.assertEqual(table.row_count, 10)
+
+                other = TaskManager(tasks_dir, epics_root=epics_dir)
+                other.task_delete(ids[2])
+                other.task_delete(ids[12])
+                table.move_cursor(row=9)
+                await pilot.pause()
+                await pilot.app.workers.wait_for_complete()
+                await pilot.pause()
+                loaded = [table.get_row_at(i)[0] for i in range(table.row_count)]
+                self.assertEqual(loaded, ids[:12] + ids[13:])
+                await pilot.press("q")
+
+
+class TestIncrementalRefresh(unittest.IsolatedAsyncioTestCase):
+    async def test_task_rows_are_patched(self) -> None:
+        manager = TaskManager(tempfile.mkdtemp(), epics_root=tempfile.mkdtemp())
+        manager.queue_add("q", "Q", "d")
+        ids = [manager.task_add(f"T{i}", "d", "q") for i in range(15)]
+        with patch.object(TasksScreen, "PAGE_SIZE", 10):
+            async with TMApp(manager).run_test() as pilot:
+                await pilot.press("2")
+                await pilot.app.workers.wait_for_complete()
+                await pilot.pause()
+                screen = pilot.app.screen
+                assert isinstance(screen, TasksScreen)
+                table = screen.query_one("#tasks_table", LazyDataTable)
+
+                screen.post_message(TaskDelete(ids[3]))
+                await pilot.pause()
+                screen.post_message(ConfirmTaskDelete())
+                await pilot.pause()
+                self.assertIs(screen.query_one("#tasks_table", LazyDataTable), table)
+                self.assertEqual(table.row_count, 9)
+                self.assertNotIn(ids[3], table.rows)
+
+                manager.task_update(ids[0], "title", "Renamed")
+                later = manager.task_add("New", "d", "q")
+                screen.tasks_changed({ids[0], later})
+                await pilot.pause()
+                self.assertEqual(table.get_row(ids[0])[1], "Renamed")
+                self.assertNotIn(later, table.rows)
+
+                table.move_cursor(row=8)
+                await pilot.pause()
+                await pilot.app.workers.wait_for_complete()
+                await pilot.pause()
+                self.assertEqual(table.row_count, 15)
+                self.assertEqual(table.get_row_at(14)[0], later)
+                await pilot.press("q")
+
+    async def test_comment_lines_are_patched(self) -> None:
+        manager = TaskManager(tempfile.mkdtemp(), epics_root=tempfile.mkdtemp())
+        manager.queue_add("q", "Q", "d")
+        tid = manager.task_add("T", "d", "q")
+        first = manager.task_comment_add(tid, "first")
+        async with TMApp(manager).run_test() as pilot:
+            screen = CommentsScreen(manager, tid)
+            await pilot.app.push_screen(screen)
+            await pilot.pause()
+            new_comment = screen.query_one("#new_comment")
+
+            screen.post_message(AddComment("second"))
+            await pilot.pause()
+            self.assertEqual(len(screen.query("#comments Static")), 2)
+            screen.post_message(RemoveComment(first))
+            await pilot.pause()
+            self.assertFalse(screen.query(f"#comment_{first}"))
+            self.assertIs(screen.query_one("#new_comment"), new_comment)
+            await pilot.press("q")